@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""Benchmarks for the component library, with a JSON history and regression checks.
+
+Measures, per run:
+
+    primitive.<name>.call_us      cost of one call of each primitive (sample args)
+    scene.<file>.render_us        composing + serializing each registered scene
+    scene.<file>.bytes            serialized size
+    scene.<file>.elements         element count
+    build.wall_ms                 full generate.py run in a fresh process
+    build.peak_kib                tracemalloc peak of one such run
+    reference.loop_us             a fixed pure-Python workload: the machine's speed
+
+Timings are the best of --repeat rounds, each calibrated to ~20 ms (builds:
+separate processes, so no state is warm from earlier runs), taken in
+interleaved passes over the whole suite so they are spread across the run.
+They are compared relative to reference.loop_us of the same run, since a
+shared machine is often slower for minutes at a time. Every run is appended
+to the history file (.bench-history.json beside this script by default;
+timings are machine-specific, so it is not committed) and checked against
+the median of the previous --baseline runs: a metric that grew by more than
+both its THRESHOLDS fraction and NOISE_K scaled MADs of those runs is over
+its limit (see compare()); a regression exits with status 1. Timings must
+be over their limit in two consecutive runs to regress; until MIN_BASELINE
+runs are recorded, nothing regresses.
+
+    cd assets/components
+    python3 bench.py                       # all groups, record and compare
+    python3 bench.py --only scenes build   # a subset
+    python3 bench.py --no-save             # compare without recording
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+# Allow running from any directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components import generate, primitives, svgtree
+from components.manifest import write_atomic
+from components.optimize import count_elements
+from components.style_tokens import COLOR_VEHICLE_OTHER
+
+HISTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".bench-history.json")
+HISTORY_VERSION = 2                 # 2: builds in fresh processes, REFERENCE recorded
+GROUPS = ("primitives", "scenes", "build")
+REFERENCE = "reference.loop_us"
+TIMINGS = ("call_us", "render_us", "wall_ms")     # metric leaf names compared relative to REFERENCE
+
+# Metric leaf name → smallest relative increase over the baseline median that
+# counts as a regression. The allowed increase is the larger of this and
+# NOISE_K scaled MADs of the baseline runs, so noisy timings get a band that
+# matches their observed run-to-run spread.
+THRESHOLDS = {
+    "call_us": 0.25,
+    "render_us": 0.25,
+    "wall_ms": 0.25,
+    "peak_kib": 0.15,
+    "bytes": 0.05,
+    "elements": 0.05,
+}
+NOISE_K = 4
+MIN_BASELINE = 3        # previous runs needed before a metric can regress
+
+# Representative arguments per public primitive (as used by the scenes).
+PRIMITIVE_CALLS = {
+    "grass_bg":         ((200, 200), {}),
+    "road_h":           ((0, 70, 200, 60), {}),
+    "road_v":           ((70, 0, 60, 200), {}),
+    "curb":             ((0, 66, 200, 4), {}),
+    "yellow_solid":     ((98, 70, 4, 60), {}),
+    "yellow_dashed":    ((0, 98, 100), {"orient": "H"}),
+    "stop_line":        ((0, 64, 70, 6), {}),
+    "yield_triangles":  ((70, 60, 60), {"count": 3}),
+    "crosswalk_zebra":  ((76, 70, 50, 60), {"n": 3}),
+    "lane_edge":        ((0, 70, 200, 2), {"dashed": True}),
+    "merge_taper":      ((50, 130, 140, 102), {"n": 4}),
+    "stop_sign":        ((20, 35), {}),
+    "yield_tri":        ((100, 50), {"orient": "N"}),
+    "cone":             ((40, 40), {}),
+    "hydrant":          ((150, 40), {}),
+    "arrow_defs":       ((), {}),
+    "sedan":            ((22, 75), {}),
+    "wheels":           ((22, 75, 30, 18), {}),
+    "emergency":        ((140, 75), {}),
+    "school_bus":       ((100, 75), {}),
+    "truck":            ((60, 75), {"orient": "N"}),
+    "compact":          ((20, 78), {"color": COLOR_VEHICLE_OTHER}),
+    "pedestrian":       ((100, 88), {}),
+    "hill_slope":       ((300, 200), {}),
+    "roundabout_road":  ((100, 100), {}),
+    "merge_ramp":       ((0, 160, 180, 100, 100, 160), {}),
+    "traj_arrow":       ((54, 84, 66, 84), {}),
+    "traj_curve":       ((100, 30, 80, 40, 70, 55), {}),
+}
+
+
+def time_call(fn, repeat=5, target=0.02):
+    """Best per-call seconds of fn over repeat rounds of ~target seconds each."""
+    timer = timeit.Timer(fn)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= target:
+            break
+        number = max(number * 2, int(number * target / max(elapsed, 1e-9)))
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        best = min(best, timer.timeit(number) / number)
+    return best
+
+
+def public_primitives():
+    """name → function for every public function defined in primitives.py."""
+    return {name: fn for name, fn in vars(primitives).items()
+            if callable(fn) and not name.startswith("_")
+            and getattr(fn, "__module__", None) == primitives.__name__}
+
+
+def bench_primitives(repeat=5):
+    missing = sorted(public_primitives().keys() - PRIMITIVE_CALLS.keys())
+    if missing:
+        raise ValueError(f"no sample arguments in PRIMITIVE_CALLS for: {', '.join(missing)}")
+    metrics = {}
+    for name, (args, kwargs) in PRIMITIVE_CALLS.items():
+        fn = getattr(primitives, name)
+        metrics[f"primitive.{name}.call_us"] = time_call(lambda: fn(*args, **kwargs), repeat) * 1e6
+    return metrics
+
+
+def bench_scenes(repeat=5):
+    metrics = {}
+    for filename, scene in generate.load_scenes()[0].items():
+        def render():
+            buf = io.StringIO()
+            svgtree.write_document(scene(), buf)
+            return buf.getvalue()
+        metrics[f"scene.{filename}.render_us"] = time_call(render, repeat) * 1e6
+        metrics[f"scene.{filename}.bytes"] = len(render().encode())
+        metrics[f"scene.{filename}.elements"] = count_elements(scene())
+    return metrics
+
+
+# Runs in a fresh interpreter: argv is (output dir, "trace" or "time"); prints
+# {"wall_ms": …, "peak_kib": …} for one full generate.py run, imports included.
+_BUILD_CHILD = """
+import contextlib, io, json, sys, time, tracemalloc
+sys.path.insert(0, %r)
+out, mode = sys.argv[1:]
+if mode == "trace":
+    tracemalloc.start()
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    from components import generate
+    generate.main(["--output-dir", out])
+wall = time.perf_counter() - start
+peak = tracemalloc.get_traced_memory()[1] if mode == "trace" else 0
+print(json.dumps({"wall_ms": wall * 1000, "peak_kib": peak / 1024}))
+""" % os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _child_build(mode):
+    """One full generate.py run into a new temp dir, in a fresh interpreter."""
+    with tempfile.TemporaryDirectory() as out:
+        proc = subprocess.run([sys.executable, "-c", _BUILD_CHILD, out, mode],
+                              capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.splitlines()[-1])
+
+
+def bench_build(repeat=5, trace=True):
+    """Full generate.py builds, each in a fresh process with no warm state:
+    best wall time of repeat runs, then (trace) one traced for the tracemalloc peak."""
+    metrics = {"build.wall_ms": min(_child_build("time")["wall_ms"] for _ in range(repeat))}
+    if trace:
+        metrics["build.peak_kib"] = _child_build("trace")["peak_kib"]
+    return metrics
+
+
+def _reference_work():
+    """Fixed pure-Python work (dicts, strings, sorting), like composing a scene."""
+    items = {f"k{i}": (i * 7919) % 10007 for i in range(500)}
+    return sorted(f"{k}={v:05d}" for k, v in items.items() if v % 3)
+
+
+def bench_reference():
+    """Per-call µs of _reference_work(): the machine's speed during this pass."""
+    return {REFERENCE: time_call(_reference_work, 1) * 1e6}
+
+
+def run(groups=GROUPS, repeat=5):
+    """Measure groups in repeat interleaved passes, keeping each metric's best.
+
+    Machine noise comes in bursts shorter than a run, so spreading a metric's
+    samples over the whole run instead of taking them back to back keeps one
+    slow moment from inflating it.
+    """
+    metrics = {}
+    for i in range(repeat):
+        sample = bench_reference()
+        if "primitives" in groups:
+            sample.update(bench_primitives(1))
+        if "scenes" in groups:
+            sample.update(bench_scenes(1))
+        if "build" in groups:
+            sample.update(bench_build(1, trace=(i == 0)))
+        for name, value in sample.items():
+            metrics[name] = min(value, metrics.get(name, value))
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.node(),
+        "metrics": {k: round(v, 3) for k, v in metrics.items()},
+    }
+
+
+# ── History ─────────────────────────────────────────────────────────
+
+def load_history(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+    return data.get("runs", []) if data.get("version") == HISTORY_VERSION else []
+
+
+def save_history(path, runs):
+    data = {"version": HISTORY_VERSION, "runs": runs}
+    write_atomic(path, (json.dumps(data, indent=1, sort_keys=True) + "\n").encode())
+
+
+def allowed_increase(previous, floor):
+    """(median of previous, increase over it that is still noise, spread seen).
+
+    The allowance is the larger of floor × median and NOISE_K scaled MADs.
+    """
+    base = statistics.median(previous)
+    mad = statistics.median(abs(v - base) for v in previous) * 1.4826   # ≈ σ for normal noise
+    return base, max(floor * abs(base), NOISE_K * mad), mad > 0
+
+
+def normalized(run, name):
+    """The run's value of metric name; timings are divided by the run's
+    REFERENCE, so a machine that is slower as a whole does not move them."""
+    value = run["metrics"].get(name)
+    reference = run["metrics"].get(REFERENCE)
+    if value is None or name.rsplit(".", 1)[-1] not in TIMINGS:
+        return value
+    return value / reference if reference else None
+
+
+def _previous(name, runs, baseline):
+    values = (normalized(r, name) for r in runs[-baseline:])
+    return [v for v in values if v is not None]
+
+
+def _exceeds(name, run, runs, baseline):
+    """(exceeded, noisy) for the run's metric against its last baseline runs."""
+    floor = THRESHOLDS.get(name.rsplit(".", 1)[-1])
+    value = normalized(run, name)
+    previous = _previous(name, runs, baseline)
+    if floor is None or value is None or len(previous) < MIN_BASELINE:
+        return False, False
+    base, allowed, noisy = allowed_increase(previous, floor)
+    return value - base > allowed, noisy
+
+
+def compare(current, runs, baseline=10):
+    """[(metric, value, baseline median, relative change, status)] vs the last runs.
+
+    Timings are compared as normalized() values; their baseline is shown
+    scaled to this run's REFERENCE. status is "" or "slower" or
+    "regression". A metric is over its limit when it exceeds the baseline
+    median by more than allowed_increase(), once there are MIN_BASELINE
+    previous runs. A metric without spread in the baseline (sizes, counts)
+    regresses at once; a noisy one (timings) only when the previous run was
+    over its limit too, so a one-off slow moment is reported as "slower"
+    but does not fail the run.
+    """
+    rows = []
+    for name, value in current["metrics"].items():
+        norm = normalized(current, name)
+        previous = _previous(name, runs, baseline)
+        if not previous or norm is None:
+            rows.append((name, value, None, None, ""))
+            continue
+        base = statistics.median(previous) * (value / norm if norm else 1.0)
+        change = (value - base) / base if base else 0.0
+        over, noisy = _exceeds(name, current, runs, baseline)
+        status = ""
+        if over:
+            repeated = runs and _exceeds(name, runs[-1], runs[:-1], baseline)[0]
+            status = "regression" if not noisy or repeated else "slower"
+        rows.append((name, value, base, change, status))
+    return rows
+
+
+def _fmt(value):
+    return f"{value:.3f}" if isinstance(value, float) else str(value)
+
+
+def report(rows):
+    width = max(len(r[0]) for r in rows)
+    for name, value, base, change, status in rows:
+        if base is None:
+            print(f"  {name:<{width}}  {_fmt(value):>12}")
+            continue
+        flag = {"regression": "  REGRESSION", "slower": "  slower (unconfirmed)"}.get(status, "")
+        print(f"  {name:<{width}}  {_fmt(value):>12}  (baseline {_fmt(base)}, {change:+.1%}){flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=GROUPS, default=list(GROUPS),
+                        help="benchmark groups to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="interleaved timing passes; each metric's best is kept (default: 5)")
+    parser.add_argument("--history", default=HISTORY,
+                        help="JSON history file (default: .bench-history.json here)")
+    parser.add_argument("--baseline", type=int, default=10, metavar="N",
+                        help="compare against the median of the last N runs (default: 10)")
+    parser.add_argument("--no-save", action="store_true",
+                        help="compare without appending this run to the history")
+    args = parser.parse_args(argv)
+
+    try:
+        current = run(args.only, args.repeat)
+    except ValueError as exc:
+        parser.error(str(exc))
+    runs = load_history(args.history)
+    rows = compare(current, runs, args.baseline)
+    report(rows)
+    if not args.no_save:
+        save_history(args.history, runs + [current])
+    regressions = [r[0] for r in rows if r[4] == "regression"]
+    slower = sum(1 for r in rows if r[4] == "slower")
+    print(f"\n{len(rows)} metrics, {len(regressions)} regressions, {slower} unconfirmed "
+          f"(baseline: {min(len(runs), args.baseline)} previous runs)")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
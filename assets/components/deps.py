@@ -0,0 +1,175 @@
+"""Dependency tracking for incremental scene rebuilds.
+
+Every top-level definition in the tracked component modules (style tokens,
+primitive functions, scene functions and their helpers) gets a fingerprint
+from its AST, so comments and formatting don't count as changes. While a
+scene renders, a profile hook records which tracked functions it calls; the
+scene's dependencies are those functions plus every token or module constant
+they reference by name. A scene only needs rebuilding when one of its own
+dependencies has a different fingerprint.
+"""
+
+import ast
+import functools
+import hashlib
+import os
+import subprocess
+import sys
+
+
+def _fp(text):
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+class SourceIndex:
+    """Fingerprints and name references for top-level definitions of a set of modules.
+
+    Keys are qualified as "<module>.<name>", e.g. "style_tokens.COLOR_STOP_SIGN"
+    or "primitives.stop_sign".
+    """
+
+    def __init__(self):
+        self.fingerprints = {}
+        self.refs = {}
+        self.modules = []
+
+    @classmethod
+    def from_files(cls, paths):
+        """Index modules from disk; paths maps module stem → file path."""
+        index = cls()
+        for stem, path in paths.items():
+            with open(path) as f:
+                index.add(stem, f.read())
+        return index
+
+    @classmethod
+    def from_git(cls, ref, paths, cwd):
+        """Index the same modules as they were at a git ref (missing files are skipped)."""
+        index = cls()
+        for stem, path in paths.items():
+            source = git_show(ref, path, cwd)
+            if source is not None:
+                index.add(stem, source)
+            else:
+                index.modules.append(stem)
+        return index
+
+    def add(self, stem, source):
+        self.modules.append(stem)
+        fingerprints, refs = _index_source(stem, source)
+        self.fingerprints.update(fingerprints)
+        self.refs.update(refs)
+
+    def add_data(self, key, text):
+        """Fingerprint a non-Python input (e.g. a scene spec) under key, verbatim."""
+        self.fingerprints[key] = _fp(text)
+
+    def resolve(self, name, stem):
+        """Qualified key for a bare name used inside module stem, or None."""
+        for candidate in [stem, *self.modules]:
+            key = f"{candidate}.{name}"
+            if key in self.fingerprints:
+                return key
+        return None
+
+    def changed(self, other):
+        """Keys whose fingerprint differs between two indexes (added/removed included)."""
+        keys = self.fingerprints.keys() | other.fingerprints.keys()
+        return {k for k in keys if self.fingerprints.get(k) != other.fingerprints.get(k)}
+
+
+@functools.lru_cache(maxsize=64)
+def _index_source(stem, source):
+    """(fingerprints, refs) of one module's top-level definitions.
+
+    Memoized on the source text, so re-indexing after an edit (generate.py
+    --watch) only parses the files that changed. Callers must not mutate
+    the returned dicts.
+    """
+    fingerprints, refs = {}, {}
+    for node in ast.parse(source).body:
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+            key = f"{stem}.{node.name}"
+            fingerprints[key] = _fp(ast.dump(node))
+            refs[key] = frozenset(n.id for n in ast.walk(node) if isinstance(n, ast.Name))
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                for name, value in _unpack(target, node.value):
+                    fingerprints[f"{stem}.{name}"] = _fp(ast.dump(value))
+    return fingerprints, refs
+
+
+@functools.lru_cache(maxsize=None)
+def _git_toplevel(cwd):
+    return subprocess.run(["git", "rev-parse", "--show-toplevel"], cwd=cwd, check=True,
+                          capture_output=True, text=True).stdout.strip()
+
+
+def git_show(ref, path, cwd):
+    """Text of path as of git ref, or None if it did not exist there."""
+    top = _git_toplevel(cwd)
+    rel = os.path.relpath(os.path.realpath(path), os.path.realpath(top))
+    proc = subprocess.run(["git", "show", f"{ref}:{rel}"], cwd=top, capture_output=True, text=True)
+    return proc.stdout if proc.returncode == 0 else None
+
+
+def _unpack(target, value):
+    if isinstance(target, ast.Name):
+        return [(target.id, value)]
+    if isinstance(target, ast.Tuple):
+        if isinstance(value, ast.Tuple) and len(value.elts) == len(target.elts):
+            pairs = []
+            for t, v in zip(target.elts, value.elts):
+                pairs.extend(_unpack(t, v))
+            return pairs
+        return [(n.id, value) for n in ast.walk(target) if isinstance(n, ast.Name)]
+    return []
+
+
+def trace_calls(fn, files):
+    """Call fn() and return (result, set of "<stem>.<name>" top-level defs it entered).
+
+    files maps absolute source path → module stem. Methods are attributed to
+    their class.
+    """
+    called = set()
+
+    def profile(frame, event, arg):
+        if event == "call":
+            stem = files.get(frame.f_code.co_filename)
+            if stem is not None:
+                qualname = getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+                called.add(f"{stem}.{qualname.split('.')[0]}")
+
+    previous = sys.getprofile()
+    sys.setprofile(profile)
+    try:
+        result = fn()
+    finally:
+        sys.setprofile(previous)
+    return result, called
+
+
+def collect_deps(called, index):
+    """Expand traced calls into {key: fingerprint} including referenced tokens/constants."""
+    deps = {}
+    for key in called:
+        if key not in index.fingerprints:
+            continue
+        deps[key] = index.fingerprints[key]
+        stem = key.split(".", 1)[0]
+        for name in index.refs.get(key, ()):
+            ref = index.resolve(name, stem)
+            if ref is not None:
+                deps[ref] = index.fingerprints[ref]
+    return dict(sorted(deps.items()))
+
+
+def deps_fingerprint(deps):
+    return _fp("\n".join(f"{k}={v}" for k, v in sorted(deps.items())))
+
+
+def stale_deps(deps, index):
+    """Names from a recorded dependency map whose fingerprint no longer matches."""
+    return sorted(k for k, fp in deps.items() if index.fingerprints.get(k) != fp)
@@ -1,26 +1,659 @@
 #!/usr/bin/env python3
-"""Generate INTERSECTION_* SVGs from the component library."""
+"""Generate INTERSECTION_* SVGs from the component library.
 
+Builds are incremental: a manifest in the output directory records each
+scene's content hash and the style tokens / primitives it actually used
+(see deps.py), so a re-run only renders and writes scenes whose
+dependencies changed.
+
+With --optimize each scene tree goes through optimize.py (rect merging,
+number shortening, fill hoisting, compact output) and is checked to paint
+the same shapes as the unoptimized tree before it is written.
+
+With --vector an Android VectorDrawable (vector_drawable.py) is written next
+to each SVG; content it cannot express is reported per scene and kept in the
+manifest entry of the .xml file.
+
+With --variants each scene is also written rotated and/or mirrored for
+left-hand traffic (transform.py), e.g. INTERSECTION_4WAY_STOP_S_LHT.svg.
+
+With --validate every scene is first checked by geometry.py (overlapping
+vehicles/signs, content outside the viewBox, arrows through vehicles),
+variants included; the build stops with exit status 1 if any scene has errors.
+
+With --themes every scene (and variant) is also rendered in each theme of
+themes.py into <output-dir>/themes/<theme>/, with a combined
+themes-manifest.json; scene structure is composed once and only the colors
+are swapped per theme.
+
+With --watch the script keeps running after the build: it polls the
+component sources and specs, reloads the edited modules and everything that
+imports them in-process (dependencies first), rebuilds only the scenes whose
+dependencies changed and refreshes the asset versions in
+assets/review_gallery.html.
+"""
+
+import argparse
+import ast
+import functools
+import importlib
+import json
 import os
 import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
 
 # Allow running from any directory
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from components.scenes_intersection import ALL_SCENES
+from components import optimize as optimizer
+from components import (geometry, primitives, style_tokens, svgtree, templates, themes,
+                        transform, vector_drawable)
+from components.deps import (SourceIndex, collect_deps, deps_fingerprint, git_show,
+                             stale_deps, trace_calls)
+from components.manifest import (MANIFEST_NAME, AtomicFile, BuildManifest, content_hash,
+                                 write_atomic)
+
+COMPONENTS_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DIR = os.path.join(COMPONENTS_DIR, '..', 'svg')
+GALLERY = os.path.join(COMPONENTS_DIR, '..', 'review_gallery.html')
+VERSIONS_NAME = "versions.js"   # generated beside the SVGs; review_gallery.html loads it
+WATCH_INTERVAL = 0.05   # seconds between polls of the component sources
+
+# Build machinery --watch cannot swap out from under itself; edits need a restart.
+NO_RELOAD = {"components.deps", "components.manifest", "components.generate"}
+
+# Modules that register scenes via a module-level ALL_SCENES mapping
+# (templates registers the data-driven scenes in specs/).
+SCENE_MODULES = [
+    "components.scenes_intersection",
+    "components.templates",
+]
+
+
+def load_scenes():
+    """Collect filename → scene function from every scene module (nothing is rendered)."""
+    scenes = {}
+    modules = []
+    for name in SCENE_MODULES:
+        module = importlib.import_module(name)
+        modules.append(module)
+        for filename, fn in module.ALL_SCENES.items():
+            if filename in scenes:
+                raise ValueError(f"Duplicate scene {filename} in {name}")
+            scenes[filename] = fn
+    return scenes, modules
+
+
+def tracked_modules(modules):
+    """Module stem → source path for everything a scene's dependencies can live in."""
+    return {m.__name__.rsplit('.', 1)[-1]: m.__file__
+            for m in [style_tokens, svgtree, primitives, optimizer, vector_drawable, transform,
+                      *modules]}
+
+
+_state = None
+
+
+def _load_state():
+    """Scenes, traced files and source index, loaded once per process."""
+    global _state
+    if _state is None:
+        scenes, modules = load_scenes()
+        paths = tracked_modules(modules)
+        files = {path: stem for stem, path in paths.items()}
+        index = SourceIndex.from_files(paths)
+        for scene in scenes.values():
+            if isinstance(scene, templates.SpecScene):
+                with open(scene.path, encoding="utf-8") as f:
+                    index.add_data(scene.dep_key, f.read())
+        _state = (scenes, paths, files, index)
+    return _state
+
+
+def render_scene(job):
+    """Render one scene, streaming it to a temp file, and keep it if its bytes changed.
+
+    Runs in worker processes. job is (filename, path, known_sha, force,
+    changed, ref, options): known_sha is the manifest hash when the file on
+    disk is still the one we wrote; changed/ref are set when the scene has no
+    recorded deps under --changed-since and must be rendered before we know
+    whether it is affected; options holds the --optimize/--vector/--variants
+    settings.
+    """
+    filename, path, known_sha, force, changed, ref, options = job
+    scenes, _, files, index = _load_state()
+    out = AtomicFile(path)
+    try:
+        start = time.perf_counter()
+        (stats, tree, source), called = trace_calls(
+            lambda: _write_scene(scenes[filename], out, options), files)
+        vector = variants = None
+        if options.get("vector"):
+            vector, vector_called = trace_calls(lambda: vector_drawable.convert(tree), files)
+            called |= vector_called
+        if options.get("variants"):
+            variants, variants_called = trace_calls(
+                lambda: transform.variants(source, options["variants"]), files)
+            called |= variants_called
+        render_ms = (time.perf_counter() - start) * 1000
+        deps = collect_deps(called, index)
+        if isinstance(scenes[filename], templates.SpecScene):
+            spec_deps = {key: index.fingerprints[key] for key in scenes[filename].dep_keys}
+            deps = dict(sorted({**deps, **spec_deps}.items()))
+        result = {"filename": filename, "deps": deps, "sha256": out.hexdigest(),
+                  "bytes": out.bytes, "render_ms": render_ms, "reason": None,
+                  "status": "unchanged", "stats": stats, "vector": None, "variants": []}
+
+        if changed is not None:
+            result["reason"] = _changed_since_reason(deps, changed, ref)
+            if result["reason"] is None:
+                result["status"] = "skipped"
+        if result["status"] != "skipped" and (
+                force or not _same_content(known_sha, path, result["sha256"])):
+            out.commit()
+            result["status"] = "written"
+        if vector is not None and result["status"] != "skipped":
+            result["vector"] = _write_vector(path, *vector, force)
+        if variants is not None and result["status"] != "skipped":
+            result["variants"] = [_write_variant(path, name, variant, options, force)
+                                  for name, variant in variants.items()]
+        return result
+    finally:
+        out.discard()
+
+
+def _write_vector(svg_path, xml, issues, force):
+    """Write a VectorDrawable beside svg_path if its bytes changed; returns its result record."""
+    path = os.path.join(os.path.dirname(svg_path), vector_drawable.vector_name(svg_path))
+    data = xml.encode()
+    sha = content_hash(data)
+    written = force or not _same_content(None, path, sha)
+    if written:
+        write_atomic(path, data)
+    return {"filename": os.path.basename(path), "sha256": sha, "bytes": len(data),
+            "written": written, "issues": [i.to_dict() for i in issues]}
+
+
+def _write_variant(svg_path, name, tree, options, force):
+    """Write one orientation variant beside svg_path if its bytes changed; returns its record."""
+    path = transform.variant_filename(svg_path, name)
+    out = AtomicFile(path)
+    try:
+        _write_tree(tree, out, options)
+        written = force or not _same_content(None, path, out.hexdigest())
+        if written:
+            out.commit()
+        return {"filename": os.path.basename(path), "sha256": out.hexdigest(),
+                "bytes": out.bytes, "written": written}
+    finally:
+        out.discard()
+
+
+def _write_scene(scene, out, options):
+    """Build the scene tree and stream it to out.
+
+    Returns (optimizer Stats or None, written tree, unoptimized tree).
+    """
+    source = scene()
+    stats, tree = _write_tree(source, out, options)
+    return stats, tree, source
+
+
+def _write_tree(tree, out, options):
+    """Stream tree to out, optimized if requested; returns (Stats or None, written tree)."""
+    if not options.get("optimize"):
+        svgtree.write_document(tree, out)
+        return None, tree
+    optimized, stats = optimizer.optimize_with_stats(tree)
+    optimizer.verify(tree, optimized)
+    svgtree.write_document(optimized, out, indent="")
+    return stats, optimized
+
+
+def validate_scene(job):
+    """Geometry findings for one registered scene and its variants. Runs in worker processes.
+
+    job is (filename, variant names); returns [(filename, [finding dicts])].
+    """
+    filename, names = job
+    tree = _load_state()[0][filename]()
+    trees = {filename: tree}
+    if names:
+        for name, variant in transform.variants(tree, names).items():
+            trees[transform.variant_filename(filename, name)] = variant
+    return [(name, [f.to_dict() for f in geometry.validate(t)]) for name, t in trees.items()]
+
+
+def validate(jobs=1, variants=()):
+    """Check every registered scene's geometry and print findings. Returns the error count."""
+    todo = [(filename, tuple(variants)) for filename in _load_state()[0]]
+    checked = errors = warnings = 0
+    for results in _run_validation(todo, jobs):
+        for filename, findings in results:
+            checked += 1
+            for f in findings:
+                print(f"  {filename}: {f['severity']} {f['code']}: {f['detail']}")
+                if f["severity"] == "error":
+                    errors += 1
+                else:
+                    warnings += 1
+    print(f"Validated {checked} scenes: {errors} errors, {warnings} warnings\n")
+    return errors
+
+
+def _run_validation(todo, jobs):
+    """Yield validate_scene results in registry order, batching scenes per worker."""
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1 or len(todo) <= 1:
+        yield from map(validate_scene, todo)
+        return
+    with ProcessPoolExecutor(max_workers=min(jobs, len(todo))) as pool:
+        yield from pool.map(validate_scene, todo, chunksize=max(1, len(todo) // (jobs * 4)))
+
+
+def build(output_dir=OUTPUT_DIR, force=False, changed_since=None, explain=False, jobs=1,
+          optimize=False, vector=False, variants=()):
+    """Render and write stale scenes. Returns (written, unchanged) filename lists.
+
+    changed_since: git ref; only scenes depending on definitions that differ
+    between that ref and the working tree are rebuilt.
+    explain: print why each scene is (or isn't) rebuilt.
+    jobs: worker processes for rendering (0 = one per CPU). Output is
+    byte-identical to a serial build.
+    optimize: run the size optimizer and write compact SVG. The setting is
+    recorded per scene, so toggling it rebuilds everything.
+    vector: also write an Android VectorDrawable beside each SVG.
+    variants: transform.py variant names (e.g. "S", "N_LHT") to write beside
+    each SVG.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    scenes, paths, _, index = _load_state()
+    changed = None
+    if changed_since:
+        old = SourceIndex.from_git(changed_since, paths, cwd=COMPONENTS_DIR)
+        for scene in scenes.values():
+            if isinstance(scene, templates.SpecScene):
+                text = git_show(changed_since, scene.path, COMPONENTS_DIR)
+                if text is not None:
+                    old.add_data(scene.dep_key, text)
+        changed = old.changed(index)
+    manifest = BuildManifest(os.path.join(output_dir, MANIFEST_NAME))
+    options = {name: True for name, on in (("optimize", optimize), ("vector", vector)) if on}
+    if variants:
+        options["variants"] = list(variants)
+
+    written, unchanged = [], []
+    todo, reasons = [], {}
+    for filename in scenes:
+        path = os.path.join(output_dir, filename)
+        entry = manifest.get(filename)
+        recorded = entry.get("deps") if entry else None
+        scene = scenes[filename]
+        if (recorded is not None and isinstance(scene, templates.SpecScene)
+                and not recorded.keys() >= set(scene.dep_keys)):
+            recorded = None         # recorded before the spec's token deps were
+        defer = None
+
+        if force:
+            reason = "forced"
+        elif entry and entry.get("options", {}) != options:
+            reason = "build options changed"
+        elif changed is not None:
+            reason = _changed_since_reason(recorded, changed, changed_since)
+            if recorded is None:
+                defer = changed
+        else:
+            reason = _stale_reason(recorded, index, manifest, filename, path)
+            if reason is None and vector:
+                xml_name = vector_drawable.vector_name(filename)
+                if not manifest.matches_disk(xml_name, os.path.join(output_dir, xml_name)):
+                    reason = "vector output missing or modified on disk"
+            if reason is None and not all(
+                    manifest.matches_disk(v, os.path.join(output_dir, v))
+                    for v in (transform.variant_filename(filename, n) for n in variants)):
+                reason = "variant output missing or modified on disk"
+        if reason is None:
+            if explain:
+                print(f"  {filename}: up to date")
+            unchanged.append(filename)
+            continue
+
+        known_sha = entry["sha256"] if entry and manifest.matches_disk(filename, path) else None
+        reasons[filename] = reason
+        todo.append((filename, path, known_sha, force, defer, changed_since, options))
+
+    start = time.perf_counter()
+    render_ms = 0.0
+    for result in _run(todo, jobs):
+        filename = result["filename"]
+        render_ms += result["render_ms"]
+        if result["status"] == "skipped":
+            if explain:
+                print(f"  {filename}: up to date")
+            unchanged.append(filename)
+            continue
+        if explain:
+            print(f"  {filename}: rebuild ({result['reason'] or reasons[filename]})")
+        if result["status"] == "written":
+            written.append(filename)
+            print(f"  {filename} ({result['bytes']} bytes, {result['render_ms']:.1f} ms)")
+        else:
+            unchanged.append(filename)
+        if result["stats"] is not None:
+            print(f"    optimized: {result['stats']}")
+        path = os.path.join(output_dir, filename)
+        fingerprint = deps_fingerprint(result["deps"])
+        manifest.record(filename, fingerprint, result["sha256"], path,
+                        deps=result["deps"], options=options)
+        vec = result["vector"]
+        if vec is not None:
+            if vec["written"]:
+                print(f"  {vec['filename']} ({vec['bytes']} bytes)")
+            for issue in vec["issues"]:
+                print(f"    vector {issue['kind']} <{issue['tag']}>: {issue['detail']}")
+            manifest.record(vec["filename"], fingerprint, vec["sha256"],
+                            os.path.join(output_dir, vec["filename"]), issues=vec["issues"])
+        for var in result["variants"]:
+            if var["written"]:
+                print(f"  {var['filename']} ({var['bytes']} bytes)")
+            manifest.record(var["filename"], fingerprint, var["sha256"],
+                            os.path.join(output_dir, var["filename"]))
+
+    manifest.save()
+    if todo:
+        wall_ms = (time.perf_counter() - start) * 1000
+        print(f"\nRendered {len(todo)} scenes: {render_ms:.1f} ms render, {wall_ms:.1f} ms wall")
+    return written, unchanged
+
+
+def build_themes(output_dir=OUTPUT_DIR, names=tuple(themes.THEMES), variants=()):
+    """Render every scene × theme into output_dir/themes/<theme>/. Returns (written, unchanged)."""
+    start = time.perf_counter()
+    themed = themes.render(_load_state()[0], names, variants)
+    written, unchanged = themes.write(themed, os.path.join(output_dir, "themes"))
+    for path in written:
+        print(f"  themes/{path}")
+    wall_ms = (time.perf_counter() - start) * 1000
+    print(f"\nThemed {len(themed[names[0]]) if names else 0} scenes x {len(names)} themes: "
+          f"{len(written)} written, {len(unchanged)} unchanged in {wall_ms:.1f} ms")
+    return written, unchanged
+
+
+def refresh_gallery(output_dir=OUTPUT_DIR, gallery=GALLERY):
+    """Point the gallery's generated images at their current content hashes.
+
+    Writes svg/versions.js (only when output_dir is the svg/ directory the
+    gallery shows), which review_gallery.html loads as its assetVersions
+    table, so reloading the page bypasses the browser's image cache. The
+    file is generated and gitignored; the gallery works without it.
+    Returns True if the file changed.
+    """
+    svg_dir = os.path.join(os.path.dirname(gallery), "svg")
+    if not (os.path.isdir(output_dir) and os.path.exists(gallery)
+            and os.path.samefile(output_dir, svg_dir)):
+        return False
+    manifest = BuildManifest(os.path.join(output_dir, MANIFEST_NAME))
+    versions = {filename[:-len(".svg")]: manifest.get(filename)["sha256"][:8]
+                for filename in _load_state()[0] if manifest.get(filename)}
+    path = os.path.join(output_dir, VERSIONS_NAME)
+    data = (f"// Generated by components/generate.py --watch; not committed.\n"
+            f"window.ASSET_VERSIONS = {json.dumps(versions, sort_keys=True)};\n").encode()
+    if _same_content(None, path, content_hash(data)):
+        return False
+    write_atomic(path, data)
+    return True
+
+
+# ── Watch mode ──────────────────────────────────────────────────────
+
+def _snapshot():
+    """path → (mtime_ns, size) of every watched source: components/*.py and specs/*."""
+    paths = [os.path.join(COMPONENTS_DIR, name) for name in os.listdir(COMPONENTS_DIR)
+             if name.endswith(".py")]
+    if os.path.isdir(templates.SPEC_DIR):
+        paths += [os.path.join(templates.SPEC_DIR, name) for name in os.listdir(templates.SPEC_DIR)]
+    snapshot = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        snapshot[path] = (st.st_mtime_ns, st.st_size)
+    return snapshot
+
+
+def _module_name(path):
+    """Module a watched file belongs to (specs belong to templates)."""
+    if os.path.dirname(path) == templates.SPEC_DIR:
+        return templates.__name__
+    return f"components.{os.path.splitext(os.path.basename(path))[0]}"
+
+
+def _imports(module):
+    """Names of the sibling component modules module imports (relative imports)."""
+    st = os.stat(module.__file__)
+    return _relative_imports(module.__file__, module.__package__, st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=None)
+def _relative_imports(path, package, mtime_ns, size):
+    """Parsed once per file version (mtime_ns/size are only part of the cache key)."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.level == 1:
+            if node.module:
+                names.add(f"{package}.{node.module}")
+            else:
+                names.update(f"{package}.{alias.name}" for alias in node.names)
+    return frozenset(names)
+
+
+def _reloadable():
+    return {n: m for n, m in sys.modules.items()
+            if n.startswith("components.") and n not in NO_RELOAD and m is not None}
+
+
+def _import_graph(loaded):
+    """Module name → the loaded sibling modules it imports."""
+    return {n: _imports(m) & loaded.keys() for n, m in loaded.items()}
+
+
+def reload_modules(names):
+    """Reload loaded component modules in names plus everything importing them.
+
+    Modules are reloaded dependencies first, so `from .style_tokens import *`
+    in primitives sees the new tokens before scenes see the new primitives.
+    Returns the reloaded module names in order.
+    """
+    loaded = _reloadable()
+    graph = _import_graph(loaded)
+    affected = {n for n in names if n in loaded}
+    grew = True
+    while grew:
+        importers = {n for n, deps in graph.items() if deps & affected} - affected
+        affected |= importers
+        grew = bool(importers)
+    order, seen = [], set()
+
+    def visit(name):
+        if name in seen:
+            return
+        seen.add(name)
+        for dep in sorted(graph[name] & affected):
+            visit(dep)
+        order.append(name)
+
+    for name in sorted(affected):
+        visit(name)
+    for name in order:
+        importlib.reload(loaded[name])
+    return order
+
+
+def watch(output_dir=OUTPUT_DIR, interval=WATCH_INTERVAL, check=False, names=(), **options):
+    """Rebuild whenever a component source or spec changes, until interrupted.
+
+    options are passed to build() (optimize, vector, variants); names are
+    themes to re-render. Rendering stays in-process so a rebuild costs only
+    the reload plus the affected scenes.
+    """
+    global _state
+    seen = _snapshot()
+    pending = set()
+    _import_graph(_reloadable())        # parse imports now, not on the first edit
+    print(f"\nWatching {COMPONENTS_DIR} (Ctrl-C to stop)")
+    try:
+        while True:
+            time.sleep(interval)
+            current = _snapshot()
+            changed = sorted(p for p in current.keys() | seen.keys() if current.get(p) != seen.get(p))
+            if not changed:
+                continue
+            seen = current
+            start = time.perf_counter()
+            print(f"\nChanged: {', '.join(os.path.relpath(p, COMPONENTS_DIR) for p in changed)}")
+            modules = {_module_name(p) for p in changed}
+            restart = sorted(modules & NO_RELOAD)
+            if restart:
+                print(f"  {', '.join(restart)} changed; restart --watch to pick it up")
+            pending |= modules - NO_RELOAD
+            try:
+                reloaded = reload_modules(pending)
+                _state = None
+                _load_state()
+            except Exception:
+                traceback.print_exc()
+                print("  reload failed; fix the error and save again")
+                continue
+            pending.clear()
+            if reloaded:
+                print(f"  reloaded {', '.join(n.rsplit('.', 1)[-1] for n in reloaded)}")
+            if check and validate(1, options.get("variants", ())):
+                continue
+            written, _ = build(output_dir, **options)
+            if names:
+                build_themes(output_dir, names, options.get("variants", ()))
+            if written and refresh_gallery(output_dir):
+                print(f"  refreshed svg/{VERSIONS_NAME}")
+            print(f"Rebuilt {len(written)} files in {(time.perf_counter() - start) * 1000:.0f} ms")
+    except KeyboardInterrupt:
+        print()
+
+
+def _run(todo, jobs):
+    """Yield render results in registry order, in-process or across a pool."""
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1 or len(todo) <= 1:
+        for job in todo:
+            yield render_scene(job)
+        return
+    with ProcessPoolExecutor(max_workers=min(jobs, len(todo))) as pool:
+        yield from pool.map(render_scene, todo)
+
+
+def _stale_reason(recorded, index, manifest, filename, path):
+    if recorded is None:
+        return "not in manifest"
+    stale = stale_deps(recorded, index)
+    if stale:
+        return _describe(stale) + " changed"
+    if not manifest.matches_disk(filename, path):
+        return "output missing or modified on disk"
+    return None
+
+
+def _changed_since_reason(deps, changed, ref):
+    if deps is None:
+        return "no recorded dependencies"
+    hit = sorted(changed.intersection(deps))
+    if not hit:
+        return None
+    return f"{_describe(hit)} changed since {ref}"
+
+
+def _describe(keys, limit=4):
+    shown = ", ".join(keys[:limit])
+    return shown if len(keys) <= limit else f"{shown} (+{len(keys) - limit} more)"
+
+
+def _same_content(known_sha, path, sha):
+    """True if the file on disk already holds exactly these bytes."""
+    if known_sha is not None:
+        return known_sha == sha
+    try:
+        with open(path, 'rb') as f:
+            return content_hash(f.read()) == sha
+    except OSError:
+        return False
+
 
-OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'svg')
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output-dir", default=OUTPUT_DIR,
+                        help="directory to write SVGs into (default: assets/svg)")
+    parser.add_argument("--force", action="store_true",
+                        help="re-render and rewrite every scene, ignoring the manifest")
+    parser.add_argument("--changed-since", metavar="GIT_REF",
+                        help="rebuild only scenes whose tokens/primitives changed since GIT_REF")
+    parser.add_argument("--explain", action="store_true",
+                        help="print why each scene is or isn't rebuilt")
+    parser.add_argument("--jobs", "-j", type=int, default=1, metavar="N",
+                        help="render scenes across N worker processes (0 = one per CPU)")
+    parser.add_argument("--optimize", action="store_true",
+                        help="merge rects, shorten numbers and write compact SVG (see optimize.py)")
+    parser.add_argument("--vector", action="store_true",
+                        help="also write an Android VectorDrawable .xml beside each SVG")
+    parser.add_argument("--variants", nargs="*", metavar="NAME",
+                        help="also write rotated/left-hand-traffic variants "
+                             f"(default with no names: {' '.join(transform.VARIANTS)})")
+    parser.add_argument("--validate", action="store_true",
+                        help="check scene geometry first (see geometry.py); stop on errors")
+    parser.add_argument("--themes", nargs="*", metavar="NAME",
+                        help="also render every scene per theme into <output-dir>/themes/ "
+                             f"(default with no names: {' '.join(themes.THEMES)})")
+    parser.add_argument("--watch", action="store_true",
+                        help="after building, rebuild affected scenes whenever a component "
+                             "source or spec changes (renders in-process)")
+    args = parser.parse_args(argv)
 
+    variants = ()
+    if args.variants is not None:
+        variants = tuple(args.variants) or transform.VARIANTS
+        try:
+            transform.require()
+            for name in variants:
+                transform.linear(name)
+        except (transform.TransformError, ValueError) as exc:
+            parser.error(str(exc))
+    names = ()
+    if args.themes is not None:
+        names = tuple(args.themes) or tuple(themes.THEMES)
+        try:
+            for name in names:
+                themes.tokens(name)
+        except ValueError as exc:
+            parser.error(str(exc))
+    if args.validate and validate(args.jobs, variants):
+        sys.exit(1)
 
-def main():
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    for filename, svg_content in ALL_SCENES.items():
-        path = os.path.join(OUTPUT_DIR, filename)
-        with open(path, 'w') as f:
-            f.write(svg_content)
-        size = os.path.getsize(path)
-        print(f"  {filename} ({size} bytes)")
-    print(f"\nGenerated {len(ALL_SCENES)} files in {os.path.abspath(OUTPUT_DIR)}")
+    written, unchanged = build(args.output_dir, force=args.force,
+                               changed_since=args.changed_since, explain=args.explain,
+                               jobs=args.jobs, optimize=args.optimize, vector=args.vector,
+                               variants=variants)
+    if names:
+        build_themes(args.output_dir, names, variants)
+    print(f"\nGenerated {len(written)} files ({len(unchanged)} unchanged) "
+          f"in {os.path.abspath(args.output_dir)}")
+    if args.watch:
+        refresh_gallery(args.output_dir)
+        watch(args.output_dir, check=args.validate, names=names, optimize=args.optimize,
+              vector=args.vector, variants=variants)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,274 @@
+"""Geometry validation for scene trees.
+
+Every primitive tagged with @component contributes an Item: its kind and
+its bounding box in root coordinates (arrows also keep their centerline as
+a polyline). Items go into a uniform-grid spatial index, so a scene is
+checked for
+
+    overlap               two solid things (vehicles, signs, objects,
+                          pedestrians) whose boxes intersect
+    outside_viewbox       an item that is not fully inside the viewBox
+    padding               a solid thing inside the 5% edge padding band
+    arrow_through         an arrow crossing a solid thing it does not start in
+    arrow_into            an arrow ending inside a solid thing it does not
+                          start in (driven into another vehicle)
+
+in O(n log n) for n items instead of comparing every pair. Roads, markings,
+crosswalks and the background may overlap anything. Only trees built from
+the primitives carry kinds, so parsed SVG files have nothing to check.
+"""
+
+import math
+from collections import defaultdict
+
+from .pathdata import PathError, flatten, parse as parse_path
+from .svgtree import (IDENTITY, INHERITED, NOT_RENDERED, Element, Fragment, apply, bbox, local_points,
+                      multiply, parse_transform, walk)
+
+# Kinds that must not overlap each other or be crossed by an arrow.
+SOLID = frozenset({"vehicle", "sign", "object", "pedestrian"})
+# Kinds that may run off the canvas edge (they are clipped by design).
+BLEED = frozenset({"background", "road"})
+
+EPSILON = 0.5       # slack for touching boxes and rounding, in viewBox units
+PADDING = 0.05      # style guide: content inside the viewBox with 5% padding
+
+
+class Item:
+    """One tagged primitive: kind, root-space box, arrow polylines."""
+
+    __slots__ = ("kind", "box", "lines", "label")
+
+    def __init__(self, kind, box, lines=(), label=""):
+        self.kind = kind
+        self.box = box
+        self.lines = lines
+        self.label = label
+
+    def __repr__(self):
+        return f"<Item {self.label}>"
+
+
+class Finding:
+    """A geometry problem in one scene."""
+
+    __slots__ = ("severity", "code", "detail")
+
+    def __init__(self, severity, code, detail):
+        self.severity = severity    # "error" or "warning"
+        self.code = code
+        self.detail = detail
+
+    def to_dict(self):
+        return {"severity": self.severity, "code": self.code, "detail": self.detail}
+
+    def __str__(self):
+        return f"{self.severity} {self.code}: {self.detail}"
+
+
+# ── Spatial index ───────────────────────────────────────────────────
+
+class GridIndex:
+    """Uniform grid of square cells; each box is registered in every cell it touches.
+
+    With a cell size near the typical item size each box touches O(1) cells,
+    so inserting n boxes and enumerating intersecting pairs is linear in n
+    plus the number of reported pairs.
+    """
+
+    def __init__(self, cell):
+        self.cell = float(cell)
+        self.boxes = []
+        self.cells = defaultdict(list)
+
+    @classmethod
+    def for_boxes(cls, boxes):
+        """Index boxes with the cell size set to their median extent."""
+        sizes = sorted(max(b[2] - b[0], b[3] - b[1]) for b in boxes)
+        index = cls(max(sizes[len(sizes) // 2], 1.0) if sizes else 1.0)
+        for b in boxes:
+            index.insert(b)
+        return index
+
+    def _span(self, box):
+        c = self.cell
+        return (range(math.floor(box[0] / c), math.floor(box[2] / c) + 1),
+                range(math.floor(box[1] / c), math.floor(box[3] / c) + 1))
+
+    def insert(self, box):
+        """Add a box; returns its id (insertion order)."""
+        i = len(self.boxes)
+        self.boxes.append(box)
+        xs, ys = self._span(box)
+        for cx in xs:
+            for cy in ys:
+                self.cells[cx, cy].append(i)
+        return i
+
+    def query(self, box):
+        """Ids of indexed boxes that intersect box, in ascending order."""
+        xs, ys = self._span(box)
+        hits = set()
+        for cx in xs:
+            for cy in ys:
+                for i in self.cells.get((cx, cy), ()):
+                    if intersects(self.boxes[i], box):
+                        hits.add(i)
+        return sorted(hits)
+
+    def pairs(self):
+        """Yield every (i, j), i < j, of intersecting boxes exactly once.
+
+        A pair shares every cell its intersection touches; it is reported
+        only from the cell holding the intersection's top-left corner.
+        """
+        c = self.cell
+        for (cx, cy), ids in self.cells.items():
+            for n, i in enumerate(ids):
+                a = self.boxes[i]
+                for j in ids[n + 1:]:
+                    b = self.boxes[j]
+                    if not intersects(a, b):
+                        continue
+                    if (math.floor(max(a[0], b[0]) / c) == cx
+                            and math.floor(max(a[1], b[1]) / c) == cy):
+                        yield (i, j) if i < j else (j, i)
+
+
+def intersects(a, b, eps=0.0):
+    """True if boxes a and b overlap by more than eps on both axes."""
+    return (min(a[2], b[2]) - max(a[0], b[0]) > eps
+            and min(a[3], b[3]) - max(a[1], b[1]) > eps)
+
+
+def contains(box, x, y, eps=0.0):
+    return box[0] - eps <= x <= box[2] + eps and box[1] - eps <= y <= box[3] + eps
+
+
+def segment_hits_box(p, q, box):
+    """True if segment p→q passes through the interior of box (Liang–Barsky clip)."""
+    t0, t1 = 0.0, 1.0
+    dx, dy = q[0] - p[0], q[1] - p[1]
+    for delta, lo, hi, start in ((dx, box[0], box[2], p[0]), (dy, box[1], box[3], p[1])):
+        if delta == 0:
+            if not lo < start < hi:
+                return False
+            continue
+        a, b = (lo - start) / delta, (hi - start) / delta
+        if a > b:
+            a, b = b, a
+        t0, t1 = max(t0, a), min(t1, b)
+        if t0 >= t1:
+            return False
+    return True
+
+
+# ── Items ───────────────────────────────────────────────────────────
+
+def collect(root):
+    """Items for every @component-tagged node under root (outermost tag wins)."""
+    items = []
+    _collect(root, IDENTITY, {}, items)
+    return items
+
+
+def _collect(node, ctm, inherited, items):
+    if isinstance(node, (Element, Fragment)) and node.kind is not None:
+        box = bbox(node, ctm, inherited)
+        if box is not None:
+            lines = _centerlines(node, ctm, inherited) if node.kind == "arrow" else ()
+            label = f"{node.kind} at ({box[0]:g},{box[1]:g})-({box[2]:g},{box[3]:g})"
+            items.append(Item(node.kind, box, lines, label))
+        return
+    if isinstance(node, Fragment):
+        for child in node.children:
+            _collect(child, ctm, inherited, items)
+    elif isinstance(node, Element) and node.tag not in NOT_RENDERED:
+        if "transform" in node.attrs:
+            ctm = multiply(ctm, parse_transform(node.attrs["transform"]))
+        own = {k: v for k, v in node.attrs.items() if k in INHERITED}
+        if own:
+            inherited = {**inherited, **own}
+        for child in node.children:
+            _collect(child, ctm, inherited, items)
+
+
+def _centerlines(node, ctm, inherited):
+    """Root-space polylines traced by the paths and lines under node."""
+    lines = []
+    for elem, m, _ in walk(node, ctm, inherited):
+        if elem.tag == "path":
+            try:
+                polys = flatten(parse_path(elem.get("d", "")), tolerance=0.5)
+            except PathError:
+                continue
+            lines.extend([apply(m, x, y) for x, y in pts] for pts, _ in polys)
+        elif elem.tag in ("line", "polyline"):
+            lines.append([apply(m, x, y) for x, y in local_points(elem)])
+    return tuple(line for line in lines if len(line) > 1)
+
+
+def viewbox(root):
+    """(x0, y0, x1, y1) of the root viewBox, or None."""
+    nums = str(root.get("viewBox", "")).replace(",", " ").split()
+    if len(nums) != 4:
+        return None
+    x, y, w, h = (float(n) for n in nums)
+    return (x, y, x + w, y + h)
+
+
+# ── Checks ──────────────────────────────────────────────────────────
+
+def validate(root):
+    """All geometry findings for one root <svg> Element, errors first."""
+    items = collect(root)
+    findings = _bounds(items, viewbox(root))
+    solid = [it for it in items if it.kind in SOLID]
+    index = GridIndex.for_boxes([it.box for it in solid])
+
+    for i, j in index.pairs():
+        a, b = solid[i], solid[j]
+        if intersects(a.box, b.box, EPSILON):
+            findings.append(Finding("error", "overlap", f"{a.label} overlaps {b.label}"))
+
+    for arrow in items:
+        if arrow.kind != "arrow" or not arrow.lines:
+            continue
+        start, end = arrow.lines[0][0], arrow.lines[-1][-1]
+        for i in index.query(arrow.box):
+            box = solid[i].box
+            if contains(box, *start, EPSILON):
+                continue        # the arrow's own vehicle
+            if contains(box, *end, EPSILON):
+                findings.append(Finding("error", "arrow_into",
+                                        f"{arrow.label} ends inside {solid[i].label}"))
+                continue
+            inner = (box[0] + EPSILON, box[1] + EPSILON, box[2] - EPSILON, box[3] - EPSILON)
+            if any(segment_hits_box(p, q, inner)
+                   for line in arrow.lines for p, q in zip(line, line[1:])):
+                findings.append(Finding("error", "arrow_through",
+                                        f"{arrow.label} passes through {solid[i].label}"))
+    findings.sort(key=lambda f: f.severity != "error")
+    return findings
+
+
+def _bounds(items, vb):
+    findings = []
+    if vb is None:
+        return [Finding("error", "outside_viewbox", "root <svg> has no usable viewBox")]
+    pad_x = (vb[2] - vb[0]) * PADDING
+    pad_y = (vb[3] - vb[1]) * PADDING
+    inner = (vb[0] + pad_x, vb[1] + pad_y, vb[2] - pad_x, vb[3] - pad_y)
+    for it in items:
+        if it.kind in BLEED:
+            continue
+        b = it.box
+        if (b[0] < vb[0] - EPSILON or b[1] < vb[1] - EPSILON
+                or b[2] > vb[2] + EPSILON or b[3] > vb[3] + EPSILON):
+            findings.append(Finding("error", "outside_viewbox", f"{it.label} is clipped"))
+        elif it.kind in SOLID and (b[0] < inner[0] or b[1] < inner[1]
+                                   or b[2] > inner[2] or b[3] > inner[3]):
+            findings.append(Finding("warning", "padding",
+                                    f"{it.label} is within the {PADDING:.0%} edge padding"))
+    return findings
+
@@ -0,0 +1,114 @@
+"""Build manifest for incremental scene generation.
+
+The manifest records, per output file, the SHA-256 of the rendered SVG, the
+dependencies it was rendered from (see deps.py), and the size/mtime the file
+had when it was written. A scene whose dependencies are unchanged and whose
+file still matches on stat() is skipped without rendering or reading it.
+"""
+
+import hashlib
+import json
+import os
+
+MANIFEST_VERSION = 2
+MANIFEST_NAME = ".build-manifest.json"
+
+
+def content_hash(data):
+    """SHA-256 hex digest of bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def write_atomic(path, data):
+    """Write bytes to path via a temp file + rename so readers never see a partial file."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+class AtomicFile:
+    """Text sink that streams UTF-8 into a temp file beside path, hashing as it goes.
+
+    Nothing is visible at path until commit(); discard() drops the temp file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.tmp = f"{path}.{os.getpid()}.tmp"
+        self.bytes = 0
+        self._hash = hashlib.sha256()
+        self._f = open(self.tmp, "wb")
+
+    def write(self, text):
+        data = text.encode()
+        self._hash.update(data)
+        self._f.write(data)
+        self.bytes += len(data)
+
+    def hexdigest(self):
+        return self._hash.hexdigest()
+
+    def commit(self):
+        self._f.close()
+        os.replace(self.tmp, self.path)
+
+    def discard(self):
+        self._f.close()
+        if os.path.exists(self.tmp):
+            os.unlink(self.tmp)
+
+
+class BuildManifest:
+    """Per-output-file record of content hash, input fingerprint and stat."""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self._dirty = False
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == MANIFEST_VERSION:
+            self.entries = data.get("entries", {})
+
+    def get(self, filename):
+        return self.entries.get(filename)
+
+    def matches_disk(self, filename, out_path):
+        """True if out_path still has the size/mtime recorded when we wrote it."""
+        entry = self.entries.get(filename)
+        if entry is None:
+            return False
+        try:
+            st = os.stat(out_path)
+        except OSError:
+            return False
+        return st.st_size == entry.get("bytes") and st.st_mtime_ns == entry.get("mtime_ns")
+
+    def record(self, filename, fingerprint, sha256, out_path, **extra):
+        st = os.stat(out_path)
+        entry = {
+            "sha256": sha256,
+            "fingerprint": fingerprint,
+            "bytes": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+        }
+        entry.update(extra)
+        if self.entries.get(filename) != entry:
+            self.entries[filename] = entry
+            self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        data = {"version": MANIFEST_VERSION, "entries": self.entries}
+        write_atomic(self.path, (json.dumps(data, indent=2, sort_keys=True) + "\n").encode())
+        self._dirty = False
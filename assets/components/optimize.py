@@ -0,0 +1,313 @@
+"""Size optimizer for generated scene trees.
+
+Passes, in order:
+  1. drop comments and flatten Fragments into their parent (the optimized
+     tree is meant to be written with write_document(..., indent=""))
+  2. drop zero-valued geometry defaults, rewrite numbers in their shortest
+     exact form ("79.0" → "79", "0.15" → ".15"), compact path/point data and
+     shorten #RRGGBB colors to #RGB where lossless
+  3. merge runs of adjacent plain rects with the same fill into one <path>
+  4. hoist a fill shared by a run of adjacent siblings onto a wrapping <g>
+
+Every pass is exact, so the optimized tree paints the same pixels. Rect
+merging only touches rects with no stroke, radius, opacity or transform
+that are adjacent in paint order; each becomes a clockwise subpath, and
+under the default nonzero fill rule the union of same-colour subpaths
+covers exactly what the rects did. verify() re-derives the paint sequence of
+both trees and checks they match, and generate.py runs it on every
+optimized scene.
+"""
+
+import re
+from io import StringIO
+
+from .svgtree import INDENT, Comment, Element, Fragment, walk, write_document
+
+# Attributes whose value is a single number.
+NUMERIC_ATTRS = frozenset({
+    "x", "y", "width", "height", "rx", "ry", "cx", "cy", "r", "x1", "y1", "x2", "y2",
+    "stroke-width", "opacity", "fill-opacity", "stroke-opacity", "font-size",
+    "markerWidth", "markerHeight", "refX", "refY",
+})
+# Geometry attributes that default to 0 and are not inherited.
+ZERO_DEFAULTS = {
+    "rect": ("x", "y"), "circle": ("cx", "cy"), "ellipse": ("cx", "cy"),
+    "line": ("x1", "y1", "x2", "y2"), "text": ("x", "y"),
+}
+# Rects with any attribute outside this set are left alone by the merge pass.
+_MERGEABLE_RECT_ATTRS = frozenset({"x", "y", "width", "height", "fill"})
+# Minimum run of same-fill siblings worth wrapping in <g fill>: each hoist
+# adds one element, so short runs cost more in element count than they save.
+MIN_FILL_RUN = 3
+
+_N = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?"
+_NUM = re.compile(_N)
+_PATH_TOKEN = re.compile(r"[A-Za-z]|" + _N)
+_HEX6 = re.compile(r"#([0-9a-fA-F])\1([0-9a-fA-F])\2([0-9a-fA-F])\3")
+# One merged rect: "M{x} {y}h{w}v{h}h{-w}z" (see _rect_subpath).
+_RECT_SUBPATH = re.compile(f"M({_N}) ({_N})h({_N})v({_N})h({_N})z")
+
+
+class Stats:
+    __slots__ = ("bytes_before", "bytes_after", "elements_before", "elements_after")
+
+    def __init__(self, bytes_before, bytes_after, elements_before, elements_after):
+        self.bytes_before = bytes_before
+        self.bytes_after = bytes_after
+        self.elements_before = elements_before
+        self.elements_after = elements_after
+
+    def __str__(self):
+        return (f"{self.bytes_before} → {self.bytes_after} bytes, "
+                f"{self.elements_before} → {self.elements_after} elements")
+
+
+def optimize(root):
+    """Return an optimized copy of a scene tree (root <svg> Element)."""
+    return _optimize(root)
+
+
+def optimize_with_stats(root):
+    """optimize() plus a Stats record comparing serialized size and element count."""
+    optimized = _optimize(root)
+    return optimized, Stats(len(_serialize(root, INDENT).encode()),
+                            len(_serialize(optimized, "").encode()),
+                            count_elements(root), count_elements(optimized))
+
+
+def count_elements(node):
+    return sum(1 for _ in node.iter())
+
+
+def _serialize(root, indent):
+    buf = StringIO()
+    write_document(root, buf, indent)
+    return buf.getvalue()
+
+
+# ── Passes ──────────────────────────────────────────────────────────
+
+def _optimize(elem):
+    children = []
+    for child in _flatten(elem.children):
+        children.append(_optimize(child) if isinstance(child, Element) else child)
+    out = Element(elem.tag, _shorten_attrs(elem), (), elem.text)
+    if elem.tag not in ("defs", "marker", "text"):
+        children = _hoist_fills(_merge_rects(children))
+    out.children = children
+    return out
+
+
+def _flatten(children):
+    for child in children:
+        if isinstance(child, Fragment):
+            yield from _flatten(child.children)
+        elif isinstance(child, Element):
+            yield child
+        elif not isinstance(child, Comment):
+            raise TypeError(f"Unexpected node {type(child).__name__}")
+
+
+def _shorten_attrs(elem):
+    attrs = {}
+    zero = ZERO_DEFAULTS.get(elem.tag, ())
+    for name, value in elem.attrs.items():
+        if name in NUMERIC_ATTRS and _is_number(value):
+            value = fmt_number(value)
+            if name in zero and value == "0":
+                continue
+        elif name == "d":
+            value = compact_numbers(value, _PATH_TOKEN)
+        elif name in ("points", "transform", "viewBox"):
+            value = _NUM.sub(lambda m: fmt_number(m.group()), str(value))
+            if name == "points":
+                value = compact_numbers(value, _NUM)
+        elif isinstance(value, str):
+            value = _HEX6.sub(r"#\1\2\3", value) if value.startswith("#") else value
+        attrs[name] = value
+    return attrs
+
+
+def _merge_rects(children):
+    out, run = [], []
+
+    def flush():
+        if len(run) > 1:
+            d = "".join(_rect_subpath(r) for r in run)
+            out.append(Element("path", {"d": d, "fill": run[0].attrs["fill"]}))
+        else:
+            out.extend(run)
+        run.clear()
+
+    for child in children:
+        if _mergeable(child):
+            if run and run[0].attrs["fill"] != child.attrs["fill"]:
+                flush()
+            run.append(child)
+        else:
+            flush()
+            out.append(child)
+    flush()
+    return out
+
+
+def _mergeable(elem):
+    return (elem.tag == "rect" and "fill" in elem.attrs and elem.attrs["fill"] != "none"
+            and set(elem.attrs) <= _MERGEABLE_RECT_ATTRS)
+
+
+def _rect_subpath(rect):
+    a = rect.attrs
+    x, y = a.get("x", "0"), a.get("y", "0")
+    w, h = a.get("width", "0"), a.get("height", "0")
+    return f"M{x} {y}h{w}v{h}h{fmt_number(-float(w))}z"
+
+
+def _hoist_fills(children):
+    out, run = [], []
+
+    def flush():
+        if len(run) >= MIN_FILL_RUN:
+            fill = run[0].attrs["fill"]
+            for elem in run:
+                del elem.attrs["fill"]
+            out.append(Element("g", {"fill": fill}, list(run)))
+        else:
+            out.extend(run)
+        run.clear()
+
+    for child in children:
+        fill = child.attrs.get("fill") if child.tag not in ("defs", "g") else None
+        if fill is not None and run and run[0].attrs["fill"] == fill:
+            run.append(child)
+            continue
+        flush()
+        if fill is not None:
+            run.append(child)
+        else:
+            out.append(child)
+    flush()
+    return out
+
+
+# ── Number formatting ───────────────────────────────────────────────
+
+def _is_number(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return True
+    return isinstance(value, str) and _NUM.fullmatch(value) is not None
+
+
+def fmt_number(value):
+    """Shortest exact spelling of a number: 79.0 → "79", 0.15 → ".15", -0.5 → "-.5"."""
+    f = float(value)
+    if f.is_integer() and abs(f) < 1e15:
+        return str(int(f))
+    s = repr(f)
+    if s.startswith("0."):
+        return s[1:]
+    if s.startswith("-0."):
+        return "-" + s[2:]
+    return s
+
+
+def compact_numbers(data, token_re):
+    """Re-spell path/point data with minimal separators ("M 0,160 Q 1,2" → "M0 160Q1 2")."""
+    out = []
+    prev_num = False
+    for tok in token_re.findall(str(data)):
+        if tok.isalpha():
+            out.append(tok)
+            prev_num = False
+            continue
+        num = fmt_number(tok)
+        if prev_num and not num.startswith("-"):
+            out.append(" ")
+        out.append(num)
+        prev_num = True
+    return "".join(out)
+
+
+# ── Verification ────────────────────────────────────────────────────
+
+def verify(before, after):
+    """Raise AssertionError unless both trees paint the same shapes in the same order.
+
+    Each tree is reduced to its paint sequence: every rendered shape with its
+    resolved paint attributes, transform and exact geometry (merged rect
+    paths are expanded back into rects). Adjacent rects sharing paint are
+    compared as a set, since their relative order cannot change the pixels.
+    """
+    a, b = _paint_sequence(before), _paint_sequence(after)
+    if a != b:
+        for i, (x, y) in enumerate(zip(a, b)):
+            if x != y:
+                raise AssertionError(f"paint step {i} differs:\n  {x}\n  {y}")
+        raise AssertionError(f"paint sequence length differs: {len(a)} vs {len(b)}")
+    if _defs_signature(before) != _defs_signature(after):
+        raise AssertionError("<defs> content differs")
+
+
+def _paint_sequence(root):
+    steps = []
+    for elem, ctm, attrs in walk(root):
+        if elem.tag in ("svg", "g"):
+            continue
+        paint = tuple(sorted((k, _norm(v)) for k, v in attrs.items()))
+        own = tuple(sorted((k, _norm(v)) for k, v in elem.attrs.items()
+                           if k not in ("fill",) and k not in ZERO_DEFAULTS.get(elem.tag, ())))
+        extra = (ctm, paint, _norm(elem.attrs.get("opacity", 1)), elem.text)
+        if elem.tag == "rect" and _plain_rect(elem):
+            steps.append(("rects", extra, frozenset([_rect_geometry(elem.attrs)])))
+        elif elem.tag == "path" and _is_rect_path(elem.attrs.get("d", "")):
+            geoms = frozenset(tuple(float(n) for n in m)
+                              for m in _RECT_SUBPATH.findall(elem.attrs["d"]))
+            steps.append(("rects", extra, geoms))
+        else:
+            zero = {k: 0.0 for k in ZERO_DEFAULTS.get(elem.tag, ())}
+            geom = {**zero, **{k: _norm(v) for k, v in elem.attrs.items() if k in zero}}
+            steps.append((elem.tag, extra, own, tuple(sorted(geom.items()))))
+    merged = []
+    for step in steps:
+        if step[0] == "rects" and merged and merged[-1][0] == "rects" and merged[-1][1] == step[1]:
+            merged[-1] = ("rects", step[1], merged[-1][2] | step[2])
+        else:
+            merged.append(step)
+    return merged
+
+
+def _plain_rect(elem):
+    return set(elem.attrs) <= _MERGEABLE_RECT_ATTRS
+
+
+def _rect_geometry(a):
+    x, y = float(a.get("x", 0)), float(a.get("y", 0))
+    w, h = float(a.get("width", 0)), float(a.get("height", 0))
+    return (x, y, w, h, -w)
+
+
+def _is_rect_path(d):
+    return bool(d) and _RECT_SUBPATH.sub("", d) == ""
+
+
+def _norm(value):
+    """Canonical form for comparing attribute values across spellings."""
+    if _is_number(value):
+        return float(value)
+    s = str(value)
+    if re.fullmatch(r"#[0-9a-fA-F]{3}", s):
+        return "#" + "".join(c * 2 for c in s[1:]).upper()
+    if re.fullmatch(r"#[0-9a-fA-F]{6}", s):
+        return s.upper()
+    if _PATH_TOKEN.search(s) and re.search(r"\d", s):
+        return tuple(t if t.isalpha() else float(t) for t in _PATH_TOKEN.findall(s))
+    return s
+
+
+def _defs_signature(root):
+    sig = []
+    for elem in root.iter():
+        if elem.tag in ("defs", "marker"):
+            for inner in elem.iter():
+                sig.append((inner.tag, tuple(sorted((k, _norm(v)) for k, v in inner.attrs.items()))))
+    return sig
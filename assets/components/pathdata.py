@@ -0,0 +1,277 @@
+"""SVG path data parsing.
+
+parse() turns a `d` attribute into absolute segments using a reduced command
+set, so consumers only handle M, L, C, Q, A and Z; flatten() turns those into
+polylines for rasterizing:
+
+    H/V → L,  S → C (reflected control point),  T → Q,  relative → absolute
+
+Each segment is (command, points) where points are (x, y) tuples in absolute
+coordinates; A keeps its radii/rotation/flags as (rx, ry, rotation,
+large_arc, sweep, (x, y)). Arc flags are single characters, so the compact
+form "a5 5 0 0110 0" (flags 0 and 1, then x 10) parses as SVG requires.
+"""
+
+import math
+import re
+
+_NUMBER = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?"
+_TOKEN = re.compile(r"[MmZzLlHhVvCcSsQqTtAa]|" + _NUMBER)
+_NUMBER = re.compile(_NUMBER)
+_FLAGS = (3, 4)         # large_arc and sweep: indexes of the A arguments that are flags
+_ARITY = {"M": 2, "L": 2, "H": 1, "V": 1, "C": 6, "S": 4, "Q": 4, "T": 2, "A": 7, "Z": 0}
+
+
+class PathError(ValueError):
+    pass
+
+
+def parse(d):
+    """Path data string → list of absolute (command, args) segments."""
+    tokens = _TOKEN.findall(d or "")
+    segments = []
+    i = 0
+    cmd = None
+    cx = cy = 0.0          # current point
+    sx = sy = 0.0          # start of current subpath
+    last_ctrl = None       # (command, control point) for S/T reflection
+    while i < len(tokens):
+        tok = tokens[i]
+        if tok.isalpha():
+            cmd = tok
+            i += 1
+        elif cmd is None:
+            raise PathError(f"expected a command before numbers in {d!r}")
+        upper = cmd.upper()
+        rel = cmd.islower()
+        n = _ARITY[upper]
+        if upper == "Z":
+            segments.append(("Z", ()))
+            cx, cy = sx, sy
+            last_ctrl = None
+            cmd = None
+            continue
+        v, i = _args(tokens, i, cmd, n, d)
+        ox, oy = (cx, cy) if rel else (0.0, 0.0)
+
+        if upper == "M":
+            cx, cy = v[0] + ox, v[1] + oy
+            sx, sy = cx, cy
+            segments.append(("M", ((cx, cy),)))
+            # Extra pairs after M are implicit line-tos.
+            cmd = "l" if rel else "L"
+            last_ctrl = None
+            continue
+        if upper in ("L", "H", "V"):
+            if upper == "H":
+                x, y = v[0] + (cx if rel else 0.0), cy
+            elif upper == "V":
+                x, y = cx, v[0] + (cy if rel else 0.0)
+            else:
+                x, y = v[0] + ox, v[1] + oy
+            segments.append(("L", ((x, y),)))
+            cx, cy = x, y
+            last_ctrl = None
+        elif upper in ("C", "S"):
+            if upper == "C":
+                c1 = (v[0] + ox, v[1] + oy)
+                c2, end = (v[2] + ox, v[3] + oy), (v[4] + ox, v[5] + oy)
+            else:
+                c1 = _reflect(last_ctrl, "C", cx, cy)
+                c2, end = (v[0] + ox, v[1] + oy), (v[2] + ox, v[3] + oy)
+            segments.append(("C", (c1, c2, end)))
+            last_ctrl = ("C", c2)
+            cx, cy = end
+        elif upper in ("Q", "T"):
+            if upper == "Q":
+                c, end = (v[0] + ox, v[1] + oy), (v[2] + ox, v[3] + oy)
+            else:
+                c, end = _reflect(last_ctrl, "Q", cx, cy), (v[0] + ox, v[1] + oy)
+            segments.append(("Q", (c, end)))
+            last_ctrl = ("Q", c)
+            cx, cy = end
+        else:  # A
+            end = (v[5] + ox, v[6] + oy)
+            segments.append(("A", (abs(v[0]), abs(v[1]), v[2], v[3] != 0, v[4] != 0, end)))
+            cx, cy = end
+            last_ctrl = None
+    return segments
+
+
+def _args(tokens, i, cmd, n, d):
+    """The n numbers of cmd starting at tokens[i], and the index after them.
+
+    A flag takes one character of its token; the rest of a packed token like
+    "0110" stays in tokens for the next argument.
+    """
+    v = []
+    while len(v) < n:
+        if i >= len(tokens) or tokens[i].isalpha():
+            raise PathError(f"{cmd} needs {n} numbers in {d!r}")
+        tok = tokens[i]
+        if cmd in "Aa" and len(v) in _FLAGS:
+            rest = tok[1:]
+            if tok[0] not in "01" or (rest and not _NUMBER.fullmatch(rest)):
+                raise PathError(f"arc flag must be 0 or 1, not {tok!r} in {d!r}")
+            v.append(float(tok[0]))
+            if rest:
+                tokens[i] = rest
+                continue
+        else:
+            v.append(float(tok))
+        i += 1
+    return v, i
+
+
+def _reflect(last_ctrl, kind, cx, cy):
+    if last_ctrl is None or last_ctrl[0] != kind:
+        return (cx, cy)
+    px, py = last_ctrl[1]
+    return (2 * cx - px, 2 * cy - py)
+
+
+def end_tangent(segments):
+    """(end point, direction) of the last drawn segment, or None if undefined.
+
+    Arc end tangents are not derived (the scenes never end an arrow on an arc).
+    """
+    start = prev = None
+    tangent = None
+    for cmd, args in segments:
+        if cmd == "M":
+            start = prev = args[0]
+            continue
+        if cmd == "Z":
+            end, ctrl = start, prev
+        elif cmd == "L":
+            end, ctrl = args[0], prev
+        elif cmd == "Q":
+            end, ctrl = args[1], args[0]
+        elif cmd == "C":
+            end = args[2]
+            ctrl = args[1] if args[1] != end else args[0]
+        else:  # A
+            end, ctrl = args[-1], None
+        if ctrl is not None and ctrl != end:
+            tangent = (end, (end[0] - ctrl[0], end[1] - ctrl[1]))
+        else:
+            tangent = None
+        prev = end
+    return tangent
+
+
+# ── Flattening ──────────────────────────────────────────────────────
+
+def flatten(segments, tolerance=0.25):
+    """Absolute segments → list of (points, closed) polylines.
+
+    Curves and arcs are subdivided so no chord strays more than ~tolerance
+    from the true curve (in the segments' own units).
+    """
+    polylines = []
+    points = []
+    start = cur = (0.0, 0.0)
+
+    def finish(closed):
+        if len(points) > 1 or (points and closed):
+            polylines.append((points[:], closed))
+
+    for cmd, args in segments:
+        if cmd == "M":
+            finish(False)
+            start = cur = args[0]
+            points = [cur]
+            continue
+        if not points:
+            points = [cur]
+        if cmd == "Z":
+            finish(True)
+            cur = start
+            points = []
+            continue
+        if cmd == "L":
+            cur = args[0]
+            points.append(cur)
+        elif cmd == "Q":
+            points.extend(_quadratic(cur, args[0], args[1], tolerance))
+            cur = args[1]
+        elif cmd == "C":
+            points.extend(_cubic(cur, args[0], args[1], args[2], tolerance))
+            cur = args[2]
+        else:  # A
+            points.extend(arc_points(cur, *args, tolerance=tolerance))
+            cur = args[-1]
+    finish(False)
+    return polylines
+
+
+def _steps(deviation, tolerance):
+    if deviation <= tolerance:
+        return 1
+    return min(256, math.ceil(math.sqrt(deviation / tolerance)))
+
+
+def _quadratic(p0, p1, p2, tolerance):
+    dd = math.hypot(p0[0] - 2 * p1[0] + p2[0], p0[1] - 2 * p1[1] + p2[1])
+    n = _steps(dd / 4, tolerance)
+    out = []
+    for i in range(1, n + 1):
+        t = i / n
+        u = 1 - t
+        out.append((u * u * p0[0] + 2 * u * t * p1[0] + t * t * p2[0],
+                    u * u * p0[1] + 2 * u * t * p1[1] + t * t * p2[1]))
+    return out
+
+
+def _cubic(p0, p1, p2, p3, tolerance):
+    dd = max(math.hypot(p0[0] - 2 * p1[0] + p2[0], p0[1] - 2 * p1[1] + p2[1]),
+             math.hypot(p1[0] - 2 * p2[0] + p3[0], p1[1] - 2 * p2[1] + p3[1]))
+    n = _steps(dd * 3 / 4, tolerance)
+    out = []
+    for i in range(1, n + 1):
+        t = i / n
+        u = 1 - t
+        a, b, c, d = u * u * u, 3 * u * u * t, 3 * u * t * t, t * t * t
+        out.append((a * p0[0] + b * p1[0] + c * p2[0] + d * p3[0],
+                    a * p0[1] + b * p1[1] + c * p2[1] + d * p3[1]))
+    return out
+
+
+def arc_points(p0, rx, ry, rotation, large_arc, sweep, p1, tolerance=0.25):
+    """Points along an SVG elliptical arc from p0 to p1 (p0 excluded), per SVG 1.1 F.6.5."""
+    if p0 == p1:
+        return []
+    if rx == 0 or ry == 0:
+        return [p1]
+    phi = math.radians(rotation)
+    cos, sin = math.cos(phi), math.sin(phi)
+    dx2, dy2 = (p0[0] - p1[0]) / 2, (p0[1] - p1[1]) / 2
+    x1p, y1p = cos * dx2 + sin * dy2, -sin * dx2 + cos * dy2
+    lam = (x1p / rx) ** 2 + (y1p / ry) ** 2
+    if lam > 1:
+        rx, ry = rx * math.sqrt(lam), ry * math.sqrt(lam)
+    num = rx * rx * ry * ry - rx * rx * y1p * y1p - ry * ry * x1p * x1p
+    den = rx * rx * y1p * y1p + ry * ry * x1p * x1p
+    coef = math.sqrt(max(0.0, num / den)) if den else 0.0
+    if large_arc == sweep:
+        coef = -coef
+    cxp, cyp = coef * rx * y1p / ry, -coef * ry * x1p / rx
+    cx = cos * cxp - sin * cyp + (p0[0] + p1[0]) / 2
+    cy = sin * cxp + cos * cyp + (p0[1] + p1[1]) / 2
+    theta1 = math.atan2((y1p - cyp) / ry, (x1p - cxp) / rx)
+    theta2 = math.atan2((-y1p - cyp) / ry, (-x1p - cxp) / rx)
+    delta = theta2 - theta1
+    if sweep and delta < 0:
+        delta += 2 * math.pi
+    elif not sweep and delta > 0:
+        delta -= 2 * math.pi
+    r = max(rx, ry)
+    step = 2 * math.acos(max(-1.0, 1 - tolerance / r)) if tolerance < r else math.pi / 2
+    n = max(2, min(512, math.ceil(abs(delta) / step)))
+    out = []
+    for i in range(1, n):
+        t = theta1 + delta * i / n
+        ex, ey = rx * math.cos(t), ry * math.sin(t)
+        out.append((cx + ex * cos - ey * sin, cy + ex * sin + ey * cos))
+    out.append(p1)
+    return out
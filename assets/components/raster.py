@@ -0,0 +1,590 @@
+"""Offline SVG rasterizer on NumPy (text via Pillow).
+
+Covers what the asset library uses: rect (incl. rounded), circle, ellipse,
+line, polyline, polygon and path (all commands, arcs included); fill and
+stroke with opacity, fill-rule, linecap/linejoin/miterlimit and dash arrays;
+nested transforms; group opacity (rendered as a layer); clip-path;
+marker-end arrowheads; <text> in the default sans-serif face.
+
+Shapes are flattened to polygons in device space and filled by scanline
+winding on a SUPERSAMPLE x SUPERSAMPLE grid per pixel. Strokes are turned
+into polygons first (segment quads + joins + caps, all wound the same way,
+so nonzero filling gives their union).
+
+numpy and Pillow are optional for the rest of the component library; this
+module raises RasterError when they are missing.
+"""
+
+import hashlib
+import math
+import os
+import re
+
+try:
+    import numpy as np
+except ImportError:  # optional: only rasterizing needs it
+    np = None
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:
+    Image = ImageDraw = ImageFont = None
+
+from .pathdata import PathError, end_tangent, flatten, parse as parse_path
+from .svgtree import NOT_RENDERED, Element, Fragment, multiply, parse_transform, scale_factor
+
+SUPERSAMPLE = 4
+# Max chord deviation when flattening curves, in device pixels.
+TOLERANCE = 0.2
+
+_NUM = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_URL = re.compile(r"url\(\s*#([^)\s]+)\s*\)")
+_INHERITED = frozenset({
+    "fill", "fill-opacity", "fill-rule", "stroke", "stroke-width", "stroke-opacity",
+    "stroke-linecap", "stroke-linejoin", "stroke-miterlimit", "stroke-dasharray",
+    "stroke-dashoffset", "font-family", "font-size", "font-weight", "text-anchor",
+    "visibility",
+})
+_NAMED_COLORS = {
+    "black": (0, 0, 0), "white": (255, 255, 255), "red": (255, 0, 0), "green": (0, 128, 0),
+    "blue": (0, 0, 255), "yellow": (255, 255, 0), "orange": (255, 165, 0),
+    "gray": (128, 128, 128), "grey": (128, 128, 128), "silver": (192, 192, 192),
+}
+_FONTS = {
+    False: ("DejaVuSans.ttf", "Arial.ttf", "LiberationSans-Regular.ttf"),
+    True: ("DejaVuSans-Bold.ttf", "Arial Bold.ttf", "LiberationSans-Bold.ttf"),
+}
+
+
+class RasterError(RuntimeError):
+    pass
+
+
+def require():
+    """Raise RasterError unless numpy and Pillow are importable."""
+    missing = [name for name, mod in (("numpy", np), ("Pillow", Image)) if mod is None]
+    if missing:
+        raise RasterError(f"rasterizing needs {' and '.join(missing)}: pip install numpy pillow")
+
+
+def renderer_key():
+    """Hash of the renderer's own source plus library versions, for render caches."""
+    h = hashlib.sha256()
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in ("raster.py", "pathdata.py", "svgtree.py"):
+        with open(os.path.join(here, name), "rb") as f:
+            h.update(f.read())
+    h.update(f"numpy {np.__version__ if np else '-'} pillow "
+             f"{getattr(Image, '__version__', '-')} ss{SUPERSAMPLE}".encode())
+    return h.hexdigest()[:16]
+
+
+def viewbox(root):
+    """(min_x, min_y, width, height) of a root <svg>."""
+    vb = [float(n) for n in _NUM.findall(str(root.attrs.get("viewBox", "")))]
+    if len(vb) == 4 and vb[2] > 0 and vb[3] > 0:
+        return tuple(vb)
+    return (0.0, 0.0, _float(root.attrs.get("width"), 300.0), _float(root.attrs.get("height"), 150.0))
+
+
+def output_size(root, target_px):
+    """Pixel size with the larger viewBox side mapped to target_px (as the audit measures)."""
+    _, _, vw, vh = viewbox(root)
+    s = target_px / max(vw, vh)
+    return max(1, round(vw * s)), max(1, round(vh * s))
+
+
+def render(root, width, height, background=None):
+    """Rasterize a root <svg> Element to an (height, width, 4) uint8 RGBA array.
+
+    The viewBox is fitted into the canvas (xMidYMid meet). background is an
+    optional (r, g, b) painted under the image.
+    """
+    require()
+    min_x, min_y, vw, vh = viewbox(root)
+    s = min(width / vw, height / vh)
+    tx = (width - vw * s) / 2 - min_x * s
+    ty = (height - vh * s) / 2 - min_y * s
+    r = _Renderer(root, width, height)
+    canvas = r.new_layer()
+    if background is not None:
+        canvas[...] = (*(c / 255 for c in background), 1.0)
+    r.children(root, (s, 0.0, 0.0, s, tx, ty), {}, canvas, None)
+    return to_rgba8(canvas)
+
+
+def to_rgba8(canvas):
+    """Premultiplied float canvas → straight-alpha uint8 RGBA."""
+    alpha = canvas[..., 3:4]
+    rgb = np.divide(canvas[..., :3], alpha, out=np.zeros_like(canvas[..., :3]), where=alpha > 0)
+    out = np.concatenate([rgb, alpha], axis=2)
+    return np.clip(np.rint(out * 255), 0, 255).astype(np.uint8)
+
+
+def to_image(rgba):
+    return Image.fromarray(rgba, "RGBA")
+
+
+# ── Renderer ────────────────────────────────────────────────────────
+
+class _Renderer:
+    def __init__(self, root, width, height):
+        self.width = width
+        self.height = height
+        self.ids = {e.attrs["id"]: e for e in root.iter() if "id" in e.attrs}
+
+    def new_layer(self):
+        return np.zeros((self.height, self.width, 4), dtype=np.float32)
+
+    def children(self, node, ctm, inherited, canvas, clip):
+        for child in node.children:
+            self.node(child, ctm, inherited, canvas, clip)
+
+    def node(self, node, ctm, inherited, canvas, clip):
+        if isinstance(node, Fragment):
+            for child in node.children:
+                self.node(child, ctm, inherited, canvas, clip)
+            return
+        if not isinstance(node, Element) or node.tag in NOT_RENDERED:
+            return
+        a = node.attrs
+        if a.get("display") == "none":
+            return
+        if "transform" in a:
+            ctm = multiply(ctm, parse_transform(a["transform"]))
+        attrs = {**inherited, **{k: v for k, v in a.items() if k in _INHERITED}}
+        if "clip-path" in a:
+            clip = self.clip_mask(a["clip-path"], ctm, clip)
+        opacity = _float(a.get("opacity"), 1.0)
+        if opacity <= 0:
+            return
+        layered = opacity < 1 and (node.tag in ("g", "svg", "a") or (
+            _paint(attrs.get("fill", "#000")) and _paint(attrs.get("stroke"))))
+        target = self.new_layer() if layered else canvas
+        alpha = 1.0 if layered else opacity
+
+        if node.tag in ("g", "svg", "a"):
+            self.children(node, ctm, attrs, target, clip)
+        elif node.tag == "text":
+            self.text(node, ctm, attrs, target, clip, alpha)
+        else:
+            self.shape(node, ctm, attrs, target, clip, alpha)
+        if layered:
+            canvas *= 1 - target[..., 3:4] * opacity
+            canvas += target * opacity
+
+    # ── Shapes ──────────────────────────────────────────────────────
+
+    def shape(self, node, ctm, attrs, canvas, clip, alpha):
+        if attrs.get("visibility") == "hidden":
+            return
+        tol = TOLERANCE / max(scale_factor(ctm), 1e-9)
+        try:
+            polylines = shape_polylines(node, tol)
+        except PathError:
+            return
+        if not polylines:
+            return
+        fill = _color(attrs.get("fill", "#000000"))
+        if fill is not None and node.tag != "line":
+            a = alpha * _float(attrs.get("fill-opacity"), 1.0)
+            polys = [_transform(pts, ctm) for pts, _ in polylines if len(pts) > 2]
+            self.paint(polys, attrs.get("fill-rule") == "evenodd", fill, a, canvas, clip)
+        stroke = _color(attrs.get("stroke", "none"))
+        width = _float(attrs.get("stroke-width"), 1.0)
+        if stroke is not None and width > 0:
+            a = alpha * _float(attrs.get("stroke-opacity"), 1.0)
+            polys = []
+            for pts, closed in _dashed(polylines, attrs):
+                for poly in stroke_polygons(pts, closed, width / 2, attrs.get("stroke-linecap", "butt"),
+                                            attrs.get("stroke-linejoin", "miter"),
+                                            _float(attrs.get("stroke-miterlimit"), 4.0), tol):
+                    polys.append(_transform(poly, ctm))
+            self.paint(polys, False, stroke, a, canvas, clip)
+        if "marker-end" in node.attrs:
+            self.marker_end(node, ctm, width, canvas, clip, alpha)
+
+    def paint(self, polys, evenodd, color, alpha, canvas, clip):
+        cov = coverage(polys, evenodd, self.width, self.height)
+        if cov is None:
+            return
+        y0, x0, c = cov
+        h, w = c.shape
+        a = c * alpha
+        if clip is not None:
+            a = a * clip[y0:y0 + h, x0:x0 + w]
+        region = canvas[y0:y0 + h, x0:x0 + w]
+        region *= (1 - a)[..., None]
+        region += a[..., None] * np.array([color[0] / 255, color[1] / 255, color[2] / 255, 1.0],
+                                          dtype=np.float32)
+
+    def marker_end(self, node, ctm, stroke_width, canvas, clip, alpha):
+        m = _URL.fullmatch(node.attrs["marker-end"].strip())
+        marker = self.ids.get(m.group(1)) if m else None
+        if marker is None or marker.tag != "marker":
+            return
+        if node.tag == "line":
+            x1, y1, x2, y2 = (_float(node.attrs.get(k), 0.0) for k in ("x1", "y1", "x2", "y2"))
+            tangent = ((x2, y2), (x2 - x1, y2 - y1)) if (x1, y1) != (x2, y2) else None
+        elif node.tag == "path":
+            tangent = end_tangent(parse_path(node.attrs.get("d")))
+        else:
+            tangent = None
+        if tangent is None:
+            return
+        (ex, ey), (dx, dy) = tangent
+        ma = marker.attrs
+        orient = ma.get("orient", "0")
+        angle = math.atan2(dy, dx) if orient.startswith("auto") else math.radians(_float(orient, 0.0))
+        sx = sy = 1.0 if ma.get("markerUnits") == "userSpaceOnUse" else stroke_width
+        vb = [float(n) for n in _NUM.findall(str(ma.get("viewBox", "")))]
+        mw, mh = _float(ma.get("markerWidth"), 3.0), _float(ma.get("markerHeight"), 3.0)
+        if len(vb) == 4 and vb[2] > 0 and vb[3] > 0:
+            sx, sy = sx * mw / vb[2], sy * mh / vb[3]
+        cos, sin = math.cos(angle), math.sin(angle)
+        place = multiply(multiply((1, 0, 0, 1, ex, ey), (cos, sin, -sin, cos, 0, 0)),
+                         (sx, 0, 0, sy, -_float(ma.get("refX"), 0.0) * sx,
+                          -_float(ma.get("refY"), 0.0) * sy))
+        mctm = multiply(ctm, place)
+        layer = self.new_layer() if alpha < 1 else canvas
+        for child in marker.children:
+            self.node(child, mctm, {}, layer, clip)
+        if alpha < 1:
+            canvas *= 1 - layer[..., 3:4] * alpha
+            canvas += layer * alpha
+
+    def clip_mask(self, ref, ctm, clip):
+        m = _URL.fullmatch(ref.strip())
+        target = self.ids.get(m.group(1)) if m else None
+        if target is None or target.tag != "clipPath":
+            return clip
+        mask = np.zeros((self.height, self.width), dtype=np.float32)
+        for child in target.iter():
+            if child is target or child.tag in ("g", "text"):
+                continue
+            cctm = ctm
+            if "transform" in child.attrs:
+                cctm = multiply(ctm, parse_transform(child.attrs["transform"]))
+            tol = TOLERANCE / max(scale_factor(cctm), 1e-9)
+            polys = [_transform(pts, cctm) for pts, _ in shape_polylines(child, tol) if len(pts) > 2]
+            cov = coverage(polys, child.attrs.get("clip-rule") == "evenodd",
+                           self.width, self.height)
+            if cov is not None:
+                y0, x0, c = cov
+                region = mask[y0:y0 + c.shape[0], x0:x0 + c.shape[1]]
+                np.maximum(region, c, out=region)
+        return mask if clip is None else mask * clip
+
+    # ── Text ────────────────────────────────────────────────────────
+
+    def text(self, node, ctm, attrs, canvas, clip, alpha):
+        fill = _color(attrs.get("fill", "#000000"))
+        content = node.text or "".join(c.text or "" for c in node.iter() if c is not node)
+        if fill is None or not content.strip():
+            return
+        scale = scale_factor(ctm)
+        size = _float(attrs.get("font-size"), 16.0) * scale
+        if size < 0.5:
+            return
+        bold = attrs.get("font-weight", "normal") in ("bold", "bolder") or _float(
+            attrs.get("font-weight"), 400) >= 600
+        font = _font(bold, size)
+        x, y = _float(node.attrs.get("x"), 0.0), _float(node.attrs.get("y"), 0.0)
+        a, b, c, d, e, f = ctm
+        px, py = a * x + c * y + e, b * x + d * y + f
+        anchor = {"middle": "ms", "end": "rs"}.get(attrs.get("text-anchor"), "ls")
+        mask = Image.new("L", (self.width, self.height), 0)
+        ImageDraw.Draw(mask).text((px, py), content.strip(), fill=255, font=font, anchor=anchor)
+        angle = math.degrees(math.atan2(b, a))
+        if abs(angle) > 0.01:
+            mask = mask.rotate(-angle, resample=Image.BICUBIC, center=(px, py))
+        cov = np.asarray(mask, dtype=np.float32) / 255 * alpha * _float(
+            attrs.get("fill-opacity"), 1.0)
+        if clip is not None:
+            cov *= clip
+        canvas *= (1 - cov)[..., None]
+        canvas += cov[..., None] * np.array([fill[0] / 255, fill[1] / 255, fill[2] / 255, 1.0],
+                                            dtype=np.float32)
+
+
+_font_cache = {}
+
+
+def _font(bold, size):
+    """Font at size quantized to 1/4 px; built at the quantized size, so a
+    render never depends on which caller filled the cache first."""
+    key = (bold, round(size * 4))
+    if key not in _font_cache:
+        size = key[1] / 4
+        font = None
+        for name in _FONTS[bold]:
+            try:
+                font = ImageFont.truetype(name, size)
+                break
+            except OSError:
+                continue
+        _font_cache[key] = font or ImageFont.load_default(size)
+    return _font_cache[key]
+
+
+# ── Geometry ────────────────────────────────────────────────────────
+
+def shape_polylines(elem, tol):
+    """Element → list of (points, closed) in its own coordinates."""
+    a = elem.attrs
+    tag = elem.tag
+
+    def g(name):
+        return _float(a.get(name), 0.0)
+
+    if tag == "path":
+        return flatten(parse_path(str(a.get("d", ""))), tol)
+    if tag == "rect":
+        x, y, w, h = g("x"), g("y"), g("width"), g("height")
+        if w <= 0 or h <= 0:
+            return []
+        rx = _float(a.get("rx", a.get("ry")), 0.0)
+        ry = _float(a.get("ry", a.get("rx")), 0.0)
+        rx, ry = min(rx, w / 2), min(ry, h / 2)
+        if rx <= 0 or ry <= 0:
+            return [([(x, y), (x + w, y), (x + w, y + h), (x, y + h)], True)]
+        pts = []
+        for cx, cy, start in ((x + w - rx, y + ry, -90), (x + w - rx, y + h - ry, 0),
+                              (x + rx, y + h - ry, 90), (x + rx, y + ry, 180)):
+            pts.extend(_ellipse_arc(cx, cy, rx, ry, start, 90, tol))
+        return [(pts, True)]
+    if tag in ("circle", "ellipse"):
+        if tag == "circle":
+            rx = ry = g("r")
+        else:
+            rx, ry = g("rx"), g("ry")
+        if rx <= 0 or ry <= 0:
+            return []
+        return [(_ellipse_arc(g("cx"), g("cy"), rx, ry, 0, 360, tol)[:-1], True)]
+    if tag == "line":
+        return [([(g("x1"), g("y1")), (g("x2"), g("y2"))], False)]
+    if tag in ("polygon", "polyline"):
+        nums = [float(n) for n in _NUM.findall(str(a.get("points", "")))]
+        pts = list(zip(nums[0::2], nums[1::2]))
+        return [(pts, tag == "polygon")] if len(pts) > 1 else []
+    return []
+
+
+def _ellipse_arc(cx, cy, rx, ry, start_deg, sweep_deg, tol):
+    r = max(rx, ry)
+    step = 2 * math.acos(max(-1.0, 1 - tol / r)) if tol < r else math.pi / 2
+    n = max(2, math.ceil(math.radians(abs(sweep_deg)) / step))
+    out = []
+    for i in range(n + 1):
+        t = math.radians(start_deg + sweep_deg * i / n)
+        out.append((cx + rx * math.cos(t), cy + ry * math.sin(t)))
+    return out
+
+
+def _transform(pts, m):
+    p = np.asarray(pts, dtype=np.float64)
+    a, b, c, d, e, f = m
+    return np.stack([a * p[:, 0] + c * p[:, 1] + e, b * p[:, 0] + d * p[:, 1] + f], axis=1)
+
+
+def coverage(polys, evenodd, width, height, ss=SUPERSAMPLE):
+    """Anti-aliased coverage of closed polygons (device px) as (y0, x0, array) or None."""
+    polys = [p for p in polys if len(p) > 2]
+    if not polys:
+        return None
+    pts = np.concatenate(polys)
+    x0 = max(0, math.floor(pts[:, 0].min()))
+    x1 = min(width, math.ceil(pts[:, 0].max()))
+    y0 = max(0, math.floor(pts[:, 1].min()))
+    y1 = min(height, math.ceil(pts[:, 1].max()))
+    if x1 <= x0 or y1 <= y0:
+        return None
+    starts = pts
+    ends = np.concatenate([np.roll(p, -1, axis=0) for p in polys])
+    ex0, ey0, ex1, ey1 = starts[:, 0], starts[:, 1], ends[:, 0], ends[:, 1]
+    keep = ey0 != ey1
+    ex0, ey0, ex1, ey1 = ex0[keep], ey0[keep], ex1[keep], ey1[keep]
+    winding = np.where(ey1 > ey0, 1, -1)
+    nrows, ncols = (y1 - y0) * ss, (x1 - x0) * ss
+    # Sample rows an edge crosses: centers y = y0 + (r + .5)/ss with ymin <= y < ymax.
+    lo = np.clip(np.ceil((np.minimum(ey0, ey1) - y0) * ss - 0.5), 0, nrows).astype(np.int64)
+    hi = np.clip(np.ceil((np.maximum(ey0, ey1) - y0) * ss - 0.5), 0, nrows).astype(np.int64)
+    counts = hi - lo
+    total = int(counts.sum())
+    if total == 0:
+        return None
+    idx = np.repeat(np.arange(len(counts)), counts)
+    offsets = np.cumsum(counts) - counts
+    rows = lo[idx] + (np.arange(total) - offsets[idx])
+    ys = y0 + (rows + 0.5) / ss
+    xs = ex0[idx] + (ys - ey0[idx]) * (ex1[idx] - ex0[idx]) / (ey1[idx] - ey0[idx])
+    # A crossing at x toggles every sample whose center lies at or right of x.
+    cols = np.clip(np.ceil((xs - x0) * ss - 0.5), 0, ncols).astype(np.int64)
+    delta = np.bincount(rows * (ncols + 1) + cols, weights=winding[idx],
+                        minlength=nrows * (ncols + 1)).reshape(nrows, ncols + 1)
+    wind = np.cumsum(delta[:, :ncols], axis=1)
+    inside = (wind.astype(np.int64) & 1) if evenodd else (wind != 0)
+    cov = inside.reshape(y1 - y0, ss, x1 - x0, ss).mean(axis=(1, 3), dtype=np.float32)
+    return y0, x0, cov
+
+
+def stroke_polygons(pts, closed, hw, cap, join, miter_limit, tol):
+    """Outline polygons whose nonzero union is the stroke of a polyline."""
+    pts = [p for i, p in enumerate(pts) if i == 0 or p != pts[i - 1]]
+    if closed and len(pts) > 1 and pts[0] == pts[-1]:
+        pts.pop()
+    if len(pts) == 1:
+        x, y = pts[0]
+        if cap == "round":
+            return [_ellipse_arc(x, y, hw, hw, 0, 360, tol)[:-1]]
+        if cap == "square":
+            return [[(x - hw, y - hw), (x + hw, y - hw), (x + hw, y + hw), (x - hw, y + hw)]]
+        return []
+    if not pts:
+        return []
+    if not closed and cap == "square":
+        pts = _extend_ends(pts, hw)
+    segs = list(zip(pts, pts[1:] + pts[:1])) if closed else list(zip(pts, pts[1:]))
+    polys = []
+    dirs = []
+    for (ax, ay), (bx, by) in segs:
+        length = math.hypot(bx - ax, by - ay)
+        ux, uy = (bx - ax) / length, (by - ay) / length
+        nx, ny = -uy * hw, ux * hw
+        polys.append([(ax + nx, ay + ny), (bx + nx, by + ny), (bx - nx, by - ny), (ax - nx, ay - ny)])
+        dirs.append((ux, uy))
+    joints = range(len(segs)) if closed else range(1, len(segs))
+    for i in joints:
+        v = segs[i][0]
+        d0, d1 = dirs[i - 1], dirs[i]
+        polys.extend(_join(v, d0, d1, hw, join, miter_limit, tol))
+    if not closed and cap == "round":
+        for x, y in (pts[0], pts[-1]):
+            polys.append(_ellipse_arc(x, y, hw, hw, 0, 360, tol)[:-1])
+    return [_positive(p) for p in polys]
+
+
+def _join(v, d0, d1, hw, join, miter_limit, tol):
+    cross = d0[0] * d1[1] - d0[1] * d1[0]
+    if abs(cross) < 1e-12 and d0[0] * d1[0] + d0[1] * d1[1] > 0:
+        return []  # straight continuation
+    if join == "round":
+        return [_ellipse_arc(v[0], v[1], hw, hw, 0, 360, tol)[:-1]]
+    side = -1 if cross > 0 else 1
+    n0 = (-d0[1] * hw * side, d0[0] * hw * side)
+    n1 = (-d1[1] * hw * side, d1[0] * hw * side)
+    p0 = (v[0] + n0[0], v[1] + n0[1])
+    p1 = (v[0] + n1[0], v[1] + n1[1])
+    if join == "miter" or join == "miter-clip" or join == "arcs":
+        sx, sy = n0[0] + n1[0], n0[1] + n1[1]
+        norm2 = sx * sx + sy * sy
+        if norm2 > 1e-12:
+            ratio = 2 * hw / math.sqrt(norm2)
+            if ratio <= miter_limit:
+                k = 2 * hw * hw / norm2
+                return [[v, p0, (v[0] + sx * k, v[1] + sy * k), p1]]
+    return [[v, p0, p1]]
+
+
+def _extend_ends(pts, hw):
+    (ax, ay), (bx, by) = pts[0], pts[1]
+    la = math.hypot(bx - ax, by - ay)
+    first = (ax - (bx - ax) / la * hw, ay - (by - ay) / la * hw)
+    (cx, cy), (dx, dy) = pts[-2], pts[-1]
+    lb = math.hypot(dx - cx, dy - cy)
+    last = (dx + (dx - cx) / lb * hw, dy + (dy - cy) / lb * hw)
+    return [first] + pts[1:-1] + [last]
+
+
+def _positive(poly):
+    area = 0.0
+    for (x0, y0), (x1, y1) in zip(poly, poly[1:] + poly[:1]):
+        area += x0 * y1 - x1 * y0
+    return poly if area >= 0 else poly[::-1]
+
+
+def _dashed(polylines, attrs):
+    dash = [float(n) for n in _NUM.findall(str(attrs.get("stroke-dasharray", "none")))]
+    if not dash or sum(dash) <= 0 or any(d < 0 for d in dash):
+        return polylines
+    if len(dash) % 2:
+        dash *= 2
+    out = []
+    for pts, closed in polylines:
+        if closed:
+            pts = pts + pts[:1]
+        out.extend((piece, False) for piece in dash_polyline(
+            pts, dash, _float(attrs.get("stroke-dashoffset"), 0.0)))
+    return out
+
+
+def dash_polyline(pts, dash, offset=0.0):
+    """Split a polyline into dash pieces along its length."""
+    period = sum(dash)
+    pos = offset % period
+    i = 0
+    while pos >= dash[i]:
+        pos -= dash[i]
+        i = (i + 1) % len(dash)
+    remaining = dash[i] - pos
+    on = i % 2 == 0
+    pieces, current = [], [pts[0]] if on else []
+    for (ax, ay), (bx, by) in zip(pts, pts[1:]):
+        length = math.hypot(bx - ax, by - ay)
+        t = 0.0
+        while length - t > remaining:
+            t += remaining
+            p = (ax + (bx - ax) * t / length, ay + (by - ay) * t / length)
+            if on:
+                current.append(p)
+                pieces.append(current)
+                current = []
+            else:
+                current = [p]
+            on = not on
+            i = (i + 1) % len(dash)
+            remaining = dash[i]
+        remaining -= length - t
+        if on:
+            current.append((bx, by))
+    if on and len(current) > 1:
+        pieces.append(current)
+    return [p for p in pieces if len(p) > 1]
+
+
+# ── Attribute helpers ───────────────────────────────────────────────
+
+def _float(value, default):
+    if value is None:
+        return default
+    m = _NUM.match(str(value).strip())
+    return float(m.group()) if m else default
+
+
+def _paint(value):
+    return value is not None and _color(value) is not None
+
+
+def _color(value):
+    """SVG paint → (r, g, b) or None for none/unsupported paint servers."""
+    if value is None:
+        return None
+    v = str(value).strip()
+    if v.startswith("#"):
+        h = v[1:]
+        if len(h) == 3:
+            h = "".join(c * 2 for c in h)
+        if len(h) == 6:
+            try:
+                return tuple(int(h[i:i + 2], 16) for i in (0, 2, 4))
+            except ValueError:
+                return None
+        return None
+    if v.startswith("rgb("):
+        nums = _NUM.findall(v)
+        if len(nums) == 3:
+            scale = 2.55 if "%" in v else 1.0
+            return tuple(max(0, min(255, round(float(n) * scale))) for n in nums)
+        return None
+    if v == "currentColor":
+        return (0, 0, 0)
+    return _NAMED_COLORS.get(v.lower())
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""Pre-render SVG assets to PNG/WebP for every Android density bucket.
+
+Each SVG is rendered at the audit's 48dp and 96dp targets
+(TARGET_DP_MINIMUM / TARGET_DP_PRIMARY in scripts/audit_image_quality.py) for
+mdpi … xxxhdpi, into Android resource folders:
+
+    <output>/drawable-xxhdpi/intersection_4way_stop_96dp.webp
+
+Renders are cached by SVG content hash + size + format + renderer version
+(raster.renderer_key()), so re-runs only render new or edited SVGs, and an
+output file is only rewritten when its bytes change. Work is spread over a
+process pool; everything runs locally (raster.py, numpy, Pillow).
+"""
+
+import argparse
+import glob
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Allow running from any directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components import raster, svgtree
+from components.manifest import content_hash, write_atomic
+from components.vector_drawable import resource_name
+
+COMPONENTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSETS_DIR = os.path.dirname(COMPONENTS_DIR)
+sys.path.insert(0, os.path.join(os.path.dirname(ASSETS_DIR), "scripts"))
+
+from audit_image_quality import TARGET_DP_MINIMUM, TARGET_DP_PRIMARY  # noqa: E402
+
+INPUT_DIR = os.path.join(ASSETS_DIR, "svg")
+OUTPUT_DIR = os.path.join(ASSETS_DIR, "raster")
+CACHE_DIR = os.path.join(ASSETS_DIR, ".raster-cache")
+INDEX_NAME = "raster-index.json"
+
+# Android density buckets → scale from dp to px.
+DENSITIES = {"mdpi": 1.0, "hdpi": 1.5, "xhdpi": 2.0, "xxhdpi": 3.0, "xxxhdpi": 4.0}
+TARGET_DPS = (TARGET_DP_MINIMUM, TARGET_DP_PRIMARY)
+
+# Pillow save() options per format; part of the cache key.
+ENCODERS = {
+    "png": ("PNG", {"optimize": True}),
+    "webp": ("WEBP", {"lossless": True, "quality": 100, "method": 4}),
+}
+
+
+def variant_path(svg_path, dp, density, fmt):
+    """Output path of one variant, relative to the output directory."""
+    return os.path.join(f"drawable-{density}", f"{resource_name(svg_path)}_{dp}dp.{fmt}")
+
+
+def render_svg(job):
+    """Render (or fetch from cache) every variant of one SVG. Runs in worker processes.
+
+    job is (svg_path, output_dir, dps, densities, formats, cache_dir, renderer);
+    returns {"svg", "sha256", "variants": [...], "render_ms"}.
+    """
+    svg_path, output_dir, dps, densities, formats, cache_dir, renderer = job
+    with open(svg_path, "rb") as f:
+        data = f.read()
+    svg_sha = content_hash(data)
+    root = None
+    render_ms = 0.0
+    variants = []
+    for dp in dps:
+        for density in densities:
+            target = round(dp * DENSITIES[density])
+            rgba = None
+            for fmt in formats:
+                key = hashlib.sha256(
+                    f"{svg_sha}:{renderer}:{target}:{fmt}:{ENCODERS[fmt]}".encode()).hexdigest()
+                cached = _cache_get(cache_dir, key, fmt)
+                encoded = cached
+                if encoded is None:
+                    if rgba is None:
+                        if root is None:
+                            root = svgtree.parse(io.BytesIO(data))
+                        start = time.perf_counter()
+                        width, height = raster.output_size(root, target)
+                        rgba = raster.render(root, width, height)
+                        render_ms += (time.perf_counter() - start) * 1000
+                    encoded = _encode(rgba, fmt)
+                    _cache_put(cache_dir, key, fmt, encoded)
+                rel = variant_path(svg_path, dp, density, fmt)
+                out = os.path.join(output_dir, rel)
+                sha = content_hash(encoded)
+                written = not _same_bytes(out, sha)
+                if written:
+                    os.makedirs(os.path.dirname(out), exist_ok=True)
+                    write_atomic(out, encoded)
+                variants.append({"path": rel, "dp": dp, "density": density, "format": fmt,
+                                 "px": target, "bytes": len(encoded), "sha256": sha,
+                                 "cached": cached is not None, "written": written})
+    return {"svg": os.path.basename(svg_path), "sha256": svg_sha, "variants": variants,
+            "render_ms": render_ms}
+
+
+def _encode(rgba, fmt):
+    name, options = ENCODERS[fmt]
+    buf = io.BytesIO()
+    raster.to_image(rgba).save(buf, name, **options)
+    return buf.getvalue()
+
+
+def _cache_path(cache_dir, key, fmt):
+    return os.path.join(cache_dir, key[:2], f"{key}.{fmt}")
+
+
+def _cache_get(cache_dir, key, fmt):
+    if not cache_dir:
+        return None
+    try:
+        with open(_cache_path(cache_dir, key, fmt), "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _cache_put(cache_dir, key, fmt, data):
+    if not cache_dir:
+        return
+    path = _cache_path(cache_dir, key, fmt)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_atomic(path, data)
+
+
+def _same_bytes(path, sha):
+    try:
+        with open(path, "rb") as f:
+            return content_hash(f.read()) == sha
+    except OSError:
+        return False
+
+
+def rasterize(svg_paths, output_dir=OUTPUT_DIR, dps=TARGET_DPS, densities=tuple(DENSITIES),
+              formats=("webp",), cache_dir=CACHE_DIR, jobs=0):
+    """Render every SVG × dp × density × format. Returns the per-SVG result list."""
+    raster.require()
+    renderer = raster.renderer_key()
+    todo = [(p, output_dir, tuple(dps), tuple(densities), tuple(formats), cache_dir, renderer)
+            for p in svg_paths]
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1 or len(todo) <= 1:
+        return [render_svg(job) for job in todo]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(todo))) as pool:
+        return list(pool.map(render_svg, todo, chunksize=4))
+
+
+def write_index(results, output_dir):
+    """Record every variant (path, size, hash) in <output>/raster-index.json."""
+    index = {r["svg"]: {"sha256": r["sha256"],
+                        "variants": [{k: v for k, v in var.items() if k not in ("cached", "written")}
+                                     for var in r["variants"]]}
+             for r in results}
+    os.makedirs(output_dir, exist_ok=True)
+    data = (json.dumps(index, indent=2, sort_keys=True) + "\n").encode()
+    path = os.path.join(output_dir, INDEX_NAME)
+    if not _same_bytes(path, content_hash(data)):
+        write_atomic(path, data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("svgs", nargs="*",
+                        help="SVG files to render (default: every SVG in assets/svg)")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR,
+                        help="root of the drawable-* folders (default: assets/raster)")
+    parser.add_argument("--format", choices=("webp", "png", "both"), default="webp",
+                        help="output format (default: lossless webp)")
+    parser.add_argument("--dp", type=int, nargs="+", default=list(TARGET_DPS),
+                        help=f"target sizes in dp (default: {TARGET_DP_MINIMUM} {TARGET_DP_PRIMARY})")
+    parser.add_argument("--density", nargs="+", choices=tuple(DENSITIES), default=list(DENSITIES),
+                        help="density buckets (default: all)")
+    parser.add_argument("--jobs", "-j", type=int, default=0, metavar="N",
+                        help="worker processes (default 0 = one per CPU)")
+    parser.add_argument("--cache-dir", default=CACHE_DIR,
+                        help="render cache directory (default: assets/.raster-cache)")
+    parser.add_argument("--no-cache", action="store_true", help="render everything from scratch")
+    args = parser.parse_args(argv)
+
+    svgs = args.svgs or sorted(glob.glob(os.path.join(INPUT_DIR, "*.svg")))
+    formats = ("webp", "png") if args.format == "both" else (args.format,)
+    try:
+        raster.require()
+    except raster.RasterError as exc:
+        parser.error(str(exc))
+
+    start = time.perf_counter()
+    results = rasterize(svgs, args.output_dir, args.dp, args.density, formats,
+                        None if args.no_cache else args.cache_dir, args.jobs)
+    wall_ms = (time.perf_counter() - start) * 1000
+    write_index(results, args.output_dir)
+
+    total = written = cached = size = 0
+    render_ms = 0.0
+    for r in results:
+        render_ms += r["render_ms"]
+        n_written = sum(v["written"] for v in r["variants"])
+        if n_written:
+            print(f"  {r['svg']}: {n_written} files written ({r['render_ms']:.0f} ms render)")
+        total += len(r["variants"])
+        written += n_written
+        cached += sum(v["cached"] for v in r["variants"])
+        size += sum(v["bytes"] for v in r["variants"])
+    print(f"\nRasterized {len(results)} SVGs → {total} files ({written} written, {cached} from cache, "
+          f"{size / 1024:.0f} KiB) in {wall_ms:.0f} ms wall, {render_ms:.0f} ms render")
+    print(f"Output: {os.path.abspath(args.output_dir)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+"""Randomized practice scenes from a seeded spec, streamed to a directory or archive.
+
+Scenes are sampled from primitives.py: a road layout, a control (stop signs
+and stop lines, yield triangles, or none), vehicles on distinct approaches
+with a trajectory arrow each, and for straight-road scenes cones, hydrants,
+school buses and emergency vehicles. Scene i is drawn from its own
+Random(f"{seed}:{i}"), so it is the same whether 100 or 100,000 scenes are
+made. Every scene is checked with geometry.validate() and resampled on
+errors (overlapping vehicles, arrows through vehicles, ...).
+
+The pipeline is lazy end to end — generate() → render() → write() — and
+each scene is written and dropped before the next one is built, so memory
+stays flat at any count. The index (index.jsonl: one line of metadata per
+scene) is spooled to a temp file and streamed into the output last.
+
+    cd assets/components
+    python3 scenario_gen.py -n 1000 -o /tmp/scenes.zip --seed 7
+    python3 scenario_gen.py --spec my_spec.json -o /tmp/scenes        # directory
+    python3 scenario_gen.py -n 100000 -o /tmp/scenes.tar.gz
+
+Spec keys (JSON; anything omitted falls back to DEFAULT_SPEC):
+
+    seed, count, prefix      reproducibility and file names (PREFIX_000042.svg)
+    layouts                  {"cross": 2, "tee": 1, "straight": 1} sampling weights
+    controls                 subset of "stop", "yield", "none"
+    devices                  subset of "stop_sign", "yield_tri", "cone", "hydrant"
+    vehicles                 [min, max] vehicles per scene
+    maneuvers                subset of "straight", "left", "right"
+    special                  chance of an emergency vehicle / school bus
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import tarfile
+import tempfile
+import time
+import zipfile
+
+# Allow running from any directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components import geometry, svgtree
+from components.manifest import content_hash
+from components.primitives import (arrow_defs, cone, compact, emergency, grass_bg, hydrant,
+                                   road_h, road_v, school_bus, sedan, stop_line, stop_sign,
+                                   traj_arrow, traj_curve, yellow_dashed, yellow_solid,
+                                   yield_tri)
+from components.style_tokens import (BUS_H, BUS_W, COMPACT_H, COMPACT_W, COLOR_VEHICLE_DANGER,
+                                     COLOR_VEHICLE_EGO, COLOR_VEHICLE_OTHER, EMERGENCY_H,
+                                     EMERGENCY_W, SEDAN_H, SEDAN_W)
+from components.svgtree import Element, Fragment
+
+DEFAULT_SPEC = {
+    "seed": 0,
+    "count": 100,
+    "prefix": "SCENARIO",
+    "layouts": {"cross": 2, "tee": 1, "straight": 1},
+    "controls": ["stop", "yield", "none"],
+    "devices": ["stop_sign", "yield_tri", "cone", "hydrant"],
+    "vehicles": [1, 3],
+    "maneuvers": ["straight", "left", "right"],
+    "special": 0.25,
+}
+INDEX_NAME = "index.jsonl"
+MAX_ATTEMPTS = 25           # resamples per scene before it is skipped
+PLACE_ATTEMPTS = 10         # x draws per straight-road vehicle before it is left out
+# Room a straight-road vehicle keeps clear in front of it: its arrow (2 + up
+# to 25) or a bus stop arm (20), plus a margin before the vehicle ahead. Its
+# span also takes 2 behind it, for bumpers and outlines past the body.
+LANE_AHEAD = 2 + 25 + 6
+
+# Headings in clockwise order; a right turn is the next one.
+HEADINGS = "ESWN"
+# Which sides of the 200x200 intersection have a road leaving it.
+EXITS = {"cross": "ESWN", "tee": "ESW"}
+CATEGORIES = ("RIGHT_OF_WAY", "SPECIAL_SITUATIONS")
+
+
+def load_spec(source=None, **overrides):
+    """DEFAULT_SPEC updated from a JSON file path or dict, then from overrides.
+
+    Raises ValueError for unknown keys or values.
+    """
+    spec = json.loads(json.dumps(DEFAULT_SPEC))
+    if isinstance(source, str):
+        with open(source) as f:
+            source = json.load(f)
+    for key, value in {**(source or {}), **overrides}.items():
+        if key not in DEFAULT_SPEC:
+            raise ValueError(f"unknown spec key {key!r}")
+        if value is not None:
+            spec[key] = value
+    if isinstance(spec["layouts"], list):
+        spec["layouts"] = {name: 1 for name in spec["layouts"]}
+    for key, allowed in (("layouts", ("cross", "tee", "straight")),
+                         ("controls", ("stop", "yield", "none")),
+                         ("devices", ("stop_sign", "yield_tri", "cone", "hydrant")),
+                         ("maneuvers", ("straight", "left", "right"))):
+        bad = sorted(set(spec[key]) - set(allowed))
+        if bad or not spec[key]:
+            raise ValueError(f"spec {key} must be a non-empty subset of {', '.join(allowed)}")
+    lo, hi = spec["vehicles"]
+    if not 1 <= lo <= hi:
+        raise ValueError("spec vehicles must be [min, max] with 1 <= min <= max")
+    return spec
+
+
+# ── Geometry helpers (200x200 intersections are drawn for the E approach) ──
+
+def _turn(x, y, k):
+    """Rotate (x, y) by k clockwise quarter turns about the center (100, 100)."""
+    for _ in range(k % 4):
+        x, y = 200 - y, x
+    return x, y
+
+
+def _turn_rect(x, y, w, h, k):
+    (x0, y0), (x1, y1) = _turn(x, y, k), _turn(x + w, y + h, k)
+    return min(x0, x1), min(y0, y1)
+
+
+def _heading(base, k):
+    return HEADINGS[(HEADINGS.index(base) + k) % 4]
+
+
+def _r(v):
+    v = round(v, 1)
+    return int(v) if v == int(v) else v
+
+
+# Plain cars: primitive, length, width (heading east).
+_CARS = {
+    "sedan": (sedan, SEDAN_W, SEDAN_H),
+    "compact": (compact, COMPACT_W, COMPACT_H),
+}
+
+
+class Scenario:
+    """One generated scene: file name, root <svg> Element and JSON-able metadata."""
+
+    __slots__ = ("name", "tree", "meta")
+
+    def __init__(self, name, tree, meta):
+        self.name = name
+        self.tree = tree
+        self.meta = meta
+
+
+class _Builder:
+    """Samples one scene from rng; build() returns (tree, meta)."""
+
+    def __init__(self, spec, rng):
+        self.spec = spec
+        self.rng = rng
+        self.parts = []
+        self.meta = {"vehicles": [], "devices": []}
+        self.lanes = {"E": [], "W": []}     # straight road: occupied x-spans per lane
+
+    def build(self):
+        layouts = self.spec["layouts"]
+        layout = self.rng.choices(list(layouts), weights=list(layouts.values()))[0]
+        self.meta["layout"] = layout
+        if layout == "straight":
+            w = self._straight()
+        else:
+            w = self._intersection(layout)
+        special = any(v["type"] in ("emergency", "school_bus") for v in self.meta["vehicles"])
+        hazards = layout == "straight" and self.meta["devices"]
+        self.meta["category"] = CATEGORIES[1] if special or hazards else CATEGORIES[0]
+        root = Element("svg", {"xmlns": "http://www.w3.org/2000/svg",
+                               "viewBox": f"0 0 {w} 200"},
+                       [arrow_defs(), Fragment(*self.parts)])
+        return root, self.meta
+
+    # ── Intersections ───────────────────────────────────────────────
+
+    def _intersection(self, layout):
+        rng = self.rng
+        add = self.parts.append
+        add(grass_bg(200, 200))
+        add(road_h(0, 70, 200, 60))
+        add(road_v(70, 0 if layout == "cross" else 70, 60, 200 if layout == "cross" else 130))
+        # Center lines on every approach leg; the box itself stays clear.
+        for k in range(4):
+            if _heading("W", k) in EXITS[layout]:
+                x, y = _turn_rect(0, 98, 70, 4, k)
+                add(yellow_solid(x, y, *((70, 4) if k % 2 == 0 else (4, 70))))
+
+        controls = [c for c in self.spec["controls"]
+                    if c == "none" or {"stop": "stop_sign", "yield": "yield_tri"}[c]
+                    in self.spec["devices"]]
+        control = rng.choice(controls or ["none"])
+        self.meta["control"] = control
+        # Approaches by arrival heading; a tee's side road comes from the south.
+        approaches = list(EXITS[layout]) if layout == "cross" else ["E", "W", "N"]
+        controlled = approaches if layout == "cross" else ["N"]
+        for heading in approaches:
+            if heading in controlled and control != "none":
+                self._control(control, HEADINGS.index(heading))
+
+        count = rng.randint(*self.spec["vehicles"])
+        for i, heading in enumerate(rng.sample(approaches, min(count, len(approaches)))):
+            self._approach_vehicle(layout, heading, ego=(i == 0))
+        return 200
+
+    def _control(self, control, k):
+        if control == "stop":
+            x, y = _turn_rect(64, 100, 6, 30, k)
+            self.parts.append(stop_line(x, y, *((6, 30) if k % 2 == 0 else (30, 6))))
+            cx, cy = _turn(50, 150, k)
+            self.parts.append(stop_sign(cx - 15, cy - 15))
+            self.meta["devices"].append({"type": "stop_sign", "heading": _heading("E", k)})
+        else:
+            x, y = _turn(66, 115, k)
+            self.parts.append(yield_tri(x, y, orient=_heading("W", k)))
+            self.meta["devices"].append({"type": "yield_tri", "heading": _heading("E", k)})
+
+    def _approach_vehicle(self, layout, heading, ego):
+        rng = self.rng
+        k = HEADINGS.index(heading)
+        special = not ego and rng.random() < self.spec["special"]
+        kind = "emergency" if special else rng.choice(list(_CARS))
+        if special:
+            length, width = EMERGENCY_W, EMERGENCY_H
+        else:
+            _, length, width = _CARS[kind]
+        # Lane center y=115 heading east; stay behind the stop line / yield mark.
+        x = rng.randint(8, max(8, 56 - length))
+        y = 115 - width / 2
+        vx, vy = _turn_rect(x, y, length, width, k)
+        color = COLOR_VEHICLE_EGO if ego else COLOR_VEHICLE_OTHER
+        if special:
+            self.parts.append(emergency(_r(vx), _r(vy), orient=heading))
+        else:
+            fn = _CARS[kind][0]
+            self.parts.append(fn(_r(vx), _r(vy), color=color, orient=heading))
+
+        maneuvers = [m for m in self.spec["maneuvers"]
+                     if self._exit(heading, m) in EXITS[layout]]
+        maneuver = rng.choice(maneuvers) if maneuvers else None
+        front = x + length + 2
+        if maneuver == "straight":
+            end = rng.randint(max(front + 12, 76), 124)
+            (x1, y1), (x2, y2) = _turn(front, 115, k), _turn(end, 115, k)
+            self.parts.append(traj_arrow(_r(x1), _r(y1), _r(x2), _r(y2)))
+        elif maneuver is not None:
+            # Right: into the southbound lane (x=85); left: northbound (x=115).
+            lane, end_y = (85, 128) if maneuver == "right" else (115, 72)
+            (x1, y1), (cx, cy), (x2, y2) = (_turn(front, 115, k), _turn(lane, 115, k),
+                                            _turn(lane, end_y, k))
+            self.parts.append(traj_curve(_r(x1), _r(y1), _r(cx), _r(cy), _r(x2), _r(y2)))
+        self.meta["vehicles"].append({"type": kind, "heading": heading, "ego": ego,
+                                      "maneuver": maneuver})
+
+    @staticmethod
+    def _exit(heading, maneuver):
+        turn = {"straight": 0, "right": 1, "left": 3}[maneuver]
+        return _heading(heading, turn)
+
+    # ── Straight road (300x200) ─────────────────────────────────────
+
+    def _straight(self):
+        rng = self.rng
+        add = self.parts.append
+        add(grass_bg(300, 200))
+        add(road_h(0, 80, 300, 40))
+        add(yellow_dashed(0, 98, 300, orient="H"))
+        self.meta["control"] = "none"
+
+        devices = self.spec["devices"]
+        if "cone" in devices and rng.random() < 0.5:
+            lane_y = rng.choice((82, 102))
+            x0 = rng.randint(20, 200)
+            for i in range(3):
+                add(cone(x0 + i * 22, lane_y))
+            self.meta["devices"].append({"type": "cone", "count": 3,
+                                         "heading": "E" if lane_y > 100 else "W"})
+        if "hydrant" in devices and rng.random() < 0.5:
+            add(hydrant(rng.randint(20, 280), 134))
+            self.meta["devices"].append({"type": "hydrant"})
+
+        count = rng.randint(*self.spec["vehicles"])
+        for i in range(count):
+            self._lane_vehicle(ego=(i == 0))
+        return 300
+
+    def _lane_vehicle(self, ego):
+        rng = self.rng
+        heading = rng.choice("EW")
+        lane_y = 110 if heading == "E" else 90       # right-hand traffic
+        special = not ego and rng.random() < self.spec["special"]
+        if special and rng.random() < 0.5:
+            kind, length = "school_bus", BUS_W
+        elif special:
+            kind, length = "emergency", EMERGENCY_W
+        else:
+            kind = rng.choice(list(_CARS))
+            fn, length, width = _CARS[kind]
+        lanes = heading if kind in _CARS else "EW"    # buses and emergency vehicles reach both lanes
+        x = self._place(heading, lanes, length)
+        if x is None:
+            return                                    # no gap left in the lane
+        if kind == "school_bus":
+            y = lane_y + 10 - BUS_H if heading == "E" else lane_y - 10
+            self.parts.append(school_bus(x, y, orient=heading))
+        elif kind == "emergency":
+            self.parts.append(emergency(x, lane_y - EMERGENCY_H // 2, orient=heading))
+        else:
+            color = COLOR_VEHICLE_EGO if ego else rng.choice(
+                (COLOR_VEHICLE_OTHER, COLOR_VEHICLE_DANGER))
+            self.parts.append(fn(x, lane_y - width // 2, color=color, orient=heading))
+        maneuver = None
+        if kind != "school_bus" and "straight" in self.spec["maneuvers"]:
+            maneuver = "straight"
+            step = rng.randint(12, 25)
+            if heading == "E":
+                x1, x2 = x + length + 2, x + length + 2 + step
+            else:
+                x1, x2 = x - 2, x - 2 - step
+            self.parts.append(traj_arrow(x1, lane_y, x2, lane_y))
+        self.meta["vehicles"].append({"type": kind, "heading": heading, "ego": ego,
+                                      "maneuver": maneuver})
+
+    def _place(self, heading, lanes, length):
+        """x for a vehicle whose span (with LANE_AHEAD in front) is on the road
+        and clear of the others in each of its lanes, recorded as occupied; or None."""
+        lo, hi = 10, 300 - length - 10
+        if heading == "E":
+            hi -= LANE_AHEAD - 10
+        else:
+            lo += LANE_AHEAD - 10
+        for _ in range(PLACE_ATTEMPTS):
+            x = self.rng.randint(lo, hi)
+            span = (x - 2, x + length + LANE_AHEAD) if heading == "E" else (x - LANE_AHEAD, x + length + 2)
+            if all(span[1] <= a or b <= span[0] for lane in lanes for a, b in self.lanes[lane]):
+                for lane in lanes:
+                    self.lanes[lane].append(span)
+                return x
+        return None
+
+
+# ── Pipeline ────────────────────────────────────────────────────────
+
+def generate(spec, start=0, stats=None):
+    """Yield Scenario objects for indexes start … spec["count"]-1, lazily.
+
+    stats (a dict) receives "rejected" (resamples) and "skipped" counts.
+    """
+    stats = stats if stats is not None else {}
+    stats.setdefault("rejected", 0)
+    stats.setdefault("skipped", 0)
+    for i in range(start, spec["count"]):
+        rng = random.Random(f"{spec['seed']}:{i}")
+        for attempt in range(MAX_ATTEMPTS):
+            tree, meta = _Builder(spec, rng).build()
+            errors = [f for f in geometry.validate(tree) if f.severity == "error"]
+            if not errors:
+                break
+            stats["rejected"] += 1
+        else:
+            stats["skipped"] += 1
+            continue
+        name = f"{spec['prefix']}_{i:06d}.svg"
+        yield Scenario(name, tree, {"file": name, "index": i, "seed": spec["seed"],
+                                    "attempts": attempt + 1, **meta})
+
+
+def render(scenarios, optimize=False):
+    """Scenario stream → (name, SVG bytes, meta) stream."""
+    if optimize:
+        from components import optimize as optimizer
+    for scenario in scenarios:
+        buf = io.StringIO()
+        tree = scenario.tree
+        if optimize:
+            optimized = optimizer.optimize(tree)
+            optimizer.verify(tree, optimized)
+            svgtree.write_document(optimized, buf, indent="")
+        else:
+            svgtree.write_document(tree, buf)
+        yield scenario.name, buf.getvalue().encode(), scenario.meta
+
+
+def write(items, sink):
+    """Drain a (name, bytes, meta) stream into sink, then add index.jsonl. Returns totals."""
+    count = size = 0
+    with tempfile.TemporaryFile() as index:
+        for name, data, meta in items:
+            sink.add(name, data)
+            record = {**meta, "bytes": len(data), "sha256": content_hash(data)}
+            index.write((json.dumps(record, sort_keys=True) + "\n").encode())
+            count += 1
+            size += len(data)
+        length = index.tell()
+        index.seek(0)
+        sink.add_stream(INDEX_NAME, index, length)
+    return count, size
+
+
+# ── Sinks ───────────────────────────────────────────────────────────
+
+class DirectorySink:
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def add(self, name, data):
+        with open(os.path.join(self.path, name), "wb") as f:
+            f.write(data)
+
+    def add_stream(self, name, fh, size):
+        with open(os.path.join(self.path, name), "wb") as f:
+            while chunk := fh.read(1 << 16):
+                f.write(chunk)
+
+    def close(self):
+        pass
+
+
+class TarSink:
+    """Reproducible tar (fixed mtime/owner); .tar.gz / .tgz are gzip-compressed."""
+
+    def __init__(self, path):
+        gz = path.endswith((".gz", ".tgz"))
+        self._raw = open(path, "wb")
+        if gz:
+            import gzip
+            self._gz = gzip.GzipFile(fileobj=self._raw, mode="wb", mtime=0, filename="")
+        else:
+            self._gz = None
+        self._tar = tarfile.open(fileobj=self._gz or self._raw, mode="w",
+                                 format=tarfile.PAX_FORMAT)
+
+    def _info(self, name, size):
+        info = tarfile.TarInfo(name)
+        info.size = size
+        info.mode = 0o644
+        info.mtime = 0
+        return info
+
+    def add(self, name, data):
+        self._tar.addfile(self._info(name, len(data)), io.BytesIO(data))
+
+    def add_stream(self, name, fh, size):
+        self._tar.addfile(self._info(name, size), fh)
+
+    def close(self):
+        self._tar.close()
+        if self._gz is not None:
+            self._gz.close()
+        self._raw.close()
+
+
+class ZipSink:
+    """Deflated zip with fixed timestamps."""
+
+    def __init__(self, path):
+        self._zip = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED)
+
+    def _info(self, name):
+        info = zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.external_attr = 0o644 << 16
+        return info
+
+    def add(self, name, data):
+        self._zip.writestr(self._info(name), data)
+
+    def add_stream(self, name, fh, size):
+        with self._zip.open(self._info(name), "w", force_zip64=size > 0x7FFFFFFF) as out:
+            while chunk := fh.read(1 << 16):
+                out.write(chunk)
+
+    def close(self):
+        self._zip.close()
+
+
+def open_sink(path):
+    """Sink for path by extension: .zip, .tar/.tar.gz/.tgz, otherwise a directory."""
+    if path.endswith(".zip"):
+        return ZipSink(path)
+    if path.endswith((".tar", ".tar.gz", ".tgz")):
+        return TarSink(path)
+    return DirectorySink(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", required=True,
+                        help="output directory, or .zip / .tar / .tar.gz archive")
+    parser.add_argument("--spec", help="JSON spec file (keys as in DEFAULT_SPEC)")
+    parser.add_argument("-n", "--count", type=int, help="number of scenes (overrides the spec)")
+    parser.add_argument("--seed", type=int, help="random seed (overrides the spec)")
+    parser.add_argument("--optimize", action="store_true",
+                        help="write compact optimized SVG (see optimize.py)")
+    args = parser.parse_args(argv)
+
+    try:
+        spec = load_spec(args.spec, count=args.count, seed=args.seed)
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+
+    start = time.perf_counter()
+    stats = {}
+    sink = open_sink(args.output)
+    try:
+        count, size = write(render(generate(spec, stats=stats), args.optimize), sink)
+    finally:
+        sink.close()
+    elapsed = time.perf_counter() - start
+    print(f"Generated {count} scenes ({size / 1024:.0f} KiB, {stats['rejected']} resampled, "
+          f"{stats['skipped']} skipped) in {elapsed:.2f} s → {os.path.abspath(args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,23 @@
 """Scene compositions for INTERSECTION_* SVGs.
 
-Each function returns a complete SVG string ready to write to disk.
+Each function returns the root <svg> Element of a complete document; write it
+with svgtree.write_document() or svgtree.to_string().
 All scenes use primitives from primitives.py and colors from style_tokens.py.
+ALL_SCENES holds the functions themselves; nothing renders until called.
+INTERSECTION_UNCONTROLLED is described as data in specs/ (see templates.py).
 """
 
 from .primitives import *
 from .style_tokens import *
+from .svgtree import Comment, Element, Fragment
 
 
-def _svg(w, h, *parts, defs=""):
+def _svg(w, h, *parts, defs=None):
     """Wrap parts into a complete SVG document."""
-    body = "\n  ".join(p for p in parts if p)
-    return (
-        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {w} {h}">\n'
-        f'  {defs}\n'
-        f'  {body}\n'
-        f'</svg>\n'
-    )
+    return Element("svg", {"xmlns": "http://www.w3.org/2000/svg", "viewBox": f"0 0 {w} {h}"}, [
+        defs if defs is not None else Fragment(),
+        Fragment(*(p for p in parts if p)),
+    ])
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -26,26 +27,26 @@ def _svg(w, h, *parts, defs=""):
 def scene_4way_stop():
     return _svg(200, 200,
         grass_bg(200, 200),
-        "<!-- Roads -->",
+        Comment("Roads"),
         road_h(0, 70, 200, 60),
         road_v(70, 0, 60, 200),
-        "<!-- Center lines -->",
+        Comment("Center lines"),
         yellow_solid(98, 70, 4, 60),
         yellow_solid(70, 98, 60, 4),
-        "<!-- Stop lines (6px for visibility) -->",
+        Comment("Stop lines (6px for visibility)"),
         stop_line(0, 64, 70, 6),
         stop_line(130, 64, 70, 6),
         stop_line(64, 0, 6, 70),
         stop_line(64, 130, 6, 70),
-        "<!-- Stop signs at corners -->",
+        Comment("Stop signs at corners"),
         stop_sign(20, 35),
         stop_sign(155, 35),
         stop_sign(20, 150),
         stop_sign(155, 150),
-        "<!-- Blue ego vehicle heading east -->",
+        Comment("Blue ego vehicle heading east"),
         sedan(22, 75, color=COLOR_VEHICLE_EGO),
         traj_arrow(54, 84, 66, 84),
-        "<!-- Gray vehicle heading north -->",
+        Comment("Gray vehicle heading north"),
         sedan(75, 148, color=COLOR_VEHICLE_OTHER, orient="N"),
         traj_arrow(84, 146, 84, 134),
         defs=arrow_defs(),
@@ -59,52 +60,28 @@ def scene_4way_stop():
 def scene_t_stop():
     return _svg(200, 200,
         grass_bg(200, 200),
-        "<!-- Main road (horizontal) -->",
+        Comment("Main road (horizontal)"),
         road_h(0, 70, 200, 60),
-        "<!-- Side road (vertical, from bottom) -->",
+        Comment("Side road (vertical, from bottom)"),
         road_v(70, 70, 60, 130),
-        "<!-- Center lines -->",
+        Comment("Center lines"),
         yellow_solid(98, 130, 4, 70),
         yellow_solid(0, 98, 70, 4),
         yellow_solid(130, 98, 70, 4),
-        "<!-- Stop line on side road (6px) -->",
+        Comment("Stop line on side road (6px)"),
         stop_line(70, 128, 60, 6),
-        "<!-- Stop sign -->",
+        Comment("Stop sign"),
         stop_sign(45, 140),
-        "<!-- Blue ego on side road approaching stop -->",
+        Comment("Blue ego on side road approaching stop"),
         sedan(82, 160, color=COLOR_VEHICLE_EGO, orient="N"),
         traj_arrow(91, 158, 91, 138),
-        "<!-- Gray vehicle on main road (right of way) -->",
+        Comment("Gray vehicle on main road (right of way)"),
         sedan(22, 75, color=COLOR_VEHICLE_OTHER),
         traj_arrow(54, 84, 66, 84),
         defs=arrow_defs(),
     )
 
 
-# ═══════════════════════════════════════════════════════════════════
-# 3. INTERSECTION_UNCONTROLLED  (200x200)
-# ═══════════════════════════════════════════════════════════════════
-
-def scene_uncontrolled():
-    return _svg(200, 200,
-        grass_bg(200, 200),
-        road_h(0, 70, 200, 60),
-        road_v(70, 0, 60, 200),
-        "<!-- Center lines (NO stop lines — that's the lesson) -->",
-        yellow_solid(98, 0, 4, 70),
-        yellow_solid(98, 130, 4, 70),
-        yellow_solid(0, 98, 70, 4),
-        yellow_solid(130, 98, 70, 4),
-        "<!-- Blue ego vehicle from west -->",
-        sedan(22, 75, color=COLOR_VEHICLE_EGO),
-        traj_arrow(54, 84, 66, 84),
-        "<!-- Gray vehicle from north -->",
-        sedan(75, 22, color=COLOR_VEHICLE_OTHER, orient="N"),
-        traj_arrow(84, 54, 84, 66),
-        defs=arrow_defs(),
-    )
-
-
 # ═══════════════════════════════════════════════════════════════════
 # 4. INTERSECTION_ROUNDABOUT  (200x200)
 # ═══════════════════════════════════════════════════════════════════
@@ -112,26 +89,26 @@ def scene_uncontrolled():
 def scene_roundabout():
     return _svg(200, 200,
         grass_bg(200, 200),
-        "<!-- Circular road -->",
+        Comment("Circular road"),
         roundabout_road(100, 100, r_out=60, r_in=35),
-        "<!-- Approach roads -->",
+        Comment("Approach roads"),
         road_v(90, 0, 20, 50),
         road_h(150, 90, 50, 20),
         road_v(90, 150, 20, 50),
         road_h(0, 90, 50, 20),
-        "<!-- Yield triangles at entries -->",
+        Comment("Yield triangles at entries"),
         yield_tri(100, 50, orient="N"),
         yield_tri(150, 100, orient="E"),
         yield_tri(100, 150, orient="S"),
         yield_tri(50, 100, orient="W"),
-        "<!-- Counterclockwise flow arrows -->",
+        Comment("Counterclockwise flow arrows"),
         traj_curve(100, 30, 80, 40, 70, 55, marker_id="arrowhead"),
         traj_curve(170, 100, 160, 80, 145, 70, marker_id="arrowhead"),
         traj_curve(100, 170, 120, 160, 130, 145, marker_id="arrowhead"),
         traj_curve(30, 100, 40, 120, 55, 130, marker_id="arrowhead"),
-        "<!-- Ego vehicle (blue) entering from south -->",
+        Comment("Ego vehicle (blue) entering from south"),
         sedan(88, 158, w=24, h=16, color=COLOR_VEHICLE_EGO),
-        "<!-- Other vehicle (gray) in roundabout -->",
+        Comment("Other vehicle (gray) in roundabout"),
         sedan(132, 88, w=16, h=24, color=COLOR_VEHICLE_OTHER, orient="N"),
         defs=arrow_defs("arrowhead"),
     )
@@ -145,13 +122,13 @@ def scene_pedestrian_crosswalk():
     return _svg(200, 200,
         grass_bg(200, 200),
         road_h(0, 70, 200, 60),
-        "<!-- Stop line -->",
+        Comment("Stop line"),
         stop_line(0, 64, 70, 6),
-        "<!-- Crosswalk zebra stripes -->",
+        Comment("Crosswalk zebra stripes"),
         crosswalk_zebra(76, 70, 50, 60, n=3),
-        "<!-- Pedestrian in crosswalk -->",
+        Comment("Pedestrian in crosswalk"),
         pedestrian(100, 88),
-        "<!-- Stopped vehicle behind stop line -->",
+        Comment("Stopped vehicle behind stop line"),
         sedan(20, 45, w=35, h=20, color=COLOR_VEHICLE_OTHER),
     )
 
@@ -165,11 +142,11 @@ def scene_emergency_vehicle():
         grass_bg(200, 200),
         road_h(0, 70, 200, 60),
         road_v(70, 0, 60, 200),
-        "<!-- Emergency vehicle approaching from east -->",
+        Comment("Emergency vehicle approaching from east"),
         emergency(140, 75, orient="E"),
-        "<!-- Direction arrow (moving west) -->",
+        Comment("Direction arrow (moving west)"),
         traj_arrow(138, 86, 134, 86),
-        "<!-- Yielding vehicles pulled to curb -->",
+        Comment("Yielding vehicles pulled to curb"),
         compact(20, 78, color=COLOR_VEHICLE_OTHER),
         compact(78, 15, color=COLOR_VEHICLE_OTHER, orient="N"),
         defs=arrow_defs(),
@@ -184,14 +161,14 @@ def scene_school_bus_stopped():
     return _svg(300, 200,
         grass_bg(300, 200),
         road_h(0, 80, 300, 40),
-        "<!-- Yellow center line (dashed) -->",
+        Comment("Yellow center line (dashed)"),
         yellow_dashed(0, 98, 100, orient="H"),
         yellow_dashed(200, 98, 100, orient="H"),
-        "<!-- School bus with stop arm -->",
+        Comment("School bus with stop arm"),
         school_bus(100, 75),
-        "<!-- Stopped vehicle behind bus -->",
+        Comment("Stopped vehicle behind bus"),
         sedan(55, 83, w=30, h=16, color=COLOR_VEHICLE_OTHER),
-        "<!-- Stopped vehicle on opposite side -->",
+        Comment("Stopped vehicle on opposite side"),
         sedan(210, 83, w=30, h=16, color=COLOR_VEHICLE_OTHER),
     )
 
@@ -203,34 +180,33 @@ def scene_school_bus_stopped():
 def scene_merge_highway():
     return _svg(300, 200,
         grass_bg(300, 200),
-        "<!-- Main highway (2 lanes) -->",
+        Comment("Main highway (2 lanes)"),
         road_h(0, 60, 300, 80),
         yellow_solid(0, 98, 300, 4),
-        "<!-- Entrance ramp -->",
+        Comment("Entrance ramp"),
         merge_ramp(0, 160, 180, 100, 100, 160),
-        "<!-- Dashed merge taper -->",
+        Comment("Dashed merge taper"),
         merge_taper(50, 130, 140, 102, n=4),
-        "<!-- Vehicle on ramp (red = must yield) -->",
+        Comment("Vehicle on ramp (red = must yield)"),
         compact(40, 148, w=20, h=12, color=COLOR_VEHICLE_DANGER),
-        "<!-- Vehicle on highway -->",
+        Comment("Vehicle on highway"),
         sedan(220, 68, color=COLOR_VEHICLE_OTHER),
-        "<!-- Merge trajectory arrow -->",
+        Comment("Merge trajectory arrow"),
         traj_arrow(62, 142, 100, 110, marker_id="arr"),
         defs=arrow_defs(),
     )
 
 
 # ═══════════════════════════════════════════════════════════════════
-# Registry — maps filename → SVG content
+# Registry — maps filename → scene function (rendered on demand)
 # ═══════════════════════════════════════════════════════════════════
 
 ALL_SCENES = {
-    "INTERSECTION_4WAY_STOP.svg":           scene_4way_stop(),
-    "INTERSECTION_T_STOP.svg":              scene_t_stop(),
-    "INTERSECTION_UNCONTROLLED.svg":        scene_uncontrolled(),
-    "INTERSECTION_ROUNDABOUT.svg":          scene_roundabout(),
-    "INTERSECTION_PEDESTRIAN_CROSSWALK.svg": scene_pedestrian_crosswalk(),
-    "INTERSECTION_EMERGENCY_VEHICLE.svg":   scene_emergency_vehicle(),
-    "INTERSECTION_SCHOOL_BUS_STOPPED.svg":  scene_school_bus_stopped(),
-    "INTERSECTION_MERGE_HIGHWAY.svg":       scene_merge_highway(),
+    "INTERSECTION_4WAY_STOP.svg":           scene_4way_stop,
+    "INTERSECTION_T_STOP.svg":              scene_t_stop,
+    "INTERSECTION_ROUNDABOUT.svg":          scene_roundabout,
+    "INTERSECTION_PEDESTRIAN_CROSSWALK.svg": scene_pedestrian_crosswalk,
+    "INTERSECTION_EMERGENCY_VEHICLE.svg":   scene_emergency_vehicle,
+    "INTERSECTION_SCHOOL_BUS_STOPPED.svg":  scene_school_bus_stopped,
+    "INTERSECTION_MERGE_HIGHWAY.svg":       scene_merge_highway,
 }
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""Perceptual near-duplicate and confusable-pair search over rendered assets.
+
+Each SVG is rendered with its larger side at HASH_PX (white background, as the
+app shows it; the audit's 96dp render is reused under --raster) and reduced to
+a 256-bit perceptual hash of four 64-bit parts:
+
+    pHash of luma       signs of the low-frequency 8x8 DCT of a 32x32 thumbnail
+                        against their median
+    dHash of luma       signs of the horizontal gradient of a 9x8 thumbnail
+    dHash of Cb, Cr     the same over each chroma channel, so a red and a green
+                        sign of one layout differ even where their luma agrees
+
+Look-alike images differ in few bits, so the Hamming distance between hashes
+measures similarity:
+
+    <= NEAR_DUPLICATE   practically the same picture at thumbnail size
+    <= CONFUSABLE       easy to mistake for each other at a glance
+
+Assets whose names differ only in their MUTCD code (two pictures for one
+meaning, e.g. MUTCD_OM1-1_KEEP_RIGHT and MUTCD_R4-7_KEEP_RIGHT) are
+confusable whatever their distance; see same_name_pairs().
+
+Pairs are found by multi-index hashing: the hash is split into bands, and two
+hashes within radius r of each other agree within BAND_RADIUS bits on at
+least one of r // (BAND_RADIUS + 1) + 1 bands (pigeonhole). Each band keys a
+table, so a query only compares against the items found by band lookups
+instead of against all n(n-1)/2 pairs.
+
+    cd assets/components
+    python3 similarity.py                          # every SVG in assets/svg
+    python3 similarity.py -j 4 /tmp/scenes         # e.g. scenario_gen.py output
+    python3 similarity.py --radius 12 --json pairs.json
+"""
+
+import argparse
+import functools
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Allow running from any directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components import raster, svgtree
+
+INPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "svg")
+
+HASH_PX = 96                   # render size, = TARGET_DP_PRIMARY in scripts/audit_image_quality.py
+BACKGROUND = (255, 255, 255)
+DCT_PX = 32                    # pHash thumbnail side
+HASH_BITS = 256
+NEAR_DUPLICATE = 12            # Hamming distance out of HASH_BITS
+CONFUSABLE = 36
+BAND_RADIUS = 1                # bit differences a band lookup tolerates
+MUTCD_NAME = re.compile(r"MUTCD_[A-Z]+\d*-\d+[a-z]?_(.+)")
+
+
+# ── Hashing ─────────────────────────────────────────────────────────
+
+def hash_key():
+    """Hash of this module's source plus raster.renderer_key(), for caches of perceptual hashes."""
+    with open(os.path.abspath(__file__), "rb") as f:
+        source = f.read()
+    return hashlib.sha256(source + raster.renderer_key().encode()).hexdigest()[:16]
+
+
+@functools.lru_cache(maxsize=None)
+def _dct_matrix(n):
+    """Orthogonal DCT-II basis, rows = frequencies."""
+    np = raster.np
+    k = np.arange(n)
+    return np.cos(np.pi * (2 * k[None, :] + 1) * k[:, None] / (2 * n))
+
+
+def _bits(flags):
+    value = 0
+    for flag in flags:
+        value = (value << 1) | bool(flag)
+    return value
+
+
+def _dhash(channel):
+    np, Image = raster.np, raster.Image
+    grid = np.asarray(channel.resize((9, 8), Image.BOX), dtype=np.float64)
+    return _bits((grid[:, 1:] > grid[:, :-1]).ravel())
+
+
+def perceptual_hash(rgb):
+    """256-bit pHash ‖ dHash of luma ‖ dHash of Cb ‖ dHash of Cr of an (h, w, 3) uint8 image."""
+    np, Image = raster.np, raster.Image
+    luma, cb, cr = Image.fromarray(rgb, "RGB").convert("YCbCr").split()
+    thumb = np.asarray(luma.resize((DCT_PX, DCT_PX), Image.BOX), dtype=np.float64)
+    d = _dct_matrix(DCT_PX)
+    low = (d @ thumb @ d.T)[:8, :8].ravel()
+    phash = _bits(low > np.median(low[1:]))         # the DC term would dominate the median
+    return (phash << 192) | (_dhash(luma) << 128) | (_dhash(cb) << 64) | _dhash(cr)
+
+
+def format_hash(value):
+    """Fixed-width hex of a perceptual hash, as stored in reports and JSON."""
+    return f"{value:0{HASH_BITS // 4}x}"
+
+
+def render_for_hash(root):
+    """RGB render of a root <svg> at HASH_PX on BACKGROUND."""
+    width, height = raster.output_size(root, HASH_PX)
+    return raster.render(root, width, height, background=BACKGROUND)[..., :3]
+
+
+def hash_svg(path):
+    """(path, perceptual hash) of one SVG file. Runs in worker processes."""
+    return path, perceptual_hash(render_for_hash(svgtree.parse(path)))
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+def kind(distance):
+    return "near-duplicate" if distance <= NEAR_DUPLICATE else "confusable"
+
+
+# ── Multi-index hashing ─────────────────────────────────────────────
+
+class MultiIndex:
+    """Band tables over hashes (ints) for Hamming-radius queries up to radius.
+
+    Band j holds bits j, j + m, j + 2m, … of the m bands, so every band
+    mixes all four parts of the hash. A query looks up each of its band
+    keys and their one-bit neighbours (BAND_RADIUS) and compares the full
+    hash only with the items found. comparisons counts those full-hash
+    distances, for comparing with all-pairs.
+    """
+
+    def __init__(self, radius):
+        self.radius = radius
+        self.bands = radius // (BAND_RADIUS + 1) + 1
+        self.widths = [len(range(j, HASH_BITS, self.bands)) for j in range(self.bands)]
+        self.tables = [{} for _ in range(self.bands)]
+        self.keys = {}
+        self.comparisons = 0
+
+    def _band_keys(self, key):
+        keys = [0] * self.bands
+        for i in range(HASH_BITS):
+            if key >> i & 1:
+                keys[i % self.bands] |= 1 << (i // self.bands)
+        return keys
+
+    def add(self, key, item):
+        self.keys[item] = key
+        for table, band in zip(self.tables, self._band_keys(key)):
+            table.setdefault(band, []).append(item)
+
+    def search(self, key):
+        """[(distance, item)] of every item within radius of key."""
+        candidates = set()
+        for table, band, width in zip(self.tables, self._band_keys(key), self.widths):
+            candidates.update(table.get(band, ()))
+            for bit in range(width):
+                candidates.update(table.get(band ^ (1 << bit), ()))
+        found = []
+        for item in candidates:
+            d = hamming(key, self.keys[item])
+            self.comparisons += 1
+            if d <= self.radius:
+                found.append((d, item))
+        return found
+
+
+def similar_pairs(hashes, radius=CONFUSABLE):
+    """([(distance, a, b)] sorted, comparisons) for every pair of items within radius.
+
+    hashes maps item → perceptual hash. Each item is queried against the
+    items before it, then added, so every pair is reported once (a < b in
+    insertion order).
+    """
+    index = MultiIndex(radius)
+    pairs = []
+    for item, key in hashes.items():
+        pairs.extend((d, other, item) for d, other in index.search(key))
+        index.add(key, item)
+    pairs.sort(key=lambda p: (p[0], str(p[1]), str(p[2])))
+    return pairs, index.comparisons
+
+
+def same_name_pairs(names):
+    """[(a, b)] of names that differ only in their MUTCD code, in input order."""
+    groups = {}
+    for name in names:
+        match = MUTCD_NAME.fullmatch(name)
+        if match:
+            groups.setdefault(match.group(1), []).append(name)
+    return [(a, b) for group in groups.values() for i, a in enumerate(group) for b in group[i + 1:]]
+
+
+def lookalike_pairs(hashes, radius=CONFUSABLE):
+    """([(distance, a, b, kind)] sorted, comparisons): similar_pairs() plus same_name_pairs().
+
+    kind is "near-duplicate", "confusable" or, for a same-name pair farther
+    apart than radius, "same name".
+    """
+    pairs, comparisons = similar_pairs(hashes, radius)
+    found = {frozenset((a, b)) for _, a, b in pairs}
+    rows = [(d, a, b, kind(d)) for d, a, b in pairs]
+    for a, b in same_name_pairs(hashes):
+        if frozenset((a, b)) not in found:
+            rows.append((hamming(hashes[a], hashes[b]), a, b, "same name"))
+            comparisons += 1
+    rows.sort(key=lambda p: (p[0], str(p[1]), str(p[2])))
+    return rows, comparisons
+
+
+# ── CLI ─────────────────────────────────────────────────────────────
+
+def _svg_paths(inputs):
+    paths = []
+    for p in inputs:
+        paths.extend(sorted(glob.glob(os.path.join(p, "*.svg"))) if os.path.isdir(p) else [p])
+    return paths
+
+
+def hash_svgs(paths, jobs=0):
+    """{path: perceptual hash} over a process pool."""
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1 or len(paths) <= 1:
+        return dict(map(hash_svg, paths))
+    with ProcessPoolExecutor(max_workers=min(jobs, len(paths))) as pool:
+        return dict(pool.map(hash_svg, paths, chunksize=max(1, len(paths) // (jobs * 4))))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", nargs="*",
+                        help="SVG files or directories (default: every SVG in assets/svg)")
+    parser.add_argument("--radius", type=int, default=CONFUSABLE,
+                        help=f"report pairs within this Hamming distance of {HASH_BITS} bits (default: {CONFUSABLE})")
+    parser.add_argument("--jobs", "-j", type=int, default=0, metavar="N",
+                        help="worker processes for rendering (default 0 = one per CPU)")
+    parser.add_argument("--json", metavar="OUT", help="also write hashes and pairs as JSON")
+    parser.add_argument("--limit", type=int, default=50, metavar="N",
+                        help="print at most N pairs, closest first (default: 50; 0 = all)")
+    args = parser.parse_args(argv)
+    try:
+        raster.require()
+    except raster.RasterError as exc:
+        parser.error(str(exc))
+
+    paths = _svg_paths(args.inputs or [INPUT_DIR])
+    start = time.perf_counter()
+    hashes = {os.path.splitext(os.path.basename(p))[0]: h for p, h in hash_svgs(paths, args.jobs).items()}
+    hash_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    pairs, comparisons = lookalike_pairs(hashes, args.radius)
+    search_ms = (time.perf_counter() - start) * 1000
+
+    for d, a, b, k in pairs[:args.limit or None]:
+        print(f"  {d:>3}  {k:<14}  {a}  ~  {b}")
+    if args.limit and len(pairs) > args.limit:
+        print(f"  … {len(pairs) - args.limit} more")
+    n = len(hashes)
+    near = sum(1 for p in pairs if p[3] == "near-duplicate")
+    print(f"\n{n} SVGs hashed in {hash_ms:.0f} ms; {len(pairs)} pairs within {args.radius} or "
+          f"same-named ({near} near-duplicates) in {search_ms:.0f} ms, {comparisons} hash comparisons "
+          f"vs {n * (n - 1) // 2} for all pairs")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"hashes": {k: format_hash(h) for k, h in sorted(hashes.items())},
+                       "pairs": [{"distance": d, "a": a, "b": b, "kind": k} for d, a, b, k in pairs]},
+                      f, indent=1)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
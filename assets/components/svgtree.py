@@ -0,0 +1,366 @@
+"""Compact in-memory SVG element tree with a streaming serializer.
+
+Primitives build Element/Fragment nodes instead of markup strings, so a scene
+can be queried and transformed (stroke widths, bounding boxes, ...) before it
+is written, and written straight to a file handle without assembling one big
+string first.
+
+Attribute names and string values are interned: a scene repeats the same
+handful of names and palette colors hundreds of times. Numeric values are kept
+as numbers and formatted with str() on output, exactly like the f-strings the
+primitives used before.
+"""
+
+import functools
+import math
+import re
+import sys
+from io import StringIO
+
+from .pathdata import PathError, arc_points, parse as parse_path
+
+_intern = sys.intern
+_ESCAPE_ATTR = str.maketrans({"&": "&amp;", "<": "&lt;", '"': "&quot;"})
+_ESCAPE_TEXT = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
+# Separator written before each child of the root <svg>; nested content is inline.
+INDENT = "\n  "
+
+
+class Node:
+    __slots__ = ()
+
+
+class Element(Node):
+    """One SVG element. attrs preserves insertion order (it is the output order).
+
+    kind is the semantic role set by @component ("vehicle", "arrow", ...);
+    it is never serialized.
+    """
+
+    __slots__ = ("tag", "attrs", "children", "text", "kind")
+
+    def __init__(self, tag, attrs=None, children=(), text=None):
+        self.kind = None
+        self.tag = _intern(tag)
+        self.attrs = {}
+        if attrs:
+            for name, value in attrs.items():
+                self.set(name, value)
+        self.children = [c for c in children if c is not None]
+        self.text = text
+
+    def get(self, name, default=None):
+        return self.attrs.get(name, default)
+
+    def set(self, name, value):
+        self.attrs[_intern(name)] = _intern(value) if isinstance(value, str) else value
+
+    def iter(self, tag=None):
+        """Depth-first over this element and all descendant elements."""
+        if tag is None or self.tag == tag:
+            yield self
+        for child in self.children:
+            if isinstance(child, (Element, Fragment)):
+                yield from child.iter(tag)
+
+    def __repr__(self):
+        return f"<Element {self.tag} {self.attrs!r}>"
+
+
+class Fragment(Node):
+    """An ordered group of sibling nodes with no element of its own.
+
+    Multi-element primitives (dashed lines, wheels, ...) return a Fragment; it
+    is written as its children in place.
+    """
+
+    __slots__ = ("children", "kind")
+
+    def __init__(self, *children):
+        self.kind = None
+        self.children = [c for c in children if c is not None]
+
+    def __len__(self):
+        return len(self.children)
+
+    def iter(self, tag=None):
+        for child in self.children:
+            if isinstance(child, (Element, Fragment)):
+                yield from child.iter(tag)
+
+
+class Comment(Node):
+    __slots__ = ("text",)
+
+    def __init__(self, text):
+        self.text = text
+
+
+def el(tag, *children, text=None, **attrs):
+    """Element shorthand: keyword names map '_' to '-' (stroke_width → stroke-width)."""
+    return Element(tag, {k.replace("_", "-"): v for k, v in attrs.items()}, children, text)
+
+
+def component(kind):
+    """Decorator for primitives: tag the node they return with a semantic kind.
+
+    geometry.py uses the kind to decide which overlaps are errors (two
+    vehicles) and which are intended (a vehicle on a road).
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def tagged(*args, **kwargs):
+            node = fn(*args, **kwargs)
+            node.kind = kind
+            return node
+        return tagged
+    return decorate
+
+
+# ── Serialization ───────────────────────────────────────────────────
+
+def write(node, fh, sep="", indent=INDENT):
+    """Stream node as SVG markup to fh (anything with .write(str)).
+
+    indent is written before each child of the root <svg>; pass "" for
+    compact output with no whitespace between elements.
+    """
+    if isinstance(node, Element):
+        fh.write("<" + node.tag)
+        for name, value in node.attrs.items():
+            fh.write(f' {name}="{str(value).translate(_ESCAPE_ATTR)}"')
+        if not node.children and node.text is None:
+            fh.write("/>")
+            return
+        fh.write(">")
+        child_sep = indent if node.tag == "svg" else ""
+        for child in node.children:
+            fh.write(child_sep)
+            write(child, fh, child_sep, indent)
+        if node.text is not None:
+            fh.write(node.text.translate(_ESCAPE_TEXT))
+        if child_sep:
+            fh.write("\n")
+        fh.write(f"</{node.tag}>")
+    elif isinstance(node, Fragment):
+        for i, child in enumerate(node.children):
+            if i:
+                fh.write(sep)
+            write(child, fh, sep, indent)
+    elif isinstance(node, Comment):
+        fh.write(f"<!-- {node.text} -->")
+    else:
+        raise TypeError(f"Cannot serialize {type(node).__name__}")
+
+
+def write_document(root, fh, indent=INDENT):
+    """Stream a complete SVG document (root element + trailing newline)."""
+    write(root, fh, indent=indent)
+    fh.write("\n")
+
+
+def to_string(node):
+    buf = StringIO()
+    if isinstance(node, Element) and node.tag == "svg":
+        write_document(node, buf)
+    else:
+        write(node, buf)
+    return buf.getvalue()
+
+
+# ── Parsing ─────────────────────────────────────────────────────────
+
+def parse(source):
+    """Parse an SVG file (path or file object) into an Element tree.
+
+    Namespaces are stripped from tags, inline style="a:b; c:d" declarations
+    are expanded into attributes (they override presentation attributes, as in
+    CSS), and whitespace-only text is dropped. Comments are not kept.
+    """
+    import xml.etree.ElementTree as ET
+    return _from_etree(ET.parse(source).getroot())
+
+
+def _from_etree(node):
+    attrs = {}
+    for name, value in node.attrib.items():
+        if name.startswith("{"):
+            ns, _, local = name[1:].partition("}")
+            name = "xlink:" + local if ns.endswith("xlink") else local
+        attrs[name] = value
+    style = attrs.pop("style", None)
+    if style:
+        for decl in style.split(";"):
+            key, sep, value = decl.partition(":")
+            if sep:
+                attrs[key.strip()] = value.strip()
+    text = node.text if node.text and node.text.strip() else None
+    ns, _, tag = node.tag[1:].rpartition("}") if node.tag.startswith("{") else ("", "", node.tag)
+    if tag == "svg" and ns:
+        attrs = {"xmlns": ns, **attrs}
+    return Element(tag, attrs, [_from_etree(child) for child in node
+                                if isinstance(child.tag, str)], text)
+
+
+# ── Queries ─────────────────────────────────────────────────────────
+
+_NUM = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_TRANSFORM = re.compile(r"(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)")
+
+IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+
+def parse_transform(value):
+    """SVG transform attribute → affine (a, b, c, d, e, f)."""
+    m = IDENTITY
+    for name, args in _TRANSFORM.findall(value or ""):
+        v = [float(n) for n in _NUM.findall(args)]
+        if name == "matrix" and len(v) == 6:
+            t = tuple(v)
+        elif name == "translate":
+            t = (1, 0, 0, 1, v[0], v[1] if len(v) > 1 else 0)
+        elif name == "scale":
+            t = (v[0], 0, 0, v[1] if len(v) > 1 else v[0], 0, 0)
+        elif name == "rotate":
+            a = math.radians(v[0])
+            cos, sin = math.cos(a), math.sin(a)
+            t = (cos, sin, -sin, cos, 0, 0)
+            if len(v) == 3:
+                cx, cy = v[1], v[2]
+                t = multiply(multiply((1, 0, 0, 1, cx, cy), t), (1, 0, 0, 1, -cx, -cy))
+        elif name == "skewX":
+            t = (1, 0, math.tan(math.radians(v[0])), 1, 0, 0)
+        elif name == "skewY":
+            t = (1, math.tan(math.radians(v[0])), 0, 1, 0, 0)
+        else:
+            continue
+        m = multiply(m, t)
+    return m
+
+
+def multiply(m, n):
+    """Affine product m·n (n applied first)."""
+    a, b, c, d, e, f = m
+    A, B, C, D, E, F = n
+    return (a * A + c * B, b * A + d * B, a * C + c * D, b * C + d * D,
+            a * E + c * F + e, b * E + d * F + f)
+
+
+def apply(m, x, y):
+    a, b, c, d, e, f = m
+    return a * x + c * y + e, b * x + d * y + f
+
+
+def walk(node, ctm=IDENTITY, inherited=None):
+    """Yield (element, ctm, inherited attrs) for every element under node.
+
+    ctm is the element's full transform to root coordinates (including its
+    own transform attribute); inherited holds the presentation attributes it
+    receives from ancestors merged with its own. Content that is never
+    rendered in place (<defs>, <marker>, ...) is skipped.
+    """
+    inherited = inherited or {}
+    if isinstance(node, Fragment):
+        for child in node.children:
+            yield from walk(child, ctm, inherited)
+        return
+    if not isinstance(node, Element) or node.tag in NOT_RENDERED:
+        return
+    if "transform" in node.attrs:
+        ctm = multiply(ctm, parse_transform(node.attrs["transform"]))
+    own = {k: v for k, v in node.attrs.items() if k in INHERITED}
+    attrs = {**inherited, **own} if own else inherited
+    yield node, ctm, attrs
+    for child in node.children:
+        yield from walk(child, ctm, attrs)
+
+
+NOT_RENDERED = frozenset({"defs", "marker", "clipPath", "mask", "symbol", "pattern"})
+
+INHERITED = frozenset({
+    "fill", "stroke", "stroke-width", "stroke-linecap", "stroke-linejoin", "stroke-dasharray",
+    "font-family", "font-size", "font-weight", "text-anchor", "fill-opacity", "stroke-opacity",
+})
+
+
+def scale_factor(m):
+    """Uniform scale of an affine transform (geometric mean of its axis scales)."""
+    return math.sqrt(abs(m[0] * m[3] - m[1] * m[2]))
+
+
+def stroke_widths(node):
+    """Rendered stroke width of every stroked element, in root units."""
+    widths = []
+    for elem, ctm, attrs in walk(node):
+        stroke = attrs.get("stroke")
+        if elem.tag in SHAPES and stroke not in (None, "none"):
+            widths.append(float(attrs.get("stroke-width", 1)) * scale_factor(ctm))
+    return widths
+
+
+SHAPES = frozenset({"rect", "circle", "ellipse", "line", "polyline", "polygon", "path", "text"})
+
+
+def local_points(elem):
+    """Points whose hull bounds the element's geometry in its own coordinates."""
+    a = elem.attrs
+    tag = elem.tag
+    if tag == "rect":
+        x, y = float(a.get("x", 0)), float(a.get("y", 0))
+        w, h = float(a.get("width", 0)), float(a.get("height", 0))
+        return [(x, y), (x + w, y), (x, y + h), (x + w, y + h)]
+    if tag in ("circle", "ellipse"):
+        cx, cy = float(a.get("cx", 0)), float(a.get("cy", 0))
+        rx = float(a.get("r", a.get("rx", 0)))
+        ry = float(a.get("r", a.get("ry", 0)))
+        return [(cx - rx, cy - ry), (cx + rx, cy - ry), (cx - rx, cy + ry), (cx + rx, cy + ry)]
+    if tag == "line":
+        return [(float(a.get("x1", 0)), float(a.get("y1", 0))),
+                (float(a.get("x2", 0)), float(a.get("y2", 0)))]
+    if tag in ("polygon", "polyline"):
+        nums = [float(n) for n in _NUM.findall(str(a.get("points", "")))]
+        return list(zip(nums[0::2], nums[1::2]))
+    if tag == "path":
+        # Absolute segments: the control polygon bounds each Bézier, arcs
+        # contribute points along the arc.
+        try:
+            segments = parse_path(str(a.get("d", "")))
+        except PathError:
+            return []
+        pts = []
+        cur = start = (0.0, 0.0)
+        for cmd, args in segments:
+            if cmd == "Z":
+                cur = start
+                continue
+            if cmd == "A":
+                pts.extend(arc_points(cur, *args))
+            else:
+                pts.extend(args)
+            if cmd == "M":
+                start = args[0]
+            cur = args[-1]
+        return pts
+    return []
+
+
+def bbox(node, ctm=IDENTITY, inherited=None):
+    """(x0, y0, x1, y1) of node's geometry in root coordinates, or None if empty.
+
+    ctm/inherited describe node's ancestors, as in walk(). Strokes are included
+    at half their rendered width; markers and text extents are not.
+    """
+    box = None
+    for elem, ctm, attrs in walk(node, ctm, inherited):
+        pts = local_points(elem)
+        if not pts:
+            continue
+        xs, ys = zip(*(apply(ctm, x, y) for x, y in pts))
+        pad = 0.0
+        if attrs.get("stroke") not in (None, "none"):
+            pad = float(attrs.get("stroke-width", 1)) * scale_factor(ctm) / 2
+        b = (min(xs) - pad, min(ys) - pad, max(xs) + pad, max(ys) + pad)
+        box = b if box is None else (min(box[0], b[0]), min(box[1], b[1]),
+                                     max(box[2], b[2]), max(box[3], b[3]))
+    return box
@@ -0,0 +1,299 @@
+"""Declarative scene specs and compiled token templates.
+
+A spec describes a scene as data instead of a scene_* function (JSON, or
+YAML when PyYAML is installed), in specs/:
+
+    {
+      "file": "INTERSECTION_UNCONTROLLED.svg",
+      "viewBox": [200, 200],
+      "defs": {"call": "arrow_defs"},
+      "parts": [
+        {"call": "grass_bg", "args": [200, 200]},
+        {"comment": "Blue ego vehicle from west"},
+        {"call": "sedan", "args": [22, 75], "kwargs": {"color": "$COLOR_VEHICLE_EGO"}}
+      ]
+    }
+
+"call" names a public function of primitives.py; "$NAME" anywhere in args
+refers to a style token. Specs are registered in ALL_SCENES like the Python
+scene modules, so generate.py builds them the same way.
+
+compile_scene() turns any scene (spec or scene_* function) into a Template:
+the scene is built once with every color token replaced by a marker, and
+the serialized SVG is split into literal chunks and token slots. Rendering
+with other token values is then string substitution, not composition:
+
+    template = compile_scene(scenes_intersection.scene_4way_stop)
+    svg = template.render({"COLOR_ROAD": "#202020"})
+
+Numeric tokens (sizes, stroke widths) feed arithmetic, so they are baked
+into the template and are part of its cache key. Templates are cached in
+memory and, when given a cache_dir, on disk (keyed by the sources involved).
+"""
+
+import contextlib
+import glob
+import hashlib
+import json
+import os
+import sys
+import types
+from io import StringIO
+
+try:
+    import yaml
+except ImportError:  # optional: only YAML specs need it
+    yaml = None
+
+from . import primitives, style_tokens, svgtree
+from .svgtree import Comment, Element, Fragment
+
+SPEC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "specs")
+SPEC_EXTENSIONS = (".json", ".yaml", ".yml")
+TEMPLATE_VERSION = 1
+
+# Wraps a token name inside attribute values while compiling; never valid in SVG.
+_MARK = "\x1e"
+_ESCAPE_ATTR = str.maketrans({"&": "&amp;", "<": "&lt;", '"': "&quot;"})
+
+
+class SpecError(ValueError):
+    pass
+
+
+def load_spec(path):
+    """Parse a spec file (JSON or YAML) into a dict."""
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise SpecError(f"{path}: YAML specs need PyYAML: pip install pyyaml")
+            spec = yaml.safe_load(f)
+        else:
+            spec = json.load(f)
+    for key in ("file", "viewBox", "parts"):
+        if key not in (spec or {}):
+            raise SpecError(f"{path}: spec needs {key!r}")
+    return spec
+
+
+class SpecScene:
+    """Scene function built from a spec file; call it like a scene_* function."""
+
+    def __init__(self, path):
+        self.path = path
+        self.spec = load_spec(path)
+        self.filename = self.spec["file"]
+        self.__name__ = "spec:" + os.path.basename(path)
+        self.tokens = sorted(_token_refs([self.spec.get("defs"), self.spec["parts"]]))
+
+    @property
+    def dep_key(self):
+        """Key of the spec file in a deps.SourceIndex."""
+        return "specs." + os.path.basename(self.path)
+
+    @property
+    def dep_keys(self):
+        """SourceIndex keys the scene depends on beyond traced calls: the spec
+        file and every style token it names with "$NAME"."""
+        return [self.dep_key] + [f"style_tokens.{name}" for name in self.tokens]
+
+    def __call__(self, prims=primitives, tokens=style_tokens):
+        spec = self.spec
+        w, h = spec["viewBox"]
+        defs = spec.get("defs")
+        parts = (self._part(part, prims, tokens) for part in spec["parts"])
+        return Element("svg", {"xmlns": "http://www.w3.org/2000/svg", "viewBox": f"0 0 {w} {h}"}, [
+            self._part(defs, prims, tokens) if defs else Fragment(),
+            Fragment(*(p for p in parts if p)),
+        ])
+
+    def _part(self, part, prims, tokens):
+        if "comment" in part:
+            return Comment(part["comment"])
+        name = part.get("call", "")
+        fn = getattr(prims, name, None)
+        public = not name.startswith("_") and callable(fn)
+        if not public or getattr(fn, "__module__", None) != prims.__name__:
+            raise SpecError(f"{self.path}: unknown primitive {name!r}")
+        args = [_resolve(a, tokens, self.path) for a in part.get("args", [])]
+        kwargs = {k: _resolve(v, tokens, self.path) for k, v in part.get("kwargs", {}).items()}
+        return fn(*args, **kwargs)
+
+
+def _resolve(value, tokens, path):
+    if isinstance(value, str) and value.startswith("$"):
+        try:
+            return getattr(tokens, value[1:])
+        except AttributeError:
+            raise SpecError(f"{path}: unknown token {value!r}") from None
+    if isinstance(value, list):
+        return [_resolve(v, tokens, path) for v in value]
+    return value
+
+
+def _token_refs(value):
+    """Names of every "$NAME" token reference in a spec value."""
+    if isinstance(value, str):
+        return {value[1:]} if value.startswith("$") else set()
+    if isinstance(value, dict):
+        value = value.values()
+    elif not isinstance(value, list):
+        return set()
+    return set().union(*map(_token_refs, value))
+
+
+def load_specs(spec_dir=SPEC_DIR):
+    """filename → SpecScene for every spec file in spec_dir, in file name order."""
+    scenes = {}
+    for path in sorted(glob.glob(os.path.join(spec_dir, "*"))):
+        if path.endswith(SPEC_EXTENSIONS):
+            scene = SpecScene(path)
+            scenes[scene.filename] = scene
+    return scenes
+
+
+ALL_SCENES = load_specs()
+
+
+# ── Templates ───────────────────────────────────────────────────────
+
+class Template:
+    """Serialized scene split into literal chunks and token slots.
+
+    chunks alternates literal text and token names: even indexes are text,
+    odd indexes are the names whose values go between them.
+    """
+
+    __slots__ = ("chunks", "baked")
+
+    def __init__(self, chunks, baked):
+        self.chunks = chunks
+        self.baked = baked      # numeric token values compiled in
+
+    @classmethod
+    def from_tree(cls, tree, baked=None):
+        """Template from a tree built with marked tokens (see marked_tree)."""
+        buf = StringIO()
+        svgtree.write_document(tree, buf)
+        return cls(buf.getvalue().split(_MARK), baked or {})
+
+    @property
+    def slots(self):
+        """Token names used by the template, in first-use order."""
+        return tuple(dict.fromkeys(self.chunks[1::2]))
+
+    def render(self, tokens=None):
+        """SVG text with tokens (name → value) substituted; others keep style_tokens values."""
+        tokens = tokens or {}
+        parts = list(self.chunks)
+        parts[1::2] = [str(tokens[n] if n in tokens else getattr(style_tokens, n))
+                       .translate(_ESCAPE_ATTR) for n in parts[1::2]]
+        return "".join(parts)
+
+    def to_dict(self):
+        return {"version": TEMPLATE_VERSION, "chunks": self.chunks, "baked": self.baked}
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("version") != TEMPLATE_VERSION:
+            raise ValueError("stale template")
+        return cls(data["chunks"], data["baked"])
+
+
+def slot_tokens():
+    """Style tokens that become template slots: every string-valued token."""
+    return {name: value for name, value in vars(style_tokens).items()
+            if name.isupper() and isinstance(value, str)}
+
+
+def baked_tokens():
+    """Numeric style tokens, which templates compile in."""
+    return {name: value for name, value in vars(style_tokens).items()
+            if name.isupper() and isinstance(value, (int, float))}
+
+
+@contextlib.contextmanager
+def _marked(module_names):
+    """Fresh copies of primitives + module_names built against marked color tokens.
+
+    Token values are swapped for markers on style_tokens, then the modules
+    are re-executed from source so `from .style_tokens import *` and default
+    arguments pick the markers up. Everything is restored on exit.
+    """
+    originals = slot_tokens()
+    names = [primitives.__name__, *(n for n in module_names if n != primitives.__name__)]
+    saved = {name: sys.modules[name] for name in names}
+    try:
+        for name in originals:
+            setattr(style_tokens, name, f"{_MARK}{name}{_MARK}")
+        fresh = {}
+        for name in names:
+            module = saved[name]
+            copy = types.ModuleType(name)
+            copy.__file__ = module.__file__
+            copy.__package__ = module.__package__
+            with open(module.__file__, encoding="utf-8") as f:
+                code = compile(f.read(), module.__file__, "exec")
+            sys.modules[name] = copy        # later relative imports see the marked copy
+            exec(code, copy.__dict__)
+            fresh[name] = copy
+        yield fresh
+    finally:
+        for name, value in originals.items():
+            setattr(style_tokens, name, value)
+        sys.modules.update(saved)
+
+
+def marked_tree(scene):
+    """Build scene with color tokens replaced by slot markers (see Template.from_tree)."""
+    return marked_trees({None: scene})[None]
+
+
+def marked_trees(scenes):
+    """key → marked tree for a mapping of key → scene, re-executing each module once."""
+    modules = dict.fromkeys(s.__module__ for s in scenes.values() if not isinstance(s, SpecScene))
+    with _marked(list(modules)) as fresh:
+        prims = fresh[primitives.__name__]
+        return {key: scene(prims) if isinstance(scene, SpecScene)
+                else getattr(fresh[scene.__module__], scene.__name__)()
+                for key, scene in scenes.items()}
+
+
+def _sources(scene):
+    paths = [primitives.__file__, svgtree.__file__, __file__]
+    paths.append(scene.path if isinstance(scene, SpecScene) else sys.modules[scene.__module__].__file__)
+    h = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h
+
+
+_cache = {}
+
+
+def compile_scene(scene, cache_dir=None):
+    """Template for a scene function or SpecScene, compiled once per source state."""
+    h = _sources(scene)
+    baked = baked_tokens()
+    h.update(json.dumps([getattr(scene, "__qualname__", scene.__name__), baked,
+                         sorted(slot_tokens())], sort_keys=True).encode())
+    key = h.hexdigest()[:24]
+    template = _cache.get(key)
+    if template is not None:
+        return template
+    path = os.path.join(cache_dir, f"{key}.json") if cache_dir else None
+    if path and os.path.exists(path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                template = Template.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError):
+            template = None
+    if template is None:
+        template = Template.from_tree(marked_tree(scene), baked)
+        if path:
+            from .manifest import write_atomic
+            os.makedirs(cache_dir, exist_ok=True)
+            write_atomic(path, json.dumps(template.to_dict()).encode())
+    _cache[key] = template
+    return template
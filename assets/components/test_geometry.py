@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Checks geometry.validate() findings on small trees built from the primitives.
+
+Usage:
+    python3 -m pytest assets/components/test_geometry.py
+    python3 assets/components/test_geometry.py
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components import geometry
+from components.primitives import arrow_defs, sedan, traj_arrow
+from components.style_tokens import SEDAN_W
+from components.svgtree import Element, Fragment
+
+
+def scene(*parts):
+    return Element("svg", {"xmlns": "http://www.w3.org/2000/svg", "viewBox": "0 0 300 200"},
+                   [arrow_defs(), Fragment(*parts)])
+
+
+def codes(root):
+    return [f.code for f in geometry.validate(root) if f.severity == "error"]
+
+
+class ArrowTest(unittest.TestCase):
+
+    def test_arrow_from_own_vehicle_into_open_road(self):
+        front = 40 + SEDAN_W + 2
+        self.assertEqual(codes(scene(sedan(40, 90), traj_arrow(front, 100, front + 20, 100))), [])
+
+    def test_arrow_ending_inside_another_vehicle(self):
+        front = 40 + SEDAN_W + 2
+        root = scene(sedan(40, 90), sedan(front + 10, 90), traj_arrow(front, 100, front + 20, 100))
+        self.assertEqual(codes(root), ["arrow_into"])
+
+    def test_arrow_through_another_vehicle(self):
+        front = 40 + SEDAN_W + 2
+        root = scene(sedan(40, 90), sedan(front + 10, 90),
+                     traj_arrow(front, 100, front + SEDAN_W + 30, 100))
+        self.assertEqual(codes(root), ["arrow_through"])
+
+
+if __name__ == "__main__":
+    unittest.main()
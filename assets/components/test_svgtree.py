@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Checks svgtree.bbox() on <path> data beyond absolute M/L/Q/C.
+
+Usage:
+    python3 -m pytest assets/components/test_svgtree.py
+    python3 assets/components/test_svgtree.py
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components.svgtree import Element, bbox
+
+
+def path_box(d):
+    return bbox(Element("path", {"d": d}))
+
+
+class PathBoxTest(unittest.TestCase):
+
+    def test_relative_h_v(self):
+        # A rect merged by optimize.py: "M{x} {y}h{w}v{h}h{-w}z"
+        self.assertEqual(path_box("M10 20h30v5h-30z"), (10, 20, 40, 25))
+
+    def test_relative_curve(self):
+        self.assertEqual(path_box("m10 10 q5 10 10 0"), (10, 10, 20, 20))
+
+    def test_arc(self):
+        x0, y0, x1, y1 = path_box("M0 0 a10 10 0 0 1 20 0")
+        self.assertEqual((x0, x1, y1), (0, 20, 0))
+        self.assertAlmostEqual(y0, -10, delta=0.01)
+
+    def test_bad_path_has_no_box(self):
+        self.assertIsNone(path_box("10 10 L20 20"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Checks that themes.py keeps adjacent colors apart in themes that promise contrast.
+
+Usage:
+    python3 -m pytest assets/components/test_themes.py
+    python3 assets/components/test_themes.py
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components import themes
+
+
+class ContrastTest(unittest.TestCase):
+
+    def test_contrast_ratio(self):
+        self.assertAlmostEqual(themes.contrast_ratio("#000000", "#FFFFFF"), 21.0)
+        self.assertAlmostEqual(themes.contrast_ratio("#777777", "#777777"), 1.0)
+
+    def test_adjacent_pairs_meet_minimum(self):
+        for name in themes.MIN_CONTRAST:
+            with self.subTest(theme=name):
+                self.assertEqual(themes.low_contrast(name), [])
+
+    def test_markings_differ_from_grass(self):
+        # Stop lines and stop-sign borders must not vanish into the grass
+        self.assertEqual(themes.low_contrast("high_contrast", 1.5), [])
+        colors = themes.tokens("high_contrast")
+        self.assertNotIn(colors["COLOR_GRASS"], (colors["COLOR_WHITE"], colors["COLOR_CURB"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
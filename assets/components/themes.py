@@ -0,0 +1,203 @@
+"""Theme variants of every scene: alternative color token sets.
+
+style_tokens.py is the default (light) theme. Each entry of THEMES overrides
+some of its color tokens; tokens a theme does not name keep their default:
+
+    dark            dim grass and asphalt, lighter markings and vehicles
+    high_contrast   black road, dark green grass, white markings, light
+                    curbs, saturated signals; every pair of colors drawn
+                    edge to edge is at least MIN_CONTRAST apart
+    colorblind      Okabe-Ito palette: ego/danger/signals stay distinct
+                    under protanopia, deuteranopia and tritanopia
+
+render() builds each scene's structure once (templates.py marks every color
+token as a slot) and renders it per theme by substituting colors only, so
+scenes × themes costs one composition per scene plus string joins:
+
+    themed = render(scenes, ["dark", "colorblind"])
+    themed["dark"]["INTERSECTION_4WAY_STOP.svg"]    # SVG text
+
+low_contrast() lists a theme's ADJACENT token pairs below its minimum.
+
+write() puts each theme in its own directory and records every file in a
+combined manifest (themes-manifest.json) beside them.
+"""
+
+import json
+import os
+
+from . import style_tokens, templates, transform
+from .manifest import content_hash, write_atomic
+
+THEMES = {
+    "dark": {
+        "COLOR_GRASS":          "#2E3B2E",
+        "COLOR_ROAD":           "#1C1C1C",
+        "COLOR_YELLOW_LINE":    "#E6B800",
+        "COLOR_WHITE":          "#D9D9D9",
+        "COLOR_CURB":           "#5C5C5C",
+        "COLOR_VEHICLE_EGO":    "#5B8DEF",
+        "COLOR_VEHICLE_OTHER":  "#9E9E9E",
+        "COLOR_VEHICLE_DANGER": "#FF5252",
+        "COLOR_WHEELS":         "#0A0A0A",
+        "COLOR_STOP_SIGN":      "#D6373D",
+        "COLOR_SCHOOL_BUS":     "#E6A600",
+        "COLOR_CONE":           "#FF7A1F",
+        "COLOR_PEDESTRIAN":     "#FFD633",
+        "COLOR_WINDOW":         "#4F7C99",
+        "COLOR_BLUE_LIGHT":     "#4D7DFF",
+    },
+    "high_contrast": {
+        "COLOR_GRASS":          "#1A731A",
+        "COLOR_ROAD":           "#000000",
+        "COLOR_YELLOW_LINE":    "#FFE000",
+        "COLOR_WHITE":          "#FFFFFF",
+        "COLOR_CURB":           "#C8C8C8",
+        "COLOR_VEHICLE_EGO":    "#0050FF",
+        "COLOR_VEHICLE_OTHER":  "#707070",
+        "COLOR_VEHICLE_DANGER": "#FF0000",
+        "COLOR_STOP_SIGN":      "#E00000",
+        "COLOR_SCHOOL_BUS":     "#FFD000",
+        "COLOR_CONE":           "#FF6A00",
+        "COLOR_PEDESTRIAN":     "#FFE000",
+        "COLOR_WINDOW":         "#000000",
+    },
+    "colorblind": {
+        "COLOR_YELLOW_LINE":    "#F0E442",
+        "COLOR_VEHICLE_EGO":    "#0072B2",
+        "COLOR_VEHICLE_OTHER":  "#8C8C8C",
+        "COLOR_VEHICLE_DANGER": "#D55E00",
+        "COLOR_STOP_SIGN":      "#D55E00",
+        "COLOR_SCHOOL_BUS":     "#E69F00",
+        "COLOR_CONE":           "#E69F00",
+        "COLOR_PEDESTRIAN":     "#F0E442",
+        "COLOR_WINDOW":         "#56B4E9",
+        "COLOR_RED_LIGHT":      "#D55E00",
+        "COLOR_BLUE_LIGHT":     "#0072B2",
+    },
+}
+
+# Token pairs drawn edge to edge with no outline between them: markings and
+# stop-sign borders on road or grass, curbs, vehicle bodies on the road and on
+# crosswalk stripes, bus windows.
+ADJACENT = (
+    ("COLOR_ROAD", "COLOR_GRASS"),
+    ("COLOR_CURB", "COLOR_GRASS"),
+    ("COLOR_CURB", "COLOR_ROAD"),
+    ("COLOR_WHITE", "COLOR_ROAD"),
+    ("COLOR_WHITE", "COLOR_GRASS"),
+    ("COLOR_YELLOW_LINE", "COLOR_ROAD"),
+    ("COLOR_STOP_SIGN", "COLOR_WHITE"),
+    ("COLOR_VEHICLE_EGO", "COLOR_ROAD"),
+    ("COLOR_VEHICLE_EGO", "COLOR_WHITE"),
+    ("COLOR_VEHICLE_OTHER", "COLOR_ROAD"),
+    ("COLOR_VEHICLE_OTHER", "COLOR_WHITE"),
+    ("COLOR_VEHICLE_DANGER", "COLOR_ROAD"),
+    ("COLOR_VEHICLE_DANGER", "COLOR_WHITE"),
+    ("COLOR_SCHOOL_BUS", "COLOR_ROAD"),
+    ("COLOR_WINDOW", "COLOR_SCHOOL_BUS"),
+)
+# Themes that promise contrast → minimum WCAG ratio for every ADJACENT pair
+# (3.0 is WCAG 2.1 SC 1.4.11 non-text contrast, as in the image audit).
+MIN_CONTRAST = {"high_contrast": 3.0}
+
+MANIFEST_NAME = "themes-manifest.json"
+THEMES_MANIFEST_VERSION = 1
+
+
+def tokens(name):
+    """Full color token set of a theme: style_tokens colors with its overrides applied."""
+    try:
+        overrides = THEMES[name]
+    except KeyError:
+        raise ValueError(f"unknown theme {name!r} (expected one of {', '.join(THEMES)})") from None
+    colors = templates.slot_tokens()
+    unknown = sorted(set(overrides) - set(colors))
+    if unknown:
+        raise ValueError(f"theme {name!r} overrides unknown color tokens: {', '.join(unknown)}")
+    colors.update(overrides)
+    return colors
+
+
+def contrast_ratio(a, b):
+    """WCAG contrast ratio of two #RRGGBB colors (1 to 21)."""
+    def luminance(color):
+        c = [int(color[i:i + 2], 16) / 255 for i in (1, 3, 5)]
+        r, g, b = (v / 12.92 if v <= 0.03928 else ((v + 0.055) / 1.055) ** 2.4 for v in c)
+        return 0.2126 * r + 0.7152 * g + 0.0722 * b
+    lo, hi = sorted((luminance(a), luminance(b)))
+    return (hi + 0.05) / (lo + 0.05)
+
+
+def low_contrast(name, minimum=None):
+    """[(token, token, ratio)] of ADJACENT pairs below minimum (default: the
+    theme's MIN_CONTRAST; themes without one have nothing to report)."""
+    minimum = MIN_CONTRAST.get(name) if minimum is None else minimum
+    if minimum is None:
+        return []
+    colors = tokens(name)
+    ratios = ((a, b, contrast_ratio(colors[a], colors[b])) for a, b in ADJACENT)
+    return [(a, b, round(r, 2)) for a, b, r in ratios if r < minimum]
+
+
+def compile_all(scenes, variants=()):
+    """filename → Template for every scene (and transform.py variant), each composed once."""
+    out = {}
+    for filename, tree in templates.marked_trees(scenes).items():
+        out[filename] = templates.Template.from_tree(tree)
+        if variants:
+            for name, variant in transform.variants(tree, variants).items():
+                out[transform.variant_filename(filename, name)] = templates.Template.from_tree(variant)
+    return out
+
+
+def render(scenes, names=tuple(THEMES), variants=()):
+    """theme → {filename: SVG text} for every scene × theme."""
+    palettes = {name: tokens(name) for name in names}
+    compiled = compile_all(scenes, variants)
+    return {name: {filename: template.render(palette) for filename, template in compiled.items()}
+            for name, palette in palettes.items()}
+
+
+def write(themed, themes_dir):
+    """Write render() output to themes_dir/<theme>/ and the combined manifest.
+
+    Files whose bytes are already on disk are left alone. Returns
+    (written, unchanged) lists of "<theme>/<filename>" paths.
+    """
+    written, unchanged = [], []
+    files = {}
+    for name, svgs in themed.items():
+        theme_dir = os.path.join(themes_dir, name)
+        os.makedirs(theme_dir, exist_ok=True)
+        files[name] = {}
+        for filename, text in svgs.items():
+            data = text.encode()
+            sha = content_hash(data)
+            path = os.path.join(theme_dir, filename)
+            if _disk_hash(path) == sha:
+                unchanged.append(f"{name}/{filename}")
+            else:
+                write_atomic(path, data)
+                written.append(f"{name}/{filename}")
+            files[name][filename] = {"sha256": sha, "bytes": len(data)}
+    manifest = {
+        "version": THEMES_MANIFEST_VERSION,
+        "themes": {name: {"tokens": {k: v for k, v in tokens(name).items()
+                                     if v != getattr(style_tokens, k)},
+                          "files": files[name]}
+                   for name in themed},
+    }
+    data = (json.dumps(manifest, indent=2, sort_keys=True) + "\n").encode()
+    path = os.path.join(themes_dir, MANIFEST_NAME)
+    if _disk_hash(path) != content_hash(data):
+        write_atomic(path, data)
+    return written, unchanged
+
+
+def _disk_hash(path):
+    try:
+        with open(path, "rb") as f:
+            return content_hash(f.read())
+    except OSError:
+        return None
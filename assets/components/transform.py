@@ -0,0 +1,278 @@
+"""Orientation variants of scene trees by batched affine transforms.
+
+A scene is authored once, conventionally with the ego vehicle heading east
+("E"). variants() gathers every coordinate of the tree into one (n, 2)
+NumPy array, maps it through all requested variant matrices in a single
+vectorized pass, and scatters the results into new trees:
+
+    E  S  W  N          rotate the scene 0/90/180/270 degrees clockwise
+    LHT, S_LHT, ...     left-hand traffic: mirror left-right first, so
+                        every vehicle reverses heading while keeping its
+                        lane side (side-view parts such as bus wheels stay
+                        at the bottom)
+
+Geometry is baked into the attributes rather than wrapped in a transform,
+so rect stays rect (width/height swap on quarter turns) and strokes keep
+their width. Things that must stay upright are moved, not turned: <text>
+(its anchor follows the geometry, glyphs stay readable) and <g transform>
+icons such as stop signs and pedestrians (their box center follows the
+geometry). <defs> content (markers) is copied unchanged; orient="auto"
+markers follow the transformed paths.
+
+numpy is optional for the rest of the component library; variants() raises
+TransformError when it is missing.
+"""
+
+import re
+
+try:
+    import numpy as np
+except ImportError:  # optional: only variant generation needs it
+    np = None
+
+from .pathdata import PathError, parse as parse_path
+from .svgtree import NOT_RENDERED, Comment, Element, Fragment, bbox, local_points
+
+# Clockwise quarter turns per orientation (y points down, so +90° takes east to south).
+ORIENTATIONS = {"E": 0, "S": 1, "W": 2, "N": 3}
+VARIANTS = ("S", "W", "N", "LHT", "S_LHT", "W_LHT", "N_LHT")
+
+# Baseline → visual center of a line of text, as a fraction of font-size.
+_CAP_CENTER = 0.35
+_LEADING_TRANSLATE = re.compile(r"^\s*translate\(\s*([-+.\deE]+)[\s,]+([-+.\deE]+)\s*\)")
+
+
+class TransformError(RuntimeError):
+    pass
+
+
+def require():
+    """Raise TransformError unless numpy is importable."""
+    if np is None:
+        raise TransformError("orientation variants need numpy: pip install numpy")
+
+
+def linear(name):
+    """2x2 orthogonal matrix ((a, c), (b, d)) of a variant name like "S" or "N_LHT"."""
+    orient, _, hand = name.partition("_")
+    if orient == "LHT":
+        orient, hand = "E", "LHT"
+    if orient not in ORIENTATIONS or hand not in ("", "LHT"):
+        raise ValueError(f"unknown variant {name!r} (expected one of E, {', '.join(VARIANTS)})")
+    turns = ORIENTATIONS[orient]
+    cos, sin = ((1, 0), (0, 1), (-1, 0), (0, -1))[turns]
+    rot = ((cos, -sin), (sin, cos))
+    if hand:
+        return ((-rot[0][0], rot[0][1]), (-rot[1][0], rot[1][1]))   # rot · flip-x
+    return rot
+
+
+def matrix(name, viewbox):
+    """Affine (a, b, c, d, e, f) mapping viewbox (x, y, w, h) onto the variant's viewBox.
+
+    The variant keeps the viewBox origin; its size is (h, w) after a quarter turn.
+    """
+    (a, c), (b, d) = linear(name)
+    x, y, w, h = viewbox
+    corners = [(a * px + c * py, b * px + d * py)
+               for px, py in ((x, y), (x + w, y), (x, y + h), (x + w, y + h))]
+    return (a, b, c, d, x - min(p[0] for p in corners), y - min(p[1] for p in corners))
+
+
+def variant_filename(filename, name):
+    """INTERSECTION_4WAY_STOP.svg + "S_LHT" → INTERSECTION_4WAY_STOP_S_LHT.svg."""
+    stem, dot, ext = filename.rpartition(".")
+    return f"{stem}_{name}{dot}{ext}" if dot else f"{filename}_{name}"
+
+
+def variants(root, names=VARIANTS):
+    """Root <svg> Element → {name: transformed root}, all names in one pass."""
+    require()
+    vb = [float(v) for v in str(root.get("viewBox", "")).replace(",", " ").split()]
+    if len(vb) != 4:
+        raise TransformError("root <svg> needs a viewBox to derive variants")
+    points, slots = [], {}
+    _gather(root, points, slots)
+    mats = np.array([matrix(name, vb) for name in names], dtype=float)      # (k, 6)
+    coords = np.asarray(points, dtype=float).reshape(-1, 2)                  # (n, 2)
+    linear_parts = mats[:, :4].reshape(-1, 2, 2).transpose(0, 2, 1)         # (k, 2, 2)
+    mapped = np.einsum("kij,nj->kni", linear_parts, coords) + mats[:, None, 4:]
+    out = {}
+    for k, name in enumerate(names):
+        x, y, w, h = vb
+        if linear(name)[0][0] == 0:
+            w, h = h, w
+        out[name] = _Scatter(mapped[k].tolist(), slots, name).root(root, (x, y, w, h))
+    return out
+
+
+# ── Gather ──────────────────────────────────────────────────────────
+
+def _gather(node, points, slots):
+    """Append every coordinate under node to points; slots maps id(elem) → start index."""
+    if isinstance(node, Fragment):
+        for child in node.children:
+            _gather(child, points, slots)
+        return
+    if not isinstance(node, Element) or node.tag in NOT_RENDERED:
+        return
+    slots[id(node)] = len(points)
+    if "transform" in node.attrs:
+        box = bbox(node)
+        if box is None:
+            points.append((0.0, 0.0))
+        else:
+            points.append(((box[0] + box[2]) / 2, (box[1] + box[3]) / 2))
+        return      # upright icon: only its center moves
+    tag = node.tag
+    if tag == "text":
+        size = float(node.get("font-size", 16))
+        points.append((float(node.get("x", 0)), float(node.get("y", 0)) - size * _CAP_CENTER))
+    elif tag == "rect":
+        pts = local_points(node)
+        points.extend((pts[0], pts[3]))
+    elif tag in ("circle", "ellipse"):
+        points.append((float(node.get("cx", 0)), float(node.get("cy", 0))))
+    elif tag in ("line", "polyline", "polygon"):
+        points.extend(local_points(node))
+    elif tag == "path":
+        try:
+            segments = parse_path(node.get("d", ""))
+        except PathError:
+            segments = []
+        for cmd, args in segments:
+            points.extend(args[-1:] if cmd == "A" else args)
+    for child in node.children:
+        _gather(child, points, slots)
+
+
+# ── Scatter ─────────────────────────────────────────────────────────
+
+def _num(v):
+    v = round(v, 3)
+    return int(v) if v == int(v) else v
+
+
+class _Scatter:
+    """Rebuild a tree with one variant's coordinates (same traversal order as _gather)."""
+
+    def __init__(self, coords, slots, name):
+        lin = linear(name)
+        self.coords = coords
+        self.slots = slots
+        self.turns = ORIENTATIONS.get(name.partition("_")[0], 0)
+        self.quarter = lin[0][0] == 0           # width and height swap
+        self.flips_x = lin[0][0] < 0            # left/right swap: text anchors follow
+        self.mirrored = lin[0][0] * lin[1][1] - lin[0][1] * lin[1][0] < 0
+
+    def root(self, root, viewbox):
+        new = self.node(root)
+        new.set("viewBox", " ".join(str(_num(v)) for v in viewbox))
+        return new
+
+    def node(self, node):
+        if isinstance(node, Fragment):
+            out = Fragment(*(self.node(c) for c in node.children))
+            out.kind = node.kind
+            return out
+        if isinstance(node, Comment):
+            return Comment(node.text)
+        if id(node) not in self.slots:
+            return _copy(node)
+        out = Element(node.tag, node.attrs, (), node.text)
+        out.kind = node.kind
+        start = self.slots[id(node)]
+        if "transform" in node.attrs:
+            self.icon(node, out, start)
+            return out
+        self.shape(node, out, start)
+        out.children = [self.node(c) for c in node.children]
+        return out
+
+    def icon(self, node, out, start):
+        box = bbox(node)
+        cx, cy = self.coords[start]
+        dx, dy = (cx, cy) if box is None else (cx - (box[0] + box[2]) / 2,
+                                               cy - (box[1] + box[3]) / 2)
+        value = node.attrs["transform"]
+        m = _LEADING_TRANSLATE.match(value)
+        if m:
+            x, y = _num(float(m.group(1)) + dx), _num(float(m.group(2)) + dy)
+            out.set("transform", f"translate({x},{y})" + value[m.end():])
+        else:
+            out.set("transform", f"translate({_num(dx)},{_num(dy)}) {value}")
+        out.children = [_copy(c) for c in node.children]
+
+    def shape(self, node, out, start):
+        c = self.coords
+        tag = node.tag
+        if tag == "text":
+            size = float(node.get("font-size", 16))
+            x, y = c[start]
+            out.set("x", _num(x))
+            out.set("y", _num(y + size * _CAP_CENTER))
+            anchor = node.get("text-anchor")
+            if self.flips_x and anchor in ("start", "end"):
+                out.set("text-anchor", "end" if anchor == "start" else "start")
+        elif tag == "rect":
+            (x0, y0), (x1, y1) = c[start], c[start + 1]
+            for name, value in (("x", min(x0, x1)), ("y", min(y0, y1)),
+                                ("width", abs(x1 - x0)), ("height", abs(y1 - y0))):
+                out.set(name, _num(value))
+            if self.quarter and "rx" in node.attrs and "ry" in node.attrs:
+                out.set("rx", node.attrs["ry"])
+                out.set("ry", node.attrs["rx"])
+        elif tag in ("circle", "ellipse"):
+            out.set("cx", _num(c[start][0]))
+            out.set("cy", _num(c[start][1]))
+            if tag == "ellipse" and self.quarter:
+                out.set("rx", node.get("ry", 0))
+                out.set("ry", node.get("rx", 0))
+        elif tag == "line":
+            (x1, y1), (x2, y2) = c[start], c[start + 1]
+            for name, value in (("x1", x1), ("y1", y1), ("x2", x2), ("y2", y2)):
+                out.set(name, _num(value))
+        elif tag in ("polyline", "polygon"):
+            n = len(local_points(node))
+            out.set("points", " ".join(f"{_num(x)},{_num(y)}" for x, y in c[start:start + n]))
+        elif tag == "path":
+            out.set("d", self.path(node.get("d", ""), start))
+
+    def path(self, d, start):
+        try:
+            segments = parse_path(d)
+        except PathError:
+            return d
+        c = self.coords
+        i = start
+        parts = []
+        for cmd, args in segments:
+            if cmd == "Z":
+                parts.append("Z")
+                continue
+            if cmd == "A":
+                rx, ry, rotation, large, sweep, _ = args
+                if self.mirrored:
+                    rotation, sweep = -rotation, not sweep
+                rotation = (rotation + 90 * self.turns) % 360
+                x, y = c[i]
+                i += 1
+                parts.append(f"A {_num(rx)} {_num(ry)} {_num(rotation)} {int(large)} "
+                             f"{int(sweep)} {_num(x)},{_num(y)}")
+                continue
+            pts = c[i:i + len(args)]
+            i += len(args)
+            parts.append(cmd + " " + " ".join(f"{_num(x)},{_num(y)}" for x, y in pts))
+        return " ".join(parts)
+
+
+def _copy(node):
+    """Structural copy of an untransformed subtree (kinds included)."""
+    if isinstance(node, Comment):
+        return Comment(node.text)
+    if isinstance(node, Fragment):
+        out = Fragment(*(_copy(c) for c in node.children))
+    else:
+        out = Element(node.tag, node.attrs, [_copy(c) for c in node.children], node.text)
+    out.kind = node.kind
+    return out
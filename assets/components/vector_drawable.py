@@ -0,0 +1,477 @@
+"""Compile SVG scene trees to Android VectorDrawable XML.
+
+Supported: rect (incl. rounded), circle, ellipse, line, polyline, polygon and
+path shapes; <g> with translate/scale/rotate transforms (→ <group>); fill,
+stroke, opacity and the usual stroke attributes; clip-path referencing a
+<clipPath> of plain shapes; marker-end arrowheads with orient="auto", which
+are expanded in place since VectorDrawable has no markers.
+
+Anything that cannot be expressed is listed as an Issue instead of being lost
+silently: <text> (no text in VectorDrawable), dash patterns (drawn solid),
+gradients, skew transforms, group opacity (pushed down to the children,
+which differs where they overlap), and so on.
+
+    cd assets
+    python3 -m components.vector_drawable svg/*.svg -o /tmp/vector [--strict]
+"""
+
+import argparse
+import math
+import os
+import re
+import sys
+
+from .optimize import fmt_number
+from .pathdata import PathError, end_tangent, parse as parse_path
+from .svgtree import NOT_RENDERED, Element, Fragment, bbox, parse_transform
+
+ANDROID_NS = "http://schemas.android.com/apk/res/android"
+
+# Presentation attributes inherited by descendants (opacity is not: it is
+# applied per element/group and multiplied down explicitly).
+_INHERITED = ("fill", "fill-opacity", "fill-rule", "stroke", "stroke-width",
+              "stroke-opacity", "stroke-linecap", "stroke-linejoin", "stroke-miterlimit",
+              "stroke-dasharray", "visibility", "display")
+
+_NAMED_COLORS = {
+    "black": "#000000", "white": "#FFFFFF", "red": "#FF0000", "green": "#008000",
+    "blue": "#0000FF", "yellow": "#FFFF00", "orange": "#FFA500", "gray": "#808080",
+    "grey": "#808080", "transparent": None,
+}
+_URL = re.compile(r"url\(\s*#([^)\s]+)\s*\)")
+_NUM = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+
+class Issue:
+    """Something in the source SVG the VectorDrawable does not reproduce exactly."""
+
+    __slots__ = ("kind", "tag", "detail")
+
+    def __init__(self, kind, tag, detail):
+        self.kind = kind        # "dropped" or "approximated"
+        self.tag = tag
+        self.detail = detail
+
+    def to_dict(self):
+        return {"kind": self.kind, "tag": self.tag, "detail": self.detail}
+
+    def __str__(self):
+        return f"{self.kind} <{self.tag}>: {self.detail}"
+
+
+def resource_name(filename):
+    """Android resource name for an asset file: MUTCD_W1-1_CURVE_RIGHT.svg → mutcd_w1_1_curve_right."""
+    stem = re.sub(r"[^a-z0-9_]", "_", os.path.splitext(os.path.basename(filename))[0].lower())
+    return stem if stem[:1].isalpha() else "img_" + stem
+
+
+def vector_name(filename):
+    """Drawable file name for an SVG: INTERSECTION_4WAY_STOP.svg → intersection_4way_stop.xml."""
+    return resource_name(filename) + ".xml"
+
+
+def convert(root, width_dp=None, height_dp=None):
+    """Root <svg> Element → (VectorDrawable XML text, [Issue]).
+
+    The drawable's intrinsic size defaults to the viewBox size in dp.
+    """
+    conv = _Converter(root)
+    return conv.run(width_dp, height_dp), conv.issues
+
+
+class _Converter:
+    def __init__(self, root):
+        self.root = root
+        self.ids = {e.attrs["id"]: e for e in root.iter() if "id" in e.attrs}
+        self.issues = []
+        self.lines = []
+
+    def issue(self, kind, tag, detail):
+        self.issues.append(Issue(kind, tag, detail))
+
+    # ── Document ────────────────────────────────────────────────────
+
+    def run(self, width_dp, height_dp):
+        a = self.root.attrs
+        vb = [float(n) for n in _NUM.findall(str(a.get("viewBox", "")))]
+        if len(vb) != 4:
+            vb = [0.0, 0.0, _float(a.get("width"), 300.0), _float(a.get("height"), 150.0)]
+        min_x, min_y, vw, vh = vb
+        self.open("vector", {
+            "xmlns:android": ANDROID_NS,
+            "android:width": f"{fmt_number(width_dp or vw)}dp",
+            "android:height": f"{fmt_number(height_dp or vh)}dp",
+            "android:viewportWidth": fmt_number(vw),
+            "android:viewportHeight": fmt_number(vh),
+        }, 0)
+        depth = 1
+        if min_x or min_y:
+            self.open("group", {"android:translateX": fmt_number(-min_x),
+                                "android:translateY": fmt_number(-min_y)}, depth)
+            depth += 1
+        for child in self.root.children:
+            self.node(child, {}, 1.0, depth)
+        if min_x or min_y:
+            self.close("group", depth - 1)
+        self.close("vector", 0)
+        return "\n".join(self.lines) + "\n"
+
+    # ── Tree ────────────────────────────────────────────────────────
+
+    def node(self, node, inherited, opacity, depth):
+        if isinstance(node, Fragment):
+            for child in node.children:
+                self.node(child, inherited, opacity, depth)
+            return
+        if not isinstance(node, Element):
+            return  # comments
+        tag = node.tag
+        if tag in NOT_RENDERED:
+            return  # referenced content (markers, clip paths) is handled at the use site
+        attrs = {**inherited, **{k: v for k, v in node.attrs.items() if k in _INHERITED}}
+        if attrs.get("display") == "none":
+            return
+        own_opacity = _float(node.attrs.get("opacity"), 1.0)
+
+        group = {}
+        if "transform" in node.attrs:
+            group = self.transform_group(node)
+            if group is None:
+                return
+        clip = self.clip_path(node)
+
+        if tag in ("g", "svg", "a"):
+            children = node.children
+            if own_opacity != 1.0 and _drawn_count(node) > 1:
+                self.issue("approximated", tag, f"group opacity {fmt_number(own_opacity)} "
+                           "applied to each child (overlaps render darker)")
+        elif tag in ("rect", "circle", "ellipse", "line", "polyline", "polygon", "path"):
+            children = None
+        else:
+            self.unsupported(node)
+            return
+
+        wrapped = bool(group or clip)
+        if wrapped:
+            self.open("group", group, depth)
+            if clip:
+                self.empty("clip-path", {"android:pathData": clip}, depth + 1)
+            depth += 1
+        if children is None:
+            self.shape(node, attrs, opacity * own_opacity, depth)
+        else:
+            for child in children:
+                self.node(child, attrs, opacity * own_opacity, depth)
+        if wrapped:
+            self.close("group", depth - 1)
+
+    def unsupported(self, node):
+        if node.tag == "text":
+            text = node.text or "".join(c.text or "" for c in node.iter() if c is not node)
+            self.issue("dropped", "text", f'"{text.strip()}" (VectorDrawable has no text; '
+                       "bake it into a path)")
+        else:
+            self.issue("dropped", node.tag, "element not supported")
+
+    def transform_group(self, node):
+        """SVG transform → VectorDrawable group attributes, or None (+ issue) for skews."""
+        a, b, c, d, e, f = parse_transform(node.attrs["transform"])
+        # VectorDrawable applies scale, then rotation, then translation.
+        sx = math.hypot(a, b)
+        if sx == 0:
+            return None
+        theta = math.atan2(b, a)
+        sy = (a * d - b * c) / sx
+        if not (math.isclose(c, -sy * math.sin(theta), abs_tol=1e-9)
+                and math.isclose(d, sy * math.cos(theta), abs_tol=1e-9)):
+            self.issue("dropped", node.tag, f"skew transform {node.attrs['transform']!r}")
+            return None
+        group = {}
+        if theta:
+            group["android:rotation"] = _fmt(math.degrees(theta))
+        if sx != 1:
+            group["android:scaleX"] = _fmt(sx)
+        if sy != 1:
+            group["android:scaleY"] = _fmt(sy)
+        if e:
+            group["android:translateX"] = _fmt(e)
+        if f:
+            group["android:translateY"] = _fmt(f)
+        return group
+
+    def clip_path(self, node):
+        ref = node.attrs.get("clip-path")
+        if not ref:
+            return None
+        m = _URL.fullmatch(ref.strip())
+        target = self.ids.get(m.group(1)) if m else None
+        if target is None or target.tag != "clipPath":
+            self.issue("dropped", node.tag, f"clip-path {ref!r} does not resolve to a <clipPath>")
+            return None
+        parts = []
+        for shape in target.children:
+            if not isinstance(shape, Element):
+                continue
+            data = shape_path(shape)
+            if data is None or "transform" in shape.attrs:
+                self.issue("dropped", node.tag, f"clip-path #{m.group(1)} uses <{shape.tag}> "
+                           "that cannot be expressed")
+                return None
+            parts.append(data)
+        return "".join(parts) or None
+
+    # ── Shapes ──────────────────────────────────────────────────────
+
+    def shape(self, node, attrs, opacity, depth):
+        try:
+            data = shape_path(node)
+        except PathError as exc:
+            self.issue("dropped", node.tag, str(exc))
+            return
+        if data is None:
+            return  # zero-size shape: SVG renders nothing either
+        out = {}
+        fill = attrs.get("fill", "#000000")
+        if node.tag != "line" and fill != "none":
+            color = self.color(fill, node.tag, "fill")
+            if color:
+                out["android:fillColor"] = color
+                alpha = opacity * _float(attrs.get("fill-opacity"), 1.0)
+                if alpha != 1.0:
+                    out["android:fillAlpha"] = _fmt(alpha)
+                if attrs.get("fill-rule") == "evenodd":
+                    out["android:fillType"] = "evenOdd"
+        stroke = attrs.get("stroke", "none")
+        stroke_width = _float(attrs.get("stroke-width"), 1.0)
+        if stroke != "none" and stroke_width > 0:
+            color = self.color(stroke, node.tag, "stroke")
+            if color:
+                out["android:strokeColor"] = color
+                out["android:strokeWidth"] = _fmt(stroke_width)
+                alpha = opacity * _float(attrs.get("stroke-opacity"), 1.0)
+                if alpha != 1.0:
+                    out["android:strokeAlpha"] = _fmt(alpha)
+                cap = attrs.get("stroke-linecap")
+                if cap in ("round", "square"):
+                    out["android:strokeLineCap"] = cap
+                join = attrs.get("stroke-linejoin")
+                if join in ("round", "bevel"):
+                    out["android:strokeLineJoin"] = join
+                if "stroke-miterlimit" in attrs:
+                    out["android:strokeMiterLimit"] = _fmt(_float(attrs["stroke-miterlimit"], 4))
+                dash = attrs.get("stroke-dasharray")
+                if dash and dash != "none":
+                    self.issue("approximated", node.tag,
+                               f"stroke-dasharray {dash!r} drawn as a solid stroke")
+        if not out:
+            return
+        out["android:pathData"] = data
+        self.empty("path", out, depth)
+        for kind in ("marker-start", "marker-mid"):
+            if kind in node.attrs:
+                self.issue("dropped", node.tag, f"{kind} {node.attrs[kind]!r}")
+        if "marker-end" in node.attrs:
+            self.marker_end(node, stroke_width, opacity, depth)
+
+    def marker_end(self, node, stroke_width, opacity, depth):
+        ref = node.attrs["marker-end"]
+        m = _URL.fullmatch(ref.strip())
+        marker = self.ids.get(m.group(1)) if m else None
+        if marker is None or marker.tag != "marker":
+            self.issue("dropped", node.tag, f"marker-end {ref!r} does not resolve to a <marker>")
+            return
+        tangent = None
+        if node.tag == "path":
+            tangent = end_tangent(parse_path(node.attrs.get("d")))
+        elif node.tag == "line":
+            x1, y1, x2, y2 = (_float(node.attrs.get(k), 0.0) for k in ("x1", "y1", "x2", "y2"))
+            tangent = ((x2, y2), (x2 - x1, y2 - y1)) if (x1, y1) != (x2, y2) else None
+        orient = marker.attrs.get("orient", "0")
+        if tangent is None:
+            self.issue("dropped", node.tag, f"marker-end {ref!r}: end direction undefined")
+            return
+        (ex, ey), (dx, dy) = tangent
+        if orient in ("auto", "auto-start-reverse"):
+            angle = math.degrees(math.atan2(dy, dx))
+        else:
+            angle = _float(orient, 0.0)
+
+        mw = _float(marker.attrs.get("markerWidth"), 3.0)
+        mh = _float(marker.attrs.get("markerHeight"), 3.0)
+        scale_x = scale_y = 1.0 if marker.attrs.get("markerUnits") == "userSpaceOnUse" else stroke_width
+        vb = [float(n) for n in _NUM.findall(str(marker.attrs.get("viewBox", "")))]
+        if len(vb) == 4 and vb[2] > 0 and vb[3] > 0:
+            scale_x *= mw / vb[2]
+            scale_y *= mh / vb[3]
+            box = (vb[0], vb[1], vb[0] + vb[2], vb[1] + vb[3])
+        else:
+            box = (0.0, 0.0, mw, mh)
+        ref_x = _float(marker.attrs.get("refX"), 0.0)
+        ref_y = _float(marker.attrs.get("refY"), 0.0)
+        extent = bbox(Fragment(*marker.children))
+        if extent and (extent[0] < box[0] or extent[1] < box[1]
+                       or extent[2] > box[2] or extent[3] > box[3]):
+            self.issue("approximated", "marker", f"#{marker.attrs.get('id')} content overflows "
+                       "its viewport and is not clipped")
+
+        outer = {"android:translateX": _fmt(ex), "android:translateY": _fmt(ey)}
+        if angle:
+            outer["android:rotation"] = _fmt(angle)
+        inner = {"android:scaleX": _fmt(scale_x), "android:scaleY": _fmt(scale_y),
+                 "android:translateX": _fmt(-ref_x * scale_x),
+                 "android:translateY": _fmt(-ref_y * scale_y)}
+        self.open("group", outer, depth)
+        self.open("group", inner, depth + 1)
+        for child in marker.children:
+            self.node(child, {}, opacity, depth + 2)
+        self.close("group", depth + 1)
+        self.close("group", depth)
+
+    def color(self, value, tag, what):
+        value = str(value).strip()
+        if value.startswith("url("):
+            self.issue("dropped", tag, f"{what} {value!r} (paint servers are not converted)")
+            return None
+        if value in ("currentColor", "inherit"):
+            self.issue("approximated", tag, f"{what} {value!r} rendered black")
+            return "#000000"
+        hexa = _NAMED_COLORS.get(value.lower(), value)
+        if hexa is None:
+            return None
+        if re.fullmatch(r"#[0-9a-fA-F]{3}", hexa):
+            hexa = "#" + "".join(c * 2 for c in hexa[1:])
+        if not re.fullmatch(r"#[0-9a-fA-F]{6}", hexa):
+            self.issue("dropped", tag, f"{what} color {value!r} not understood")
+            return None
+        return hexa.upper()
+
+    # ── Output ──────────────────────────────────────────────────────
+
+    def open(self, tag, attrs, depth):
+        self._start(tag, attrs, depth, ">")
+
+    def empty(self, tag, attrs, depth):
+        self._start(tag, attrs, depth, "/>")
+
+    def close(self, tag, depth):
+        self.lines.append(f"{'    ' * depth}</{tag}>")
+
+    def _start(self, tag, attrs, depth, end):
+        pad = "    " * depth
+        items = [f'{name}="{_escape(value)}"' for name, value in attrs.items()]
+        if not items:
+            self.lines.append(f"{pad}<{tag}{end}")
+            return
+        if tag == "vector":  # xmlns on the opening line, like the hand-written drawables
+            self.lines.append(f"{pad}<{tag} {items.pop(0)}")
+        else:
+            self.lines.append(f"{pad}<{tag}")
+        self.lines.extend(f"{pad}    {item}" for item in items)
+        self.lines[-1] += end
+
+
+# ── Shape geometry ──────────────────────────────────────────────────
+
+def shape_path(elem):
+    """pathData string for a basic shape, or None if it has no area/length."""
+    a = elem.attrs
+    tag = elem.tag
+
+    def g(name):
+        return _float(a.get(name), 0.0)
+
+    if tag == "rect":
+        x, y, w, h = g("x"), g("y"), g("width"), g("height")
+        if w <= 0 or h <= 0:
+            return None
+        rx, ry = a.get("rx"), a.get("ry")
+        rx = _float(rx if rx is not None else ry, 0.0)
+        ry = _float(ry if ry is not None else a.get("rx"), 0.0)
+        rx, ry = min(rx, w / 2), min(ry, h / 2)
+        if rx <= 0 or ry <= 0:
+            return f"M{_p(x, y)}h{_fmt(w)}v{_fmt(h)}h{_fmt(-w)}z"
+        arc = f"a{_p(rx, ry)} 0 0 1 "
+        return (f"M{_p(x + rx, y)}h{_fmt(w - 2 * rx)}{arc}{_p(rx, ry)}"
+                f"v{_fmt(h - 2 * ry)}{arc}{_p(-rx, ry)}"
+                f"h{_fmt(-(w - 2 * rx))}{arc}{_p(-rx, -ry)}"
+                f"v{_fmt(-(h - 2 * ry))}{arc}{_p(rx, -ry)}z")
+    if tag in ("circle", "ellipse"):
+        cx, cy = g("cx"), g("cy")
+        if tag == "circle":
+            rx = ry = g("r")
+        else:
+            rx, ry = g("rx"), g("ry")
+        if rx <= 0 or ry <= 0:
+            return None
+        return (f"M{_p(cx - rx, cy)}a{_p(rx, ry)} 0 1 0 {_p(2 * rx, 0)}"
+                f"a{_p(rx, ry)} 0 1 0 {_p(-2 * rx, 0)}z")
+    if tag == "line":
+        return f"M{_p(g('x1'), g('y1'))}L{_p(g('x2'), g('y2'))}"
+    if tag in ("polygon", "polyline"):
+        nums = [float(n) for n in _NUM.findall(str(a.get("points", "")))]
+        pts = list(zip(nums[0::2], nums[1::2]))
+        if len(pts) < 2:
+            return None
+        data = "M" + "L".join(_p(x, y) for x, y in pts)
+        return data + "z" if tag == "polygon" else data
+    if tag == "path":
+        d = str(a.get("d", "")).strip()
+        if not d:
+            return None
+        parse_path(d)  # raises PathError on malformed data
+        return d
+    return None
+
+
+def _p(x, y):
+    return f"{_fmt(x)},{_fmt(y)}"
+
+
+def _fmt(v):
+    return fmt_number(round(v, 4))
+
+
+def _float(value, default):
+    if value is None:
+        return default
+    m = _NUM.match(str(value).strip())
+    return float(m.group()) if m else default
+
+
+def _escape(value):
+    return str(value).replace("&", "&amp;").replace("<", "&lt;").replace('"', "&quot;")
+
+
+def _drawn_count(node):
+    return sum(1 for e in node.iter() if e is not node and e.tag not in ("g", "a"))
+
+
+# ── CLI ─────────────────────────────────────────────────────────────
+
+def main(argv=None):
+    from .svgtree import parse
+
+    parser = argparse.ArgumentParser(description="Convert SVG files to Android VectorDrawable XML")
+    parser.add_argument("svgs", nargs="+", help="SVG files to convert")
+    parser.add_argument("-o", "--output-dir", required=True, help="directory for .xml drawables")
+    parser.add_argument("--strict", action="store_true",
+                        help="exit 1 if any file drops content (approximations are allowed)")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    dropped = 0
+    for path in args.svgs:
+        xml, issues = convert(parse(path))
+        out = os.path.join(args.output_dir, vector_name(path))
+        with open(out, "w") as f:
+            f.write(xml)
+        print(f"  {os.path.basename(path)} → {os.path.basename(out)} ({len(xml.encode())} bytes)")
+        for issue in issues:
+            print(f"    {issue}")
+        dropped += sum(1 for i in issues if i.kind == "dropped")
+    print(f"\nConverted {len(args.svgs)} files, {dropped} dropped elements/attributes")
+    return 1 if args.strict and dropped else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
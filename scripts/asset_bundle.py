@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Asset bundle packer/reader for the DMV quiz app.
+
+Packs every SVG referenced by the question packs (image.assetId) plus a
+matching assets_manifest.json into one binary file with a fixed-size, sorted
+index, so the app can open a single asset and seek to any entry instead of
+opening 100+ files through AssetManager. Assets no question references are
+left out (tree-shaken).
+
+Layout (little-endian):
+
+    header   24 bytes   magic "DMVASSET", version u16, flags u16,
+                        entry count u32, string table length u32, reserved u32
+    index    56 bytes   per entry, sorted by name (binary-searchable):
+                        name offset u32, name length u16, compression u8,
+                        reserved u8, data offset u64, stored length u32,
+                        raw length u32, sha256 of raw bytes (32)
+    strings             UTF-8 entry names, concatenated
+    data                entry payloads at their offsets (8-byte aligned)
+
+Entry names are assetIds, plus "assets_manifest.json" for the filtered
+manifest. Compression 0 = stored, 1 = zlib.
+
+Usage:
+    python3 scripts/asset_bundle.py build [-o OUT] [--compress auto|zlib|none]
+    python3 scripts/asset_bundle.py list BUNDLE
+    python3 scripts/asset_bundle.py extract BUNDLE ASSET_ID [-o FILE]
+    python3 scripts/asset_bundle.py verify BUNDLE
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent
+APP_ASSETS = REPO_ROOT / 'dmv-android' / 'app' / 'src' / 'main' / 'assets'
+DEFAULT_PACKS = APP_ASSETS / 'packs'
+DEFAULT_MANIFEST = APP_ASSETS / 'assets_manifest.json'
+DEFAULT_SVG_DIR = REPO_ROOT / 'assets' / 'svg'
+DEFAULT_OUTPUT = APP_ASSETS / 'assets.bundle'
+
+MAGIC = b'DMVASSET'
+VERSION = 1
+MANIFEST_ENTRY = 'assets_manifest.json'
+
+HEADER = struct.Struct('<8sHHIII')
+ENTRY = struct.Struct('<IHBBQII32s')
+ALIGN = 8
+
+STORED = 0
+ZLIB = 1
+# With --compress auto, keep zlib output only if it saves at least this much.
+AUTO_MIN_SAVING = 0.10
+
+
+class BundleError(Exception):
+    pass
+
+
+# ── Tree shaking ─────────────────────────────────────────────────────
+
+def iter_pack_files(paths):
+    """Expand pack files/directories into the JSON files they contain."""
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            yield from sorted(path.rglob('*.json'))
+        else:
+            yield path
+
+
+def referenced_asset_ids(pack_paths):
+    """assetId → number of questions referencing it, across all question packs."""
+    refs = {}
+    for pack in iter_pack_files(pack_paths):
+        with open(pack) as f:
+            data = json.load(f)
+        questions = data['questions'] if isinstance(data, dict) else data
+        for q in questions:
+            image = q.get('image')
+            if image and image.get('assetId'):
+                refs[image['assetId']] = refs.get(image['assetId'], 0) + 1
+    return refs
+
+
+def select_assets(manifest, refs, svg_dir):
+    """Split manifest entries into (kept, unreferenced ids, missing ids)."""
+    by_id = {entry['assetId']: entry for entry in manifest}
+    kept = []
+    missing = []
+    for asset_id in sorted(refs):
+        entry = by_id.get(asset_id)
+        if entry is None or not _asset_path(entry, svg_dir).exists():
+            missing.append(asset_id)
+        else:
+            kept.append(entry)
+    unreferenced = sorted(set(by_id) - set(refs))
+    return kept, unreferenced, missing
+
+
+def _asset_path(entry, svg_dir):
+    return Path(svg_dir) / Path(entry['file']).name
+
+
+# ── Writing ──────────────────────────────────────────────────────────
+
+def build_bundle(entries, output_path, compress='auto'):
+    """Write {name: raw bytes} as a bundle. Returns a list of per-entry stats dicts."""
+    names = sorted(entries, key=lambda n: n.encode('utf-8'))
+    strings = bytearray()
+    records = []
+    payloads = []
+    offset = _align(HEADER.size + ENTRY.size * len(names)
+                    + len(b''.join(n.encode('utf-8') for n in names)))
+    stats = []
+    for name in names:
+        raw = entries[name]
+        stored, method = _compress(raw, compress)
+        name_bytes = name.encode('utf-8')
+        records.append(ENTRY.pack(len(strings), len(name_bytes), method, 0, offset,
+                                  len(stored), len(raw), hashlib.sha256(raw).digest()))
+        strings += name_bytes
+        payloads.append((offset, stored))
+        stats.append({'name': name, 'raw': len(raw), 'stored': len(stored),
+                      'compression': 'zlib' if method == ZLIB else 'none'})
+        offset = _align(offset + len(stored))
+
+    out = bytearray(HEADER.pack(MAGIC, VERSION, 0, len(names), len(strings), 0))
+    for record in records:
+        out += record
+    out += strings
+    for data_offset, stored in payloads:
+        out += b'\0' * (data_offset - len(out))
+        out += stored
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output_path.with_name(f'{output_path.name}.{os.getpid()}.tmp')
+    tmp.write_bytes(bytes(out))
+    os.replace(tmp, output_path)
+    return stats
+
+
+def _compress(raw, mode):
+    if mode == 'none':
+        return raw, STORED
+    packed = zlib.compress(raw, 9)
+    if mode == 'zlib' or len(packed) <= len(raw) * (1 - AUTO_MIN_SAVING):
+        return packed, ZLIB
+    return raw, STORED
+
+
+def _align(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+# ── Reading ──────────────────────────────────────────────────────────
+
+class BundleEntry:
+    __slots__ = ('name', 'compression', 'offset', 'stored_length', 'raw_length', 'sha256')
+
+    def __init__(self, name, compression, offset, stored_length, raw_length, sha256):
+        self.name = name
+        self.compression = compression
+        self.offset = offset
+        self.stored_length = stored_length
+        self.raw_length = raw_length
+        self.sha256 = sha256
+
+
+class AssetBundle:
+    """Read-only, memory-mapped view of a bundle; lookups binary-search the index."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise BundleError(f'{path}: empty file')
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise BundleError(f'{path}: truncated header')
+        magic, version, _flags, self.count, strings_len, _ = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise BundleError(f'{path}: not an asset bundle')
+        if version != VERSION:
+            self.close()
+            raise BundleError(f'{path}: unsupported bundle version {version}')
+        self._strings = HEADER.size + ENTRY.size * self.count
+        if self._strings + strings_len > len(self._map):
+            self.close()
+            raise BundleError(f'{path}: truncated index')
+
+    def close(self):
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, name):
+        return self.find(name) is not None
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self._entry(i)
+
+    def names(self):
+        return [entry.name for entry in self]
+
+    def _name_bytes(self, i):
+        name_off, name_len = struct.unpack_from('<IH', self._map, HEADER.size + ENTRY.size * i)
+        start = self._strings + name_off
+        return self._map[start:start + name_len]
+
+    def _entry(self, i):
+        (name_off, name_len, method, _, offset, stored, raw,
+         sha) = ENTRY.unpack_from(self._map, HEADER.size + ENTRY.size * i)
+        start = self._strings + name_off
+        name = self._map[start:start + name_len].decode('utf-8')
+        return BundleEntry(name, method, offset, stored, raw, sha)
+
+    def find(self, name):
+        """Index entry for name, or None. O(log n) probes of the mapped index."""
+        key = name.encode('utf-8')
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            probe = self._name_bytes(mid)
+            if probe == key:
+                return self._entry(mid)
+            if probe < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def read(self, name, verify=False):
+        """Raw bytes of an entry (decompressed). Raises KeyError if absent."""
+        entry = self.find(name)
+        if entry is None:
+            raise KeyError(name)
+        return self._payload(entry, verify)
+
+    def _payload(self, entry, verify):
+        stored = self._map[entry.offset:entry.offset + entry.stored_length]
+        if len(stored) != entry.stored_length:
+            raise BundleError(f'{entry.name}: payload runs past end of bundle')
+        if entry.compression == ZLIB:
+            data = zlib.decompress(stored)
+        elif entry.compression == STORED:
+            data = stored
+        else:
+            raise BundleError(f'{entry.name}: unknown compression {entry.compression}')
+        if verify and (len(data) != entry.raw_length
+                       or hashlib.sha256(data).digest() != entry.sha256):
+            raise BundleError(f'{entry.name}: content hash mismatch')
+        return data
+
+    def manifest(self):
+        return json.loads(self.read(MANIFEST_ENTRY))
+
+    def verify(self):
+        """Check every entry's length and hash; returns the names that fail."""
+        bad = []
+        for entry in self:
+            try:
+                self._payload(entry, verify=True)
+            except (BundleError, zlib.error):
+                bad.append(entry.name)
+        return bad
+
+
+# ── CLI ──────────────────────────────────────────────────────────────
+
+def cmd_build(args):
+    with open(args.manifest) as f:
+        manifest = json.load(f)
+    refs = referenced_asset_ids(args.packs)
+    kept, unreferenced, missing = select_assets(manifest, refs, args.svg_dir)
+
+    print(f"Found {len(refs)} referenced assets in {sum(refs.values())} questions "
+          f"({len(manifest)} in manifest)")
+    if unreferenced:
+        print(f"Tree-shaken {len(unreferenced)} unreferenced assets: {', '.join(unreferenced)}")
+    if missing:
+        print(f"ERROR: {len(missing)} referenced assets have no manifest entry or file: "
+              f"{', '.join(missing)}")
+        if not args.allow_missing:
+            return 1
+
+    entries = {e['assetId']: _asset_path(e, args.svg_dir).read_bytes() for e in kept}
+    entries[MANIFEST_ENTRY] = (json.dumps(kept, indent=2) + '\n').encode('utf-8')
+    stats = build_bundle(entries, args.output, args.compress)
+
+    raw = sum(s['raw'] for s in stats)
+    stored = sum(s['stored'] for s in stats)
+    compressed = sum(1 for s in stats if s['compression'] == 'zlib')
+    size = Path(args.output).stat().st_size
+    print(f"Wrote {args.output}: {len(stats)} entries ({compressed} zlib), "
+          f"{raw / 1024:.1f} KiB raw → {stored / 1024:.1f} KiB stored, {size / 1024:.1f} KiB file")
+    return 0
+
+
+def cmd_list(args):
+    with AssetBundle(args.bundle) as bundle:
+        for entry in bundle:
+            method = 'zlib' if entry.compression == ZLIB else 'none'
+            print(f"{entry.name:<48} {entry.raw_length:>7} {entry.stored_length:>7} {method:<4} "
+                  f"{entry.sha256.hex()[:12]}")
+        print(f"\n{len(bundle)} entries")
+    return 0
+
+
+def cmd_extract(args):
+    with AssetBundle(args.bundle) as bundle:
+        try:
+            data = bundle.read(args.asset_id, verify=True)
+        except KeyError:
+            print(f"ERROR: {args.asset_id} not in {args.bundle}", file=sys.stderr)
+            return 1
+    if args.output:
+        Path(args.output).write_bytes(data)
+    else:
+        sys.stdout.buffer.write(data)
+    return 0
+
+
+def cmd_verify(args):
+    with AssetBundle(args.bundle) as bundle:
+        bad = bundle.verify()
+        manifest_ids = {e['assetId'] for e in bundle.manifest()}
+        stray = sorted(set(bundle.names()) - manifest_ids - {MANIFEST_ENTRY})
+        absent = sorted(manifest_ids - set(bundle.names()))
+    for name in bad:
+        print(f"CORRUPT: {name}")
+    for name in stray:
+        print(f"NOT IN MANIFEST: {name}")
+    for name in absent:
+        print(f"MISSING PAYLOAD: {name}")
+    if bad or stray or absent:
+        return 1
+    print(f"OK: {args.bundle}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Pack and inspect single-file asset bundles')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('build', help='bundle every referenced SVG plus a filtered manifest')
+    p.add_argument('--packs', nargs='+', default=[DEFAULT_PACKS],
+                   help='question pack files or directories (default: app packs/)')
+    p.add_argument('--manifest', default=DEFAULT_MANIFEST, help='assets_manifest.json to filter')
+    p.add_argument('--svg-dir', default=DEFAULT_SVG_DIR, help='directory holding the SVG files')
+    p.add_argument('-o', '--output', default=DEFAULT_OUTPUT, help='bundle to write')
+    p.add_argument('--compress', choices=('auto', 'zlib', 'none'), default='auto',
+                   help='per-entry compression (auto: zlib when it saves >=10%%)')
+    p.add_argument('--allow-missing', action='store_true',
+                   help='build even if referenced assets are missing')
+    p.set_defaults(func=cmd_build)
+
+    p = sub.add_parser('list', help='print the index')
+    p.add_argument('bundle')
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser('extract', help='write one entry to a file or stdout')
+    p.add_argument('bundle')
+    p.add_argument('asset_id')
+    p.add_argument('-o', '--output')
+    p.set_defaults(func=cmd_extract)
+
+    p = sub.add_parser('verify', help='check hashes and manifest consistency')
+    p.add_argument('bundle')
+    p.set_defaults(func=cmd_verify)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
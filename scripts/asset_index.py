@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Asset usage reverse index across every question pack and asset manifest.
+
+The questions exist in several copies (data/tx/tx_v1.json, the per-topic
+files in data/tx/topics/ and app/src/main/assets/questions/, and the app
+pack in dmv-android/.../packs/TX/). One pass over all of them builds an
+assetId → question-id index and cross-checks the copies:
+
+    orphans    SVG files no question in any copy references
+    missing    assetIds referenced by a question or listed in a manifest
+               but with no SVG file
+    drift      a question whose assetId differs between copies, a question
+               absent from some copies, or an asset absent from some manifests
+
+Each --packs argument (a file or a directory of JSON files) is one copy.
+The index is saved as JSON (assets/asset-usage-index.json by default; a
+build output, gitignored) with the SHA-256 of every source file, so other
+tools can load_index() it and ask stale_sources() whether it still matches
+the packs instead of rescanning them.
+
+Usage:
+    python3 scripts/asset_index.py [--packs PATH ...] [--manifests PATH ...]
+                                   [--svg-dir DIR] [-o OUT] [--check]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+from asset_bundle import iter_pack_files
+
+REPO_ROOT = Path(__file__).parent.parent
+DEFAULT_PACKS = [
+    REPO_ROOT / 'data' / 'tx' / 'tx_v1.json',
+    REPO_ROOT / 'data' / 'tx' / 'topics',
+    REPO_ROOT / 'app' / 'src' / 'main' / 'assets' / 'questions',
+    REPO_ROOT / 'dmv-android' / 'app' / 'src' / 'main' / 'assets' / 'packs',
+]
+DEFAULT_MANIFESTS = [
+    REPO_ROOT / 'assets' / 'manifest.json',
+    REPO_ROOT / 'app' / 'src' / 'main' / 'assets' / 'assets_manifest.json',
+    REPO_ROOT / 'dmv-android' / 'app' / 'src' / 'main' / 'assets' / 'assets_manifest.json',
+]
+DEFAULT_SVG_DIR = REPO_ROOT / 'assets' / 'svg'
+DEFAULT_OUTPUT = REPO_ROOT / 'assets' / 'asset-usage-index.json'
+
+INDEX_VERSION = 1
+
+
+def _rel(path):
+    """path relative to the repo root when inside it, so the index is portable."""
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(REPO_ROOT.resolve()).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def _sha256(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+# ── Building ─────────────────────────────────────────────────────────
+
+def scan_copy(path):
+    """({question id: (topic, assetId or None)}, {file: sha256}) for one copy of the packs."""
+    questions, files = {}, {}
+    for pack in iter_pack_files([path]):
+        data = pack.read_bytes()
+        files[_rel(pack)] = hashlib.sha256(data).hexdigest()
+        parsed = json.loads(data)
+        for q in parsed['questions'] if isinstance(parsed, dict) else parsed:
+            questions[q['id']] = (q.get('topic'), (q.get('image') or {}).get('assetId'))
+    return questions, files
+
+
+def list_svgs(svg_dirs):
+    """{assetId: path} of every SVG in svg_dirs, sorted; the first directory with a file wins."""
+    found = {}
+    for svg_dir in reversed([Path(d) for d in svg_dirs]):
+        found.update((p.stem, p) for p in svg_dir.glob('*.svg'))
+    return dict(sorted(found.items()))
+
+
+def build_index(pack_paths=DEFAULT_PACKS, manifest_paths=DEFAULT_MANIFESTS, svg_dirs=(DEFAULT_SVG_DIR,)):
+    """Scan every copy of the packs and every manifest into an index dict (see save_index)."""
+    copies = {}
+    scanned = []
+    for path in pack_paths:
+        questions, files = scan_copy(path)
+        copies[_rel(path)] = {'questions': len(questions), 'files': files}
+        scanned.append((_rel(path), questions))
+
+    manifests = {}
+    listed = {}
+    for path in manifest_paths:
+        with open(path) as f:
+            entries = json.load(f)
+        manifests[_rel(path)] = _sha256(path)
+        listed[_rel(path)] = {e['assetId'] for e in entries}
+
+    svgs = list_svgs(svg_dirs)
+    drift = []
+
+    # Canonical question → (topic, assetId) is the first copy that has it
+    questions = {}
+    for name, copy in scanned:
+        for qid, value in copy.items():
+            questions.setdefault(qid, value)
+    for qid in sorted(questions):
+        present = {name: copy[qid][1] for name, copy in scanned if qid in copy}
+        if len(set(present.values())) > 1:
+            drift.append({'kind': 'assetId', 'id': qid, 'copies': present})
+        if len(present) < len(scanned):
+            drift.append({'kind': 'question', 'id': qid,
+                          'missing_from': [name for name, _ in scanned if name not in present]})
+
+    # Reverse index over every copy, so drifted references are not lost
+    usage = {}
+    for name, copy in scanned:
+        for qid, (_, asset_id) in copy.items():
+            if asset_id:
+                usage.setdefault(asset_id, set()).add(qid)
+
+    all_listed = set().union(*listed.values()) if listed else set()
+    for asset_id in sorted(all_listed):
+        absent = [name for name, ids in listed.items() if asset_id not in ids]
+        if absent:
+            drift.append({'kind': 'manifest', 'id': asset_id, 'missing_from': absent})
+
+    asset_ids = sorted(usage.keys() | svgs.keys() | all_listed)
+    return {
+        'version': INDEX_VERSION,
+        'copies': copies,
+        'manifests': manifests,
+        'questions': {qid: {'topic': t, 'assetId': a} for qid, (t, a) in sorted(questions.items())},
+        'assets': {a: {'questions': sorted(usage.get(a, ())),
+                       'svg': _rel(svgs[a]) if a in svgs else None,
+                       'manifests': [name for name, ids in listed.items() if a in ids]}
+                   for a in asset_ids},
+        'orphans': sorted(svgs.keys() - usage.keys()),
+        'missing': sorted((usage.keys() | all_listed) - svgs.keys()),
+        'drift': drift,
+    }
+
+
+# ── Artifact ─────────────────────────────────────────────────────────
+
+def save_index(index, path=DEFAULT_OUTPUT):
+    """Write the index as JSON via a temp file + rename."""
+    path = Path(path)
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    tmp.write_text(json.dumps(index, indent=1, sort_keys=True) + '\n')
+    os.replace(tmp, path)
+
+
+def load_index(path=DEFAULT_OUTPUT):
+    """A saved index, or None if it is missing or from another INDEX_VERSION."""
+    try:
+        with open(path) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return index if index.get('version') == INDEX_VERSION else None
+
+
+def stale_sources(index):
+    """Pack and manifest files whose content changed (or vanished) since the index was built.
+
+    New pack files added to a copy's directory are not detected; rebuild
+    after adding packs.
+    """
+    recorded = dict(index['manifests'])
+    for copy in index['copies'].values():
+        recorded.update(copy['files'])
+    stale = []
+    for name, digest in sorted(recorded.items()):
+        path = REPO_ROOT / name
+        if not path.exists() or _sha256(path) != digest:
+            stale.append(name)
+    return stale
+
+
+def asset_usage(index):
+    """{assetId: [{'question_id', 'topic'}, ...]} from an index, as the audit consumes it."""
+    topics = index['questions']
+    return {a: [{'question_id': q, 'topic': topics[q]['topic']} for q in entry['questions']]
+            for a, entry in index['assets'].items() if entry['questions']}
+
+
+# ── CLI ──────────────────────────────────────────────────────────────
+
+def print_report(index):
+    used = sum(1 for a in index['assets'].values() if a['questions'])
+    with_images = sum(1 for q in index['questions'].values() if q['assetId'])
+    print(f"{len(index['copies'])} pack copies, {len(index['manifests'])} manifests: "
+          f"{len(index['questions'])} questions ({with_images} with images), "
+          f"{used} assets referenced, {len(index['assets'])} known")
+    if index['orphans']:
+        print(f"ORPHANS ({len(index['orphans'])}, no question references them): "
+              f"{', '.join(index['orphans'])}")
+    if index['missing']:
+        print(f"MISSING ({len(index['missing'])}, no SVG file): {', '.join(index['missing'])}")
+    for d in index['drift']:
+        if d['kind'] == 'assetId':
+            values = ', '.join(f"{name}={a}" for name, a in d['copies'].items())
+            print(f"DRIFT: {d['id']} has different assetIds: {values}")
+        else:
+            print(f"DRIFT: {d['kind']} {d['id']} missing from {', '.join(d['missing_from'])}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build the assetId → question reverse index')
+    parser.add_argument('--packs', nargs='+', default=DEFAULT_PACKS,
+                        help='question pack copies, each a file or directory (default: all four copies)')
+    parser.add_argument('--manifests', nargs='+', default=DEFAULT_MANIFESTS,
+                        help='asset manifests to cross-check (default: all three)')
+    parser.add_argument('--svg-dir', action='append',
+                        help='directory of <assetId>.svg files; repeatable (default: assets/svg)')
+    parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT,
+                        help='index to write (default: assets/asset-usage-index.json)')
+    parser.add_argument('--check', action='store_true',
+                        help='exit with status 1 if any asset is missing or the copies drift')
+    args = parser.parse_args(argv)
+
+    index = build_index(args.packs, args.manifests, args.svg_dir or [DEFAULT_SVG_DIR])
+    print_report(index)
+    save_index(index, args.output)
+    print(f"Wrote {args.output}")
+    return 1 if args.check and (index['missing'] or index['drift']) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
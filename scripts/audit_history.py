@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Audit history store for scripts/audit_image_quality.py.
+
+Every audit run is recorded in a local SQLite database (.audit-history.db in
+the repo root by default; machine-local, not committed): one row per run with
+its date, rubric version, analysis mode (vector, or raster plus a key of the
+renderer and perceptual hash), the packs audited, git commit, optional label
+and severity totals, and one row per asset with its SVG content hash, the
+four scores, severity and min_stroke_dp/min_font_dp. Results are keyed by (run, asset) with a second
+index on (asset, run), so comparing two runs or following one asset over
+time are index range scans, not table scans, however many runs accumulate.
+
+A RUN argument is, in the order tried: #ID (a run id, never a label), a
+label (the latest run with it, so PR numbers work as labels), a run id, a
+negative offset from the latest run (-1 is the latest, -2 the one before),
+or a git commit prefix (the latest run matching it).
+
+Usage:
+    python3 scripts/audit_history.py runs [--limit N]
+    python3 scripts/audit_history.py trend [--severity P0]
+    python3 scripts/audit_history.py regressions --since RUN [--until RUN]
+    python3 scripts/audit_history.py diff BASE [HEAD]
+    python3 scripts/audit_history.py asset ASSET_ID
+"""
+
+import argparse
+import sqlite3
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent
+DEFAULT_DB = REPO_ROOT / '.audit-history.db'
+
+SCHEMA_VERSION = 2
+SEVERITIES = ('P0', 'P1', 'P2', 'PASS')
+SCORES = ('readability', 'semantic_clarity', 'contrast', 'consistency')
+
+SCHEMA = """
+CREATE TABLE runs (
+    id INTEGER PRIMARY KEY,
+    recorded TEXT NOT NULL,
+    date TEXT NOT NULL,
+    rubric INTEGER NOT NULL,
+    mode TEXT,
+    packs TEXT,
+    git_commit TEXT,
+    label TEXT,
+    assets INTEGER NOT NULL,
+    p0 INTEGER NOT NULL,
+    p1 INTEGER NOT NULL,
+    p2 INTEGER NOT NULL,
+    pass INTEGER NOT NULL
+);
+CREATE INDEX runs_label ON runs (label);
+CREATE INDEX runs_git_commit ON runs (git_commit);
+
+CREATE TABLE results (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    asset_id TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    severity INTEGER NOT NULL,
+    readability INTEGER NOT NULL,
+    semantic_clarity INTEGER NOT NULL,
+    contrast INTEGER NOT NULL,
+    consistency INTEGER NOT NULL,
+    min_stroke_dp REAL,
+    min_font_dp REAL,
+    PRIMARY KEY (run_id, asset_id)
+) WITHOUT ROWID;
+CREATE INDEX results_asset ON results (asset_id, run_id);
+"""
+
+# Schema upgrades, applied in order from the stored user_version. Runs recorded
+# before version 2 have no mode or packs (NULL: unknown).
+MIGRATIONS = {
+    1: 'ALTER TABLE runs ADD COLUMN mode TEXT; ALTER TABLE runs ADD COLUMN packs TEXT;',
+}
+
+# A result regressed when its severity got worse or any score dropped.
+REGRESSED = ' OR '.join(['h.severity < b.severity'] + [f'h.{s} < b.{s}' for s in SCORES])
+
+
+class HistoryError(Exception):
+    pass
+
+
+# ── Store ────────────────────────────────────────────────────────────
+
+def open_db(path=DEFAULT_DB):
+    """Connection to the history database at path, created on first use."""
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA foreign_keys = ON')
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    if version == 0:
+        with conn:
+            conn.executescript(SCHEMA)
+            conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+    elif version in MIGRATIONS:
+        with conn:
+            while version < SCHEMA_VERSION:
+                conn.executescript(MIGRATIONS[version])
+                version += 1
+            conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+    elif version != SCHEMA_VERSION:
+        conn.close()
+        raise HistoryError(f"{path}: schema version {version}, expected {SCHEMA_VERSION}")
+    return conn
+
+
+def git_commit(cwd=REPO_ROOT):
+    """HEAD commit of the repo at cwd, or None outside a git checkout."""
+    try:
+        proc = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=cwd, capture_output=True, text=True)
+    except OSError:
+        return None
+    return proc.stdout.strip() if proc.returncode == 0 else None
+
+
+def record_run(conn, rows, hashes, rubric, date, label=None, commit=None, mode=None, packs=None):
+    """Store one audit run and return its id.
+
+    rows are asset-table rows (audit_image_quality.asset_row()) and hashes
+    maps asset_id → SVG content hash. mode names the analysis ('vector', or
+    'raster-' and a renderer and hash key) and packs the question packs audited.
+    """
+    rank = {s: i for i, s in enumerate(SEVERITIES)}
+    results = [(r['asset_id'], hashes[r['asset_id']], rank[r['severity']],
+                int(r['readability_score']), int(r['semantic_clarity_score']),
+                int(r['contrast_score']), int(r['consistency_score']),
+                r['min_stroke_dp'], r['min_font_dp']) for r in rows]
+    counts = [sum(1 for r in results if r[2] == i) for i in range(len(SEVERITIES))]
+    with conn:
+        run_id = conn.execute(
+            'INSERT INTO runs (recorded, date, rubric, mode, packs, git_commit, label, '
+            'assets, p0, p1, p2, pass) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (time.strftime('%Y-%m-%dT%H:%M:%S'), str(date), rubric, mode, packs, commit, label,
+             len(results), *counts)).lastrowid
+        conn.executemany('INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                         [(run_id, *r) for r in results])
+    return run_id
+
+
+def resolve_run(conn, ref):
+    """Run id for a RUN argument (#id, label, id, negative offset or git commit prefix)."""
+    ref = str(ref)
+    if ref.startswith('#') and ref[1:].isdigit():
+        row = conn.execute('SELECT id FROM runs WHERE id = ?', (int(ref[1:]),)).fetchone()
+    else:
+        row = conn.execute('SELECT id FROM runs WHERE label = ? ORDER BY id DESC LIMIT 1',
+                           (ref,)).fetchone()
+    if row is None and not ref.startswith('#'):
+        try:
+            n = int(ref)
+        except ValueError:
+            row = conn.execute('SELECT id FROM runs WHERE git_commit LIKE ? ORDER BY id DESC LIMIT 1',
+                               (ref.replace('%', '') + '%',)).fetchone()
+        else:
+            if n >= 0:
+                row = conn.execute('SELECT id FROM runs WHERE id = ?', (n,)).fetchone()
+            else:
+                row = conn.execute('SELECT id FROM runs ORDER BY id DESC LIMIT 1 OFFSET ?',
+                                   (-n - 1,)).fetchone()
+    if row is None:
+        raise HistoryError(f"no run matches {ref!r}")
+    return row[0]
+
+
+def previous_run(conn, run_id):
+    """Latest run before run_id with the same rubric and mode, or None.
+
+    Only such runs are comparable: a raster run scores contrast on renders,
+    so comparing it with a vector run reports every contrast change.
+    """
+    row = conn.execute('SELECT p.id FROM runs p JOIN runs r ON r.id = ? '
+                       'WHERE p.id < r.id AND p.rubric = r.rubric AND p.mode IS r.mode '
+                       'ORDER BY p.id DESC LIMIT 1', (run_id,)).fetchone()
+    return row[0] if row else None
+
+
+def runs(conn, limit=None):
+    """(id, recorded, date, rubric, mode, git_commit, label, assets, p0, p1, p2, pass), newest first."""
+    return conn.execute('SELECT id, recorded, date, rubric, mode, git_commit, label, assets, p0, p1, p2, pass '
+                        'FROM runs ORDER BY id DESC LIMIT ?', (-1 if limit is None else limit,)).fetchall()
+
+
+def severity_trend(conn, severity='P0'):
+    """[(run id, date, count of severity)] oldest first."""
+    if severity not in SEVERITIES:
+        raise HistoryError(f"unknown severity {severity!r} (expected one of {', '.join(SEVERITIES)})")
+    return conn.execute(f'SELECT id, date, {severity.lower()} FROM runs ORDER BY id').fetchall()
+
+
+def _compare(conn, base, head, where):
+    """Per-asset (asset_id, base severity, head severity, score deltas..., content changed)."""
+    deltas = ', '.join(f'h.{s} - b.{s}' for s in SCORES)
+    rows = conn.execute(
+        f'SELECT h.asset_id, b.severity, h.severity, {deltas}, h.content_hash != b.content_hash '
+        f'FROM results h JOIN results b ON b.run_id = ? AND b.asset_id = h.asset_id '
+        f'WHERE h.run_id = ? AND ({where}) ORDER BY h.asset_id', (base, head)).fetchall()
+    return [(r[0], SEVERITIES[r[1]], SEVERITIES[r[2]], *r[3:-1], bool(r[-1])) for r in rows]
+
+
+def regressions(conn, since, until):
+    """Assets whose severity got worse or any score dropped between two runs."""
+    return _compare(conn, since, until, REGRESSED)
+
+
+def score_deltas(conn, base, head):
+    """(changed, added, removed) between two runs.
+
+    changed has the assets whose SVG, severity or any score differs; added
+    and removed are the asset ids only one of the runs has.
+    """
+    changed = ' OR '.join(['h.content_hash != b.content_hash', 'h.severity != b.severity']
+                          + [f'h.{s} != b.{s}' for s in SCORES])
+    only = ('SELECT asset_id FROM results WHERE run_id = ? EXCEPT '
+            'SELECT asset_id FROM results WHERE run_id = ? ORDER BY asset_id')
+    added = [r[0] for r in conn.execute(only, (head, base))]
+    removed = [r[0] for r in conn.execute(only, (base, head))]
+    return _compare(conn, base, head, changed), added, removed
+
+
+def asset_history(conn, asset_id):
+    """[(run id, date, content hash, severity, scores..., min_stroke_dp, min_font_dp)] oldest first."""
+    rows = conn.execute(
+        f'SELECT r.run_id, runs.date, r.content_hash, r.severity, {", ".join("r." + s for s in SCORES)}, '
+        f'r.min_stroke_dp, r.min_font_dp FROM results r JOIN runs ON runs.id = r.run_id '
+        f'WHERE r.asset_id = ? ORDER BY r.run_id', (asset_id,)).fetchall()
+    return [(*r[:3], SEVERITIES[r[3]], *r[4:]) for r in rows]
+
+
+# ── CLI ──────────────────────────────────────────────────────────────
+
+def _run_notes(conn, base, head):
+    """Warn when two runs differ in rubric, analysis mode or packs."""
+    (r1, m1, p1), (r2, m2, p2) = (conn.execute('SELECT rubric, mode, packs FROM runs WHERE id = ?',
+                                               (i,)).fetchone() for i in (base, head))
+    if r1 != r2:
+        print(f"NOTE: run {base} used rubric v{r1} and run {head} rubric v{r2}; "
+              f"score changes may come from the rubric, not the assets")
+    if m1 != m2:
+        print(f"WARNING: run {base} was a {m1 or 'unknown'} audit and run {head} {m2 or 'unknown'}; "
+              f"contrast and width scores are not comparable across modes")
+    if p1 != p2:
+        print(f"NOTE: run {base} audited {p1 or 'unknown packs'} and run {head} {p2 or 'unknown packs'}")
+
+
+def _print_changes(rows):
+    for asset_id, before, after, *deltas, content in rows:
+        scores = ' '.join(f"{name[:4]} {d:+d}" for name, d in zip(SCORES, deltas) if d)
+        edited = '  (SVG changed)' if content else ''
+        print(f"  {asset_id:<40} {before:>4} → {after:<4}  {scores}{edited}")
+
+
+def cmd_runs(conn, args):
+    print(f"{'run':>5}  {'recorded':<19}  {'date':<10}  rubric  {'mode':<23}  {'commit':<10}  "
+          f"{'label':<12}  assets    P0    P1    P2  PASS")
+    for run_id, recorded, date, rubric, mode, commit, label, *counts in runs(conn, args.limit):
+        print(f"{run_id:>5}  {recorded:<19}  {date:<10}  {rubric:>6}  {(mode or '?')[:23]:<23}  "
+              f"{(commit or '')[:10]:<10}  {label or '':<12}  " + '  '.join(f"{n:>4}" for n in counts))
+    return 0
+
+
+def cmd_trend(conn, args):
+    for run_id, date, count in severity_trend(conn, args.severity):
+        print(f"  run {run_id:>5}  {date}  {args.severity} {count:>4}  {'█' * count}")
+    return 0
+
+
+def cmd_regressions(conn, args):
+    since, until = resolve_run(conn, args.since), resolve_run(conn, args.until)
+    _run_notes(conn, since, until)
+    rows = regressions(conn, since, until)
+    _print_changes(rows)
+    print(f"\n{len(rows)} assets regressed from run {since} to run {until}")
+    return 1 if rows and args.fail else 0
+
+
+def cmd_diff(conn, args):
+    base, head = resolve_run(conn, args.base), resolve_run(conn, args.head)
+    _run_notes(conn, base, head)
+    rows, added, removed = score_deltas(conn, base, head)
+    _print_changes(rows)
+    for asset_id in added:
+        print(f"  {asset_id:<40} added")
+    for asset_id in removed:
+        print(f"  {asset_id:<40} removed")
+    worse = len(regressions(conn, base, head))
+    print(f"\nRun {base} → {head}: {len(rows)} changed ({worse} regressed), "
+          f"{len(added)} added, {len(removed)} removed")
+    return 0
+
+
+def cmd_asset(conn, args):
+    rows = asset_history(conn, args.asset_id)
+    if not rows:
+        print(f"ERROR: {args.asset_id} is in no recorded run", file=sys.stderr)
+        return 1
+    for run_id, date, content_hash, severity, *scores, stroke, font in rows:
+        dp = f"stroke {stroke if stroke is not None else 'N/A'}dp  font {font if font is not None else 'N/A'}dp"
+        print(f"  run {run_id:>5}  {date}  {content_hash[:12]}  {severity:<4}  "
+              f"{'/'.join(map(str, scores))}  {dp}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Query the image audit history')
+    parser.add_argument('--db', default=DEFAULT_DB, help='history database (default: .audit-history.db)')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('runs', help='list recorded runs with severity totals')
+    p.add_argument('--limit', type=int, metavar='N', help='only the newest N runs')
+    p.set_defaults(func=cmd_runs)
+
+    p = sub.add_parser('trend', help='count of one severity per run, oldest first')
+    p.add_argument('--severity', choices=SEVERITIES, default='P0')
+    p.set_defaults(func=cmd_trend)
+
+    p = sub.add_parser('regressions', help='assets that got worse between two runs')
+    p.add_argument('--since', required=True, metavar='RUN', help='run to compare against')
+    p.add_argument('--until', default='-1', metavar='RUN', help='later run (default: the latest)')
+    p.add_argument('--fail', action='store_true', help='exit with status 1 if anything regressed')
+    p.set_defaults(func=cmd_regressions)
+
+    p = sub.add_parser('diff', help='per-asset score deltas between two runs (e.g. main vs a PR)')
+    p.add_argument('base', metavar='BASE')
+    p.add_argument('head', metavar='HEAD', nargs='?', default='-1', help='(default: the latest run)')
+    p.set_defaults(func=cmd_diff)
+
+    p = sub.add_parser('asset', help="one asset's results over every run")
+    p.add_argument('asset_id')
+    p.set_defaults(func=cmd_asset)
+
+    args = parser.parse_args(argv)
+    if not Path(args.db).exists():
+        parser.error(f"{args.db} does not exist; record a run with audit_image_quality.py first")
+    try:
+        conn = open_db(args.db)
+        try:
+            return args.func(conn, args)
+        finally:
+            conn.close()
+    except HistoryError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,15 +3,74 @@
 Image Quality Audit Script for DMV Texas Quiz App
 Analyzes SVG assets for mobile readability at 96dp and 48dp render sizes.
 Generates CSV + Markdown reports per Issue #52 requirements.
+
+Results are two normalized tables, streamed as each asset is scored: one row
+per asset (*-assets) and one per question that uses it (*-usage), as CSV,
+JSON Lines or Parquet (--format). JSON Lines and Parquet keep measurements
+typed (floats, null when absent); CSV writes them as in the report (2
+decimals, N/A). The Markdown report is rendered from the asset rows.
+
+Per-asset results are cached by SVG content hash in .audit-cache.json (and
+discarded when RUBRIC_VERSION changes), so a re-audit only analyzes changed
+files; --jobs N spreads those across worker processes.
+
+--raster also renders every asset at 48dp and 96dp (assets/components/raster.py,
+needs numpy and Pillow) and checks the pixels: WCAG contrast across every
+color edge and the narrowest feature that survives morphological opening.
+Those results can only lower the readability and contrast scores. The 96dp
+render is also hashed (assets/components/similarity.py) and look-alike
+assets are listed in a Confusable Assets section.
+
+Inputs and outputs are arguments (--packs, --svg-dir, --output-dir, --date);
+the defaults audit data/tx/tx_v1.json against assets/svg into
+dmv-android/docs/growth. The same audit is importable: audit_svg() scores
+one SVG from a path, bytes or a rendered string, and audit_pack() returns
+the tables for a set of packs in memory.
+
+By default only the SVGs the packs use are audited. --library audits every
+SVG in the SVG directories and builds the asset usage index over every copy
+of the packs and every manifest (scripts/asset_index.py; saved for other
+tools), adding a Library Coverage section on orphans, missing files and
+drift between copies to the report.
+
+Each run is also recorded in a SQLite history (.audit-history.db; --label
+names the run, --no-history skips it), which scripts/audit_history.py
+queries for regressions, P0 trends and per-PR score deltas.
 """
 
+import argparse
+import hashlib
+import io
 import json
+import math
+import os
+import sys
 import xml.etree.ElementTree as ET
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 import csv
+import datetime
 import re
 
+try:
+    import numpy as np
+except ImportError:  # optional: only --raster needs it
+    np = None
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: only --format parquet needs it
+    pa = pq = None
+
+# The components package in assets/: pathdata parses every <path>; raster and
+# similarity are imported on first --raster use (see _components())
+ASSETS_DIR = str(Path(__file__).resolve().parent.parent / 'assets')
+if ASSETS_DIR not in sys.path:
+    sys.path.insert(0, ASSETS_DIR)
+from components import pathdata  # noqa: E402
+
 # Mobile rendering targets
 TARGET_DP_PRIMARY = 96
 TARGET_DP_MINIMUM = 48
@@ -20,17 +79,426 @@ TARGET_DP_MINIMUM = 48
 MIN_STROKE_DP = 2.0  # Minimum visible stroke width on mobile
 MIN_TEXT_DP = 9.6    # Minimum legible text size on mobile
 
+# Geometry
+OVERFLOW_TOLERANCE = 0.5  # viewBox px a shape may stick out before it counts as clipped
+SEGMENTS_PER_ELEMENT = 4  # drawn segments that weigh as much as one element for complexity
+CLUTTER_ELEMENTS = 80
+
+# Bump whenever metrics or scoring change: cached results from other versions are discarded
+RUBRIC_VERSION = 5
+# Bump when the shape of a cached result changes without the scores changing
+CACHE_FORMAT = 3
+
+STYLE_DECLARATION = re.compile(r'([\w-]+)\s*:\s*([^;]+)')
+TRANSFORM = re.compile(r'(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)')
+NUMBER = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+# Containers whose content is only drawn when referenced (markers, clip paths, ...)
+NOT_RENDERED = frozenset({'defs', 'marker', 'clipPath', 'mask', 'symbol', 'pattern'})
+STROKED_TAGS = frozenset({'rect', 'circle', 'ellipse', 'line', 'polyline', 'polygon', 'path',
+                          'text', 'tspan'})
+TEXT_TAGS = frozenset({'text', 'tspan'})
+CLOSED_SHAPES = frozenset({'rect', 'circle', 'ellipse', 'polygon'})
+SHAPE_TAGS = frozenset({'rect', 'circle', 'ellipse', 'line', 'polyline', 'polygon', 'path'})
+
+# SVG/CSS initial values used when nothing in the ancestor chain sets the property
+DEFAULT_FILL = '#000000'
+DEFAULT_STROKE_WIDTH = 1.0
+DEFAULT_FONT_SIZE = 16.0
+
+# Raster checks (--raster)
+MIN_CONTRAST_RATIO = 3.0            # WCAG 2.1 SC 1.4.11, non-text contrast
+RASTER_BACKGROUND = (255, 255, 255)  # card color the app shows assets on
+PALETTE_MIN_SHARE = 0.01            # a color must cover 1% of the pixels to be a feature color
+PALETTE_TOLERANCE = 32              # max channel difference still counted as the same color
+THIN_RUN_FRACTION = 1 / 8           # thin pixels must add up to 1/8 of the long side to count
+MAX_FEATURE_PX = 6                  # widths above this are not measured
+CONFUSABLE_REPORT_ROWS = 25          # look-alike pairs listed in the report (all near-duplicates are)
+RASTER_COLUMNS = ('min_feature_dp', 'low_contrast_edges', 'perceptual_hash')  # extra asset columns with --raster
+
+# Output tables: one row per asset, and one per (question, asset) use
+ASSET_COLUMNS = (
+    'asset_id', 'usage_count', 'category',
+    'readability_score', 'semantic_clarity_score', 'contrast_score', 'consistency_score',
+    'severity', 'issue_type', 'user_impact', 'proposed_fix',
+    'min_stroke_dp', 'min_font_dp', 'viewbox',
+)
+USAGE_COLUMNS = ('question_id', 'topic', 'asset_id')
+FORMATS = ('csv', 'jsonl', 'parquet')
+PARQUET_BATCH_ROWS = 1024
+# Parquet column types; other columns are strings. Explicit, so a batch in
+# which a column is all null does not fix its type.
+PARQUET_TYPES = {
+    'usage_count': 'int64',
+    'readability_score': 'int64', 'semantic_clarity_score': 'int64',
+    'contrast_score': 'int64', 'consistency_score': 'int64',
+    'min_stroke_dp': 'float64', 'min_font_dp': 'float64',
+    'min_feature_dp': 'float64', 'low_contrast_edges': 'float64',
+}
+
+
+class SVGMetrics:
+    """Everything the scoring functions read from one SVG, filled in a single pass"""
+
+    __slots__ = ('viewbox_x', 'viewbox_y', 'viewbox_width', 'viewbox_height', 'stroke_widths',
+                 'font_sizes', 'opacities', 'element_count', 'text_count', 'segment_count',
+                 'curve_count', 'bounds', 'overflow_count', 'max_overflow')
+
+    def __init__(self):
+        self.viewbox_x = 0.0
+        self.viewbox_y = 0.0
+        self.viewbox_width = 200.0
+        self.viewbox_height = 200.0
+        self.stroke_widths = array('d')  # rendered width of every stroked shape, in viewBox px
+        self.font_sizes = array('d')     # rendered font size of every text/tspan, in viewBox px
+        self.opacities = array('d')      # opacity attribute values
+        self.element_count = 0
+        self.text_count = 0
+        self.segment_count = 0           # drawn segments of paths, polygons, polylines and lines
+        self.curve_count = 0             # of which Bézier curves and arcs
+        self.bounds = None               # (min_x, min_y, max_x, max_y) of all shapes, viewBox px
+        self.overflow_count = 0          # shapes reaching outside the viewBox
+        self.max_overflow = 0.0          # furthest any shape reaches outside it, viewBox px
+
+    @property
+    def min_stroke_width(self):
+        return min(self.stroke_widths) if self.stroke_widths else None
+
+    @property
+    def min_font_size(self):
+        return min(self.font_sizes) if self.font_sizes else None
+
+    def add_shape(self, box):
+        """Record one shape's bounding box (viewBox px) in bounds and the overflow counts"""
+        if self.bounds is None:
+            self.bounds = box
+        else:
+            b = self.bounds
+            self.bounds = (min(b[0], box[0]), min(b[1], box[1]), max(b[2], box[2]), max(b[3], box[3]))
+        overflow = max(self.viewbox_x - box[0], self.viewbox_y - box[1],
+                       box[2] - self.viewbox_x - self.viewbox_width,
+                       box[3] - self.viewbox_y - self.viewbox_height)
+        if overflow > OVERFLOW_TOLERANCE:
+            self.overflow_count += 1
+            self.max_overflow = max(self.max_overflow, overflow)
+
+
+def parse_transform(value):
+    """SVG transform list -> affine matrix (a, b, c, d, e, f)"""
+    m = IDENTITY
+    for name, args in TRANSFORM.findall(value):
+        v = [float(n) for n in NUMBER.findall(args)]
+        if name == 'matrix' and len(v) == 6:
+            t = tuple(v)
+        elif name == 'translate' and v:
+            t = (1.0, 0.0, 0.0, 1.0, v[0], v[1] if len(v) > 1 else 0.0)
+        elif name == 'scale' and v:
+            t = (v[0], 0.0, 0.0, v[1] if len(v) > 1 else v[0], 0.0, 0.0)
+        elif name == 'rotate' and v:
+            a = math.radians(v[0])
+            cos, sin = math.cos(a), math.sin(a)
+            cx, cy = (v[1], v[2]) if len(v) == 3 else (0.0, 0.0)
+            t = (cos, sin, -sin, cos, cx - cos * cx + sin * cy, cy - sin * cx - cos * cy)
+        elif name == 'skewX' and v:
+            t = (1.0, 0.0, math.tan(math.radians(v[0])), 1.0, 0.0, 0.0)
+        elif name == 'skewY' and v:
+            t = (1.0, math.tan(math.radians(v[0])), 0.0, 1.0, 0.0, 0.0)
+        else:
+            continue
+        m = multiply(m, t)
+    return m
+
+
+def multiply(m, n):
+    """Affine product m·n (n applied first)"""
+    a, b, c, d, e, f = m
+    A, B, C, D, E, F = n
+    return (a * A + c * B, b * A + d * B, a * C + c * D, b * C + d * D,
+            a * E + c * F + e, b * E + d * F + f)
+
+
+def transform_scale(value):
+    """Uniform scale of an SVG transform list: sqrt(|det|) of its linear part"""
+    a, b, c, d, _, _ = parse_transform(value)
+    return math.sqrt(abs(a * d - b * c))
+
+
+def transform_box(m, box):
+    """Bounding box of box (min_x, min_y, max_x, max_y) after the affine m.
+
+    Exact for translate/scale; with rotation or skew it is the box around
+    the transformed corners, which can be larger than the shape.
+    """
+    a, b, c, d, e, f = m
+    if b == 0 and c == 0:
+        x0, x1 = a * box[0] + e, a * box[2] + e
+        y0, y1 = d * box[1] + f, d * box[3] + f
+        return (min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+    xs, ys = [], []
+    for x in (box[0], box[2]):
+        for y in (box[1], box[3]):
+            xs.append(a * x + c * y + e)
+            ys.append(b * x + d * y + f)
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def _cubic_extrema(p0, p1, p2, p3):
+    """Parameters t in (0, 1) where a cubic Bézier coordinate has zero derivative"""
+    a = -p0 + 3 * p1 - 3 * p2 + p3
+    b = 2 * (p0 - 2 * p1 + p2)
+    c = p1 - p0
+    if abs(a) < 1e-12:
+        return [-c / b] if abs(b) > 1e-12 and 0 < -c / b < 1 else []
+    disc = b * b - 4 * a * c
+    if disc < 0:
+        return []
+    root = math.sqrt(disc)
+    return [t for t in ((-b + root) / (2 * a), (-b - root) / (2 * a)) if 0 < t < 1]
+
+
+def _arc_extrema(p0, rx, ry, rotation, large_arc, sweep, p1):
+    """Points of an SVG arc (SVG 1.1 F.6.5) where x or y is extreme, endpoints excluded"""
+    if p0 == p1 or rx == 0 or ry == 0:
+        return []
+    phi = math.radians(rotation)
+    cos, sin = math.cos(phi), math.sin(phi)
+    dx2, dy2 = (p0[0] - p1[0]) / 2, (p0[1] - p1[1]) / 2
+    x1p, y1p = cos * dx2 + sin * dy2, -sin * dx2 + cos * dy2
+    lam = (x1p / rx) ** 2 + (y1p / ry) ** 2
+    if lam > 1:
+        rx, ry = rx * math.sqrt(lam), ry * math.sqrt(lam)
+    num = rx * rx * ry * ry - rx * rx * y1p * y1p - ry * ry * x1p * x1p
+    den = rx * rx * y1p * y1p + ry * ry * x1p * x1p
+    coef = math.sqrt(max(0.0, num / den)) if den else 0.0
+    if large_arc == sweep:
+        coef = -coef
+    cxp, cyp = coef * rx * y1p / ry, -coef * ry * x1p / rx
+    cx = cos * cxp - sin * cyp + (p0[0] + p1[0]) / 2
+    cy = sin * cxp + cos * cyp + (p0[1] + p1[1]) / 2
+    start = math.atan2((y1p - cyp) / ry, (x1p - cxp) / rx)
+    delta = math.atan2((-y1p - cyp) / ry, (-x1p - cxp) / rx) - start
+    if sweep and delta < 0:
+        delta += 2 * math.pi
+    elif not sweep and delta > 0:
+        delta -= 2 * math.pi
+    points = []
+    for base in (math.atan2(-ry * sin, rx * cos), math.atan2(ry * cos, rx * sin)):
+        for theta in (base, base + math.pi):
+            # is theta inside the swept range?
+            offset = (theta - start) % (2 * math.pi) if delta > 0 else (start - theta) % (2 * math.pi)
+            if offset < abs(delta):
+                ex, ey = rx * math.cos(theta), ry * math.sin(theta)
+                points.append((cx + ex * cos - ey * sin, cy + ex * sin + ey * cos))
+    return points
+
+
+def path_geometry(d, m=IDENTITY):
+    """(bounds, segments, curves) of SVG path data drawn under the affine m.
+
+    Walks the absolute segments of components.pathdata.parse(). Bounds are
+    exact: lines and Béziers are transformed first (both are affine-invariant)
+    and curve extrema found from the derivative roots; arcs are bounded by
+    their own extrema, which is exact unless m rotates or skews. bounds is
+    None for a path that draws nothing.
+    """
+    a, b, c, dd, e, f = m
+    xs, ys = [], []
+    segments = curves = 0
+    cur = start = (0.0, 0.0)    # current point and subpath start, user space
+    moved = False               # a moveto whose point is not yet in the bounds
+
+    def point(x, y):
+        return a * x + c * y + e, b * x + dd * y + f
+
+    for cmd, args in pathdata.parse(d):
+        if cmd == 'M':
+            # A moveto draws nothing; its point is bounded once a segment starts there
+            cur = start = args[0]
+            moved = True
+            continue
+        if cmd == 'Z':
+            if cur != start:
+                segments += 1
+            elif moved:                 # zero-length closed subpath: a dot with round caps
+                px, py = point(*start)
+                xs.append(px)
+                ys.append(py)
+            cur, moved = start, False
+            continue
+        segments += 1
+        p0 = point(*cur)
+        if moved:
+            xs.append(p0[0])
+            ys.append(p0[1])
+            moved = False
+        if cmd in ('C', 'Q'):
+            curves += 1
+            p = [p0] + [point(x, y) for x, y in args]
+            for axis, out in ((0, xs), (1, ys)):
+                q = [pt[axis] for pt in p]
+                if cmd == 'C':
+                    for t in _cubic_extrema(*q):
+                        u = 1 - t
+                        out.append(u * u * u * q[0] + 3 * u * u * t * q[1]
+                                   + 3 * u * t * t * q[2] + t * t * t * q[3])
+                else:
+                    den = q[0] - 2 * q[1] + q[2]
+                    if den:
+                        t = (q[0] - q[1]) / den
+                        if 0 < t < 1:
+                            out.append((1 - t) ** 2 * q[0] + 2 * (1 - t) * t * q[1] + t * t * q[2])
+        elif cmd == 'A':
+            curves += 1
+            for x, y in _arc_extrema(cur, *args):
+                px, py = point(x, y)
+                xs.append(px)
+                ys.append(py)
+        cur = args[-1]
+        end = point(*cur)
+        xs.append(end[0])
+        ys.append(end[1])
+    if not xs:
+        return None, segments, curves
+    return (min(xs), min(ys), max(xs), max(ys)), segments, curves
+
+
+def shape_geometry(name, attrib, m):
+    """(bounds in viewBox px, segments, curves) of one basic shape or path under m"""
+    if name == 'path':
+        return path_geometry(attrib.get('d', ''), m)
+    if name in ('polygon', 'polyline'):
+        v = [float(t) for t in NUMBER.findall(attrib.get('points', ''))]
+        a, b, c, d, e, f = m
+        xs = [a * x + c * y + e for x, y in zip(v[0::2], v[1::2])]
+        ys = [b * x + d * y + f for x, y in zip(v[0::2], v[1::2])]
+        if not xs:
+            return None, 0, 0
+        segments = len(xs) - (name == 'polyline')
+        return (min(xs), min(ys), max(xs), max(ys)), segments, 0
+    num = lambda key: _length(attrib.get(key, '0'), 0.0)
+    if name == 'line':
+        box = (min(num('x1'), num('x2')), min(num('y1'), num('y2')),
+               max(num('x1'), num('x2')), max(num('y1'), num('y2')))
+        return transform_box(m, box), 1, 0
+    if name == 'rect':
+        x, y = num('x'), num('y')
+        return transform_box(m, (x, y, x + num('width'), y + num('height'))), 0, 0
+    cx, cy = num('cx'), num('cy')
+    rx, ry = (num('r'), num('r')) if name == 'circle' else (num('rx'), num('ry'))
+    return transform_box(m, (cx - rx, cy - ry, cx + rx, cy + ry)), 0, 0
+
+
+def _length(raw, inherited):
+    try:
+        return float(raw.replace('px', ''))
+    except ValueError:
+        return inherited
+
+
+class _MetricsTarget:
+    """XMLParser target that records metrics from start tags; no element tree is built.
+
+    A stack of (transform, fill, stroke, stroke-width, font-size, hidden)
+    carries the current transform and inherited presentation values down the
+    tree, so each stroked shape and text run is recorded at its rendered size
+    and each shape's bounds in viewBox coordinates. A stroke painted like a
+    closed shape's own fill draws no visible line and is skipped.
+    """
+
+    def __init__(self):
+        self.metrics = SVGMetrics()
+        self.stack = [(IDENTITY, DEFAULT_FILL, None, DEFAULT_STROKE_WIDTH, DEFAULT_FONT_SIZE, False)]
+
+    def start(self, tag, attrib):
+        metrics = self.metrics
+        if metrics.element_count == 0:
+            parts = [float(n) for n in NUMBER.findall(attrib.get('viewBox', '0 0 200 200'))]
+            (metrics.viewbox_x, metrics.viewbox_y,
+             metrics.viewbox_width, metrics.viewbox_height) = parts[:4]
+        metrics.element_count += 1
+        name = tag.rpartition('}')[2]
+        if name == 'text':
+            metrics.text_count += 1
+        ctm, fill, stroke, stroke_width, font_size, hidden = self.stack[-1]
+        if hidden or name in NOT_RENDERED:
+            self.stack.append((ctm, fill, stroke, stroke_width, font_size, True))
+            return
+
+        props = attrib
+        style = attrib.get('style')
+        if style:
+            props = dict(attrib)
+            props.update((k, v.strip()) for k, v in STYLE_DECLARATION.findall(style))
+        transform = attrib.get('transform')
+        if transform:
+            ctm = multiply(ctm, parse_transform(transform))
+        fill = props.get('fill', fill)
+        stroke = props.get('stroke', stroke)
+        if 'stroke-width' in props:
+            stroke_width = _length(props['stroke-width'], stroke_width)
+        if 'font-size' in props:
+            font_size = _length(props['font-size'], font_size)
+        self.stack.append((ctm, fill, stroke, stroke_width, font_size, False))
+
+        scale = math.sqrt(abs(ctm[0] * ctm[3] - ctm[1] * ctm[2]))
+        if (name in STROKED_TAGS and stroke not in (None, 'none')
+                and not (name in CLOSED_SHAPES and stroke.lower() == fill.lower())):
+            factor = 1.0 if props.get('vector-effect') == 'non-scaling-stroke' else scale
+            metrics.stroke_widths.append(stroke_width * factor)
+        if name in TEXT_TAGS:
+            metrics.font_sizes.append(font_size * scale)
+        if name in SHAPE_TAGS:
+            box, segments, curves = shape_geometry(name, attrib, ctm)
+            metrics.segment_count += segments
+            metrics.curve_count += curves
+            if box is not None:
+                metrics.add_shape(box)
+        opacity = attrib.get('opacity')
+        if opacity:
+            try:
+                metrics.opacities.append(float(opacity))
+            except ValueError:
+                pass
+
+    def end(self, tag):
+        self.stack.pop()
+
+    def data(self, text):
+        pass
+
+    def close(self):
+        return self.metrics
+
+
+def extract_metrics(source, chunk_size=1 << 16):
+    """Stream an SVG (path or binary file object) once and fill an SVGMetrics.
+
+    expat calls the target for each start tag and nothing is kept afterwards,
+    so memory does not grow with document size (unlike ET.parse, and with
+    less per-element work than iterparse + clear()).
+    """
+    parser = ET.XMLParser(target=_MetricsTarget())
+    if isinstance(source, (str, Path)):
+        with open(source, 'rb') as f:
+            return _feed(parser, f, chunk_size)
+    return _feed(parser, source, chunk_size)
+
+
+def _feed(parser, f, chunk_size):
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return parser.close()
+        parser.feed(chunk)
+
+
 class SVGAnalyzer:
     def __init__(self, svg_path):
         self.path = svg_path
-        self.tree = ET.parse(svg_path)
-        self.root = self.tree.getroot()
-
-        # Extract viewBox
-        viewbox_str = self.root.get('viewBox', '0 0 200 200')
-        parts = viewbox_str.split()
-        self.viewbox_width = float(parts[2])
-        self.viewbox_height = float(parts[3])
+        self.metrics = extract_metrics(svg_path)
+        self.viewbox_width = self.metrics.viewbox_width
+        self.viewbox_height = self.metrics.viewbox_height
 
     def calculate_effective_dp(self, px_value, target_dp=TARGET_DP_PRIMARY):
         """Calculate effective dp size when SVG is rendered at target_dp"""
@@ -40,71 +508,27 @@ class SVGAnalyzer:
 
     def find_min_stroke_width(self):
         """Find minimum stroke width in the SVG (in px units)"""
-        min_stroke = float('inf')
-
-        # Check all elements with stroke
-        for elem in self.root.iter():
-            # Check stroke-width attribute
-            stroke_width = elem.get('stroke-width')
-            if stroke_width:
-                try:
-                    width = float(stroke_width.replace('px', ''))
-                    min_stroke = min(min_stroke, width)
-                except ValueError:
-                    pass
-
-            # Check style attribute for stroke-width
-            style = elem.get('style', '')
-            if 'stroke-width' in style:
-                match = re.search(r'stroke-width:\s*([0-9.]+)', style)
-                if match:
-                    try:
-                        width = float(match.group(1))
-                        min_stroke = min(min_stroke, width)
-                    except ValueError:
-                        pass
-
-        return min_stroke if min_stroke != float('inf') else None
+        return self.metrics.min_stroke_width
 
     def find_min_font_size(self):
         """Find minimum font size in the SVG (in px units)"""
-        min_font = float('inf')
-
-        for elem in self.root.iter():
-            # Check font-size attribute
-            font_size = elem.get('font-size')
-            if font_size:
-                try:
-                    size = float(font_size.replace('px', ''))
-                    min_font = min(min_font, size)
-                except ValueError:
-                    pass
-
-            # Check style attribute for font-size
-            style = elem.get('style', '')
-            if 'font-size' in style:
-                match = re.search(r'font-size:\s*([0-9.]+)', style)
-                if match:
-                    try:
-                        size = float(match.group(1))
-                        min_font = min(min_font, size)
-                    except ValueError:
-                        pass
-
-        return min_font if min_font != float('inf') else None
+        return self.metrics.min_font_size
 
     def has_text(self):
         """Check if SVG contains text elements"""
-        return len(list(self.root.iter('{http://www.w3.org/2000/svg}text'))) > 0 or \
-               len(list(self.root.iter('text'))) > 0
+        return self.metrics.text_count > 0
 
     def count_elements(self):
         """Count total elements in SVG"""
-        return len(list(self.root.iter()))
+        return self.metrics.element_count
+
+    def complexity(self):
+        """Element count, or drawn segments in element units if paths carry more detail"""
+        return max(self.metrics.element_count, self.metrics.segment_count / SEGMENTS_PER_ELEMENT)
 
     def get_complexity_score(self):
         """Score complexity (simpler = better for mobile)"""
-        count = self.count_elements()
+        count = self.complexity()
         if count < 20: return 5
         if count < 40: return 4
         if count < 60: return 3
@@ -112,6 +536,169 @@ class SVGAnalyzer:
         return 1
 
 
+def _components():
+    """components.raster and .svgtree from assets/ (imported on first --raster use)"""
+    from components import raster, svgtree
+    raster.require()
+    return raster, svgtree
+
+
+def relative_luminance(rgb):
+    """WCAG relative luminance of 0-255 sRGB colors (array, last axis = channels)"""
+    c = np.asarray(rgb, dtype=np.float64) / 255
+    linear = np.where(c <= 0.03928, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+    return linear @ np.array([0.2126, 0.7152, 0.0722])
+
+
+def _is_blend(color, others):
+    """True if color lies between two other colors, i.e. is their antialiasing mix"""
+    for i in range(len(others)):
+        for j in range(i):
+            a, ab = others[i], others[j] - others[i]
+            t = (color - a) @ ab / (ab @ ab)
+            if 0 < t < 1 and np.abs(a + t * ab - color).max() <= PALETTE_TOLERANCE / 2:
+                return True
+    return False
+
+
+def palette(rgb):
+    """(colors, labels): the feature colors of a render and each pixel's color index.
+
+    Feature colors are the common colors that are not a mix of two others.
+    An antialiased edge pixel is a mix of the colors on either side, so it
+    gets the nearer end of the best-fitting pair rather than the nearest
+    color, which could be an unrelated third one.
+    """
+    px = rgb.reshape(-1, 3).astype(np.float64)
+    q = rgb.reshape(-1, 3).astype(np.int32) >> 4
+    bins = (q[:, 0] << 8) | (q[:, 1] << 4) | q[:, 2]
+    counts = np.bincount(bins, minlength=4096)
+    sums = np.stack([np.bincount(bins, px[:, c], 4096) for c in range(3)], axis=1)
+    colors = []
+    for b in np.argsort(counts)[::-1]:
+        if colors and counts[b] < PALETTE_MIN_SHARE * len(px):
+            break
+        color = sums[b] / counts[b]
+        if all(np.abs(color - c).max() > PALETTE_TOLERANCE for c in colors):
+            colors.append(color)
+    for i in reversed(range(len(colors))):
+        if _is_blend(colors[i], colors[:i] + colors[i + 1:]):
+            del colors[i]
+    colors = np.array(colors)
+
+    best = ((px[:, None, :] - colors[None]) ** 2).sum(axis=2)
+    labels, best = best.argmin(axis=1), best.min(axis=1)
+    for i in range(len(colors)):
+        for j in range(i):
+            a, ab = colors[i], colors[j] - colors[i]
+            t = np.clip((px - a) @ ab / (ab @ ab), 0, 1)
+            dist = ((a + t[:, None] * ab - px) ** 2).sum(axis=1)
+            closer = dist < best
+            best = np.where(closer, dist, best)
+            labels = np.where(closer, np.where(t < 0.5, i, j), labels)
+    return colors, labels.reshape(rgb.shape[:2])
+
+
+def edge_contrast(colors, labels):
+    """WCAG contrast ratio across every pair of neighboring pixels of different colors"""
+    lum = relative_luminance(colors)
+    ratios = []
+    for a, b in ((labels[:, :-1], labels[:, 1:]), (labels[:-1], labels[1:])):
+        edge = a != b
+        la, lb = lum[a[edge]], lum[b[edge]]
+        ratios.append((np.maximum(la, lb) + 0.05) / (np.minimum(la, lb) + 0.05))
+    return np.concatenate(ratios)
+
+
+def _opening(mask, size):
+    """Morphological opening by a size x size square: the parts of mask at least size px wide"""
+    h, w = mask.shape
+    for _ in range(size - 1):
+        mask = mask[:-1, :-1] & mask[1:, :-1] & mask[:-1, 1:] & mask[1:, 1:]
+    for _ in range(size - 1):
+        grown = np.zeros((mask.shape[0] + 1, mask.shape[1] + 1), dtype=bool)
+        grown[:-1, :-1] |= mask
+        grown[1:, :-1] |= mask
+        grown[:-1, 1:] |= mask
+        grown[1:, 1:] |= mask
+        mask = grown
+    return mask[:h, :w]
+
+
+def min_feature_width(labels):
+    """Narrowest feature in px: the first width w at which opening by (w+1) x (w+1)
+    removes a real run of some color (not the background). None if all are wider
+    than MAX_FEATURE_PX.
+    """
+    background = np.bincount(labels.ravel()).argmax()
+    masks = [labels == i for i in range(labels.max() + 1) if i != background]
+    min_run = max(labels.shape) * THIN_RUN_FRACTION
+    for width in range(1, MAX_FEATURE_PX + 1):
+        for mask in masks:
+            if (mask & ~_opening(mask, width + 1)).sum() >= min_run:
+                return width
+    return None
+
+
+def raster_metrics(data):
+    """Render an SVG (bytes) at TARGET_DP_MINIMUM and TARGET_DP_PRIMARY and measure each:
+
+        {target_dp: {'min_feature_px': int or None, 'low_contrast': share of edges}}
+
+    Renders map the larger viewBox side to target_dp pixels, so 1px = 1dp.
+    'low_contrast' is the share of color-edge length below MIN_CONTRAST_RATIO.
+    The render at similarity.HASH_PX also gets its 'perceptual_hash' (int).
+    """
+    raster, svgtree = _components()
+    from components import similarity
+    root = svgtree.parse(io.BytesIO(data))
+    out = {}
+    for target in (TARGET_DP_MINIMUM, TARGET_DP_PRIMARY):
+        width, height = raster.output_size(root, target)
+        rgb = raster.render(root, width, height, background=RASTER_BACKGROUND)[..., :3]
+        colors, labels = palette(rgb)
+        ratios = edge_contrast(colors, labels)
+        out[target] = {
+            'min_feature_px': min_feature_width(labels),
+            'low_contrast': float((ratios < MIN_CONTRAST_RATIO).mean()) if ratios.size else 0.0,
+        }
+        if target == similarity.HASH_PX:
+            out[target]['perceptual_hash'] = similarity.perceptual_hash(rgb)
+    return out
+
+
+def raster_feature_dp(metrics):
+    """Narrowest rendered feature over all render sizes, in dp at TARGET_DP_PRIMARY.
+
+    A feature measured w px wide is between w and w+1 px, so it counts as w + 0.5.
+    """
+    widths = [(m['min_feature_px'] + 0.5) * TARGET_DP_PRIMARY / target
+              for target, m in metrics.items() if m['min_feature_px'] is not None]
+    return min(widths) if widths else None
+
+
+def score_raster_readability(metrics):
+    """Score 1-5 from the narrowest rendered feature, on the stroke-width scale"""
+    width_dp = raster_feature_dp(metrics)
+    if width_dp is None:
+        return 5
+    if width_dp < 1.0: return 1
+    if width_dp < 1.5: return 2
+    if width_dp < MIN_STROKE_DP: return 3
+    if width_dp < 2.5: return 4
+    return 5
+
+
+def score_raster_contrast(metrics):
+    """Score 1-5 from the worst share of low-contrast edges over all render sizes"""
+    low = max(m['low_contrast'] for m in metrics.values())
+    if low <= 0.05: return 5
+    if low <= 0.15: return 4
+    if low <= 0.30: return 3
+    if low <= 0.50: return 2
+    return 1
+
+
 def score_readability(analyzer):
     """Score 1-5: Can learner read symbols/text quickly on mobile?"""
     min_stroke = analyzer.find_min_stroke_width()
@@ -147,6 +734,10 @@ def score_readability(analyzer):
 
 def score_semantic_clarity(analyzer, asset_id, category):
     """Score 1-5: Is traffic meaning unambiguous?"""
+    # Geometry cut off by the viewBox edge (e.g. a sign's corners) never renders
+    if analyzer.metrics.overflow_count:
+        return 2
+
     # MUTCD signs should follow strict geometry
     if 'MUTCD' in asset_id:
         # Check viewBox consistency
@@ -184,16 +775,7 @@ def score_contrast(analyzer):
     # For now, check for common issues
 
     # Check for excessive opacity (indicates weak contrast)
-    low_opacity_count = 0
-    for elem in analyzer.root.iter():
-        opacity = elem.get('opacity')
-        if opacity:
-            try:
-                val = float(opacity)
-                if val < 0.5:
-                    low_opacity_count += 1
-            except ValueError:
-                pass
+    low_opacity_count = sum(1 for val in analyzer.metrics.opacities if val < 0.5)
 
     if low_opacity_count > 5:
         return 3  # Lots of transparency, may have contrast issues
@@ -299,11 +881,15 @@ def determine_issue_type(analyzer, scores, min_stroke_dp, min_font_dp):
         return 'tiny_text'
     if min_stroke_dp and min_stroke_dp < 2.0:
         return 'thin_strokes'
+    if scores['readability'] <= 3:
+        return 'thin_features'  # only the raster check finds these
     if scores['contrast'] <= 3:
         return 'low_contrast'
+    if analyzer.metrics.overflow_count:
+        return 'viewbox_overflow'
     if scores['semantic_clarity'] <= 3:
         return 'ambiguous_geometry'
-    if analyzer.count_elements() > 80:
+    if analyzer.complexity() > CLUTTER_ELEMENTS:
         return 'clutter'
     if scores['consistency'] <= 3:
         return 'inconsistent_style'
@@ -323,9 +909,16 @@ def propose_fix(issue_type, min_stroke_dp, min_font_dp, analyzer):
         target_px = 6  # Target for 2.88dp at 200px viewBox
         return f"Increase stroke width from {min_stroke_px:.1f}px to ≥{target_px}px"
 
+    elif issue_type == 'thin_features':
+        return f"Widen rendered features to ≥{MIN_STROKE_DP:g}dp at {TARGET_DP_PRIMARY}dp"
+
     elif issue_type == 'low_contrast':
         return "Increase color contrast between foreground and background"
 
+    elif issue_type == 'viewbox_overflow':
+        count, by = analyzer.metrics.overflow_count, analyzer.metrics.max_overflow
+        return f"Move {count} shape(s) inside the viewBox (clipped by up to {by:.1f}px)"
+
     elif issue_type == 'ambiguous_geometry':
         return "Correct geometry to match MUTCD/SHS specifications"
 
@@ -340,136 +933,617 @@ def propose_fix(issue_type, min_stroke_dp, min_font_dp, analyzer):
         return "No fix needed - asset meets quality standards"
 
 
-def main():
-    # Paths
-    repo_root = Path(__file__).parent.parent
-    questions_file = repo_root / 'data' / 'tx' / 'tx_v1.json'
-    svg_dir = repo_root / 'assets' / 'svg'
-    output_csv = repo_root / 'dmv-android' / 'docs' / 'growth' / 'image-quality-audit-2026-02.csv'
-    output_md = repo_root / 'dmv-android' / 'docs' / 'growth' / 'image-quality-audit-2026-02.md'
+def analyze_asset(asset_id, data, raster=False, category=None):
+    """Score one SVG (bytes); returns everything in its report rows except usage columns.
 
-    # Ensure output directory exists
-    output_csv.parent.mkdir(parents=True, exist_ok=True)
+    With raster=True the raster checks run too and can lower readability and contrast.
+    category defaults to categorize_asset(asset_id).
+    """
+    analyzer = SVGAnalyzer(io.BytesIO(data))
+    category = category or categorize_asset(asset_id)
 
-    # Load questions
-    with open(questions_file) as f:
-        data = json.load(f)
+    # Calculate metrics
+    min_stroke = analyzer.find_min_stroke_width()
+    min_font = analyzer.find_min_font_size()
+    min_stroke_dp = analyzer.calculate_effective_dp(min_stroke) if min_stroke else None
+    min_font_dp = analyzer.calculate_effective_dp(min_font) if min_font else None
 
-    # Map asset usage
-    asset_usage = defaultdict(list)
-    for q in data['questions']:
-        if 'image' in q:
-            asset_id = q['image']['assetId']
-            asset_usage[asset_id].append({
-                'question_id': q['id'],
-                'topic': q['topic']
-            })
+    # Score on 4 dimensions
+    scores = {
+        'readability': score_readability(analyzer),
+        'semantic_clarity': score_semantic_clarity(analyzer, asset_id, category),
+        'contrast': score_contrast(analyzer),
+        'consistency': score_consistency(analyzer, category)
+    }
+    if raster:
+        rendered = raster_metrics(data)
+        scores['readability'] = min(scores['readability'], score_raster_readability(rendered))
+        scores['contrast'] = min(scores['contrast'], score_raster_contrast(rendered))
+
+    # Determine severity and issue
+    severity = determine_severity(scores, min_stroke_dp, min_font_dp)
+    issue_type = determine_issue_type(analyzer, scores, min_stroke_dp, min_font_dp)
+
+    result = {
+        'category': category,
+        'scores': scores,
+        'severity': severity,
+        'issue_type': issue_type,
+        'proposed_fix': propose_fix(issue_type, min_stroke_dp, min_font_dp, analyzer),
+        'min_stroke_dp': round(min_stroke_dp, 2) if min_stroke_dp else None,
+        'min_font_dp': round(min_font_dp, 2) if min_font_dp else None,
+        'viewbox': f"{analyzer.viewbox_width}×{analyzer.viewbox_height}",
+    }
+    if raster:
+        feature_dp = raster_feature_dp(rendered)
+        result['min_feature_dp'] = round(feature_dp, 2) if feature_dp else None
+        result['low_contrast_edges'] = round(max(m['low_contrast'] for m in rendered.values()), 2)
+        from components import similarity
+        result['perceptual_hash'] = next(similarity.format_hash(m['perceptual_hash'])
+                                         for m in rendered.values() if 'perceptual_hash' in m)
+    return result
+
+
+def _analyze_job(job):
+    """Process-pool entry point: (asset_id, data, raster) -> (asset_id, result, error)"""
+    asset_id, data, raster = job
+    try:
+        return asset_id, analyze_asset(asset_id, data, raster), None
+    except Exception as e:
+        return asset_id, None, str(e)
+
+
+def content_hash(data):
+    """Hex SHA-256 of SVG bytes; identifies an asset version in the cache and history"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class AuditCache:
+    """On-disk analyze_asset() results keyed by SVG content hash + asset id, per RUBRIC_VERSION/CACHE_FORMAT"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.used = {}
+        if path is None:
+            return
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('rubric') == RUBRIC_VERSION and data.get('format') == CACHE_FORMAT:
+            self.entries = data.get('entries', {})
+
+    @staticmethod
+    def key(asset_id, data, mode=None):
+        """mode tells apart results from other analysis modes (e.g. the raster renderer's key)"""
+        key = f"{content_hash(data)}/{asset_id}"
+        return f"{key}/{mode}" if mode else key
+
+    def get(self, key):
+        result = self.entries.get(key)
+        if result is not None:
+            self.used[key] = result
+        return result
+
+    def put(self, key, result):
+        self.used[key] = result
+
+    def save(self):
+        """Write the entries used by this run (stale ones are dropped)"""
+        if self.path is None or self.used == self.entries:
+            return
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({'rubric': RUBRIC_VERSION, 'format': CACHE_FORMAT, 'entries': self.used}, f,
+                      sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+def analyze_assets(svg_files, jobs=1, cache=None, raster=False, verbose=True):
+    """Yield (asset_id, result, error) for asset_id -> svg path, in the given order.
+
+    Files whose content hash is in the cache are not re-analyzed; the rest
+    run across `jobs` worker processes (0 = one per CPU). verbose prints
+    progress.
+    """
+    cache = cache or AuditCache(None)
+    mode = analysis_mode(raster) if raster else None
+    done, todo, keys = {}, [], {}
+    for asset_id, svg_path in svg_files.items():
+        data = svg_path.read_bytes()
+        keys[asset_id] = key = AuditCache.key(asset_id, data, mode)
+        result = cache.get(key)
+        if result is not None:
+            done[asset_id] = (asset_id, result, None)
+        else:
+            todo.append((asset_id, data, raster))
+
+    for asset_id, result, error in _run_jobs(todo, jobs):
+        if verbose:
+            print(f"Analyzing {asset_id}...")
+        if result is not None:
+            cache.put(keys[asset_id], result)
+        done[asset_id] = (asset_id, result, error)
+
+    if verbose:
+        print(f"Analyzed {len(todo)} assets ({len(done) - len(todo)} unchanged, from cache)")
+    for asset_id in svg_files:
+        yield done[asset_id]
+
+
+def _run_jobs(todo, jobs):
+    """Yield _analyze_job results in order, in-process or across a pool"""
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1 or len(todo) <= 1:
+        yield from map(_analyze_job, todo)
+        return
+    with ProcessPoolExecutor(max_workers=min(jobs, len(todo))) as pool:
+        yield from pool.map(_analyze_job, todo, chunksize=max(1, len(todo) // (jobs * 4)))
+
+
+# Library API: audit in-process, without going through files or the CLI
+
+PackAudit = namedtuple('PackAudit', 'assets usage questions missing errors')
+PackAudit.__doc__ = """audit_pack() result: asset-table rows, usage-table rows, the number of
+questions in the packs, asset ids without an SVG, and {asset_id: error}"""
 
-    print(f"Found {len(asset_usage)} unique assets used in {sum(len(v) for v in asset_usage.values())} questions")
 
-    # Analyze each asset
-    results = []
+def _is_path(source):
+    """True unless source is SVG bytes or SVG text (a str starting with '<')"""
+    if isinstance(source, (bytes, bytearray)):
+        return False
+    return not (isinstance(source, str) and source.lstrip().startswith('<'))
 
-    for asset_id in sorted(asset_usage.keys()):
-        svg_path = svg_dir / f"{asset_id}.svg"
 
-        if not svg_path.exists():
-            print(f"WARNING: Missing file for {asset_id}")
+def svg_bytes(source):
+    """SVG document bytes from a path, bytes, or SVG text (a str starting with '<')"""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if not _is_path(source):
+        return source.encode('utf-8')
+    return Path(source).read_bytes()
+
+
+def audit_svg(source, category=None, asset_id=None, raster=False):
+    """Audit one SVG given as a path, bytes or SVG text; returns the analyze_asset() result.
+
+    asset_id defaults to the file name stem for a path, so the category is
+    inferred as in a pack audit, and to '' otherwise. SVG text rendered in
+    memory can be audited without a disk round trip:
+
+        svg = svgtree.to_string(scenes_intersection.scene_4way_stop())
+        audit_svg(svg, 'intersection')['severity']
+    """
+    if asset_id is None:
+        asset_id = Path(source).stem if _is_path(source) else ''
+    return analyze_asset(asset_id, svg_bytes(source), raster, category)
+
+
+def load_packs(pack_paths):
+    """({asset_id: [{'question_id', 'topic'}, ...]}, question count) over question packs.
+
+    A pack is a JSON file with a 'questions' list (data/tx/tx_v1.json);
+    questions with an 'image' use its 'assetId'.
+    """
+    asset_usage = defaultdict(list)
+    questions = 0
+    for path in pack_paths:
+        with open(path) as f:
+            data = json.load(f)
+        for q in data['questions']:
+            questions += 1
+            if 'image' in q:
+                asset_usage[q['image']['assetId']].append({
+                    'question_id': q['id'],
+                    'topic': q['topic']
+                })
+    return asset_usage, questions
+
+
+def find_svgs(asset_ids, svg_dirs):
+    """({asset_id: path}, missing ids), sorted by id; the first of svg_dirs with the file wins"""
+    svg_files, missing = {}, []
+    for asset_id in sorted(asset_ids):
+        for svg_dir in svg_dirs:
+            svg_path = Path(svg_dir) / f"{asset_id}.svg"
+            if svg_path.exists():
+                svg_files[asset_id] = svg_path
+                break
+        else:
+            missing.append(asset_id)
+    return svg_files, missing
+
+
+def iter_audit(asset_usage, svg_files, jobs=1, cache=None, raster=False, verbose=True):
+    """Yield (asset_row, usage_rows, error) per SVG in svg_files; rows are None on error"""
+    for asset_id, asset, error in analyze_assets(svg_files, jobs, cache, raster, verbose):
+        if error is not None:
+            yield None, None, error
+            continue
+        usages = asset_usage.get(asset_id, [])
+        yield (asset_row(asset_id, asset, len(usages)),
+               [{'question_id': u['question_id'], 'topic': u['topic'], 'asset_id': asset_id}
+                for u in usages],
+               None)
+
+
+def audit_pack(pack_paths, svg_dirs, jobs=1, cache=None, raster=False):
+    """Audit every asset the question packs use; returns a PackAudit.
+
+    For CI gates and build steps that want the tables in memory; main()
+    streams the same rows to files instead.
+    """
+    asset_usage, questions = load_packs(pack_paths)
+    svg_files, missing = find_svgs(asset_usage, svg_dirs)
+    assets, usage, errors = [], [], {}
+    rows = iter_audit(asset_usage, svg_files, jobs, cache, raster, verbose=False)
+    for asset_id, (row, usages, error) in zip(svg_files, rows):
+        if error is not None:
+            errors[asset_id] = error
             continue
+        assets.append(row)
+        usage.extend(usages)
+    return PackAudit(assets, usage, questions, missing, errors)
+
+
+def format_cell(value):
+    """Text form of a table value for CSV and the report: measurements (floats)
+    with 2 decimals, a missing measurement (None) as N/A"""
+    if value is None:
+        return 'N/A'
+    return f"{value:.2f}" if isinstance(value, float) else value
+
+
+class TableWriter:
+    """Streams rows (dicts) to a CSV, JSON Lines or Parquet file; use as a context manager.
+
+    Rows go to disk as they are written (Parquet in PARQUET_BATCH_ROWS
+    batches), so memory does not grow with the table. JSON Lines and Parquet
+    keep values typed (dp measurements are floats or null); CSV writes them
+    through format_cell().
+    """
+
+    def __init__(self, path, columns, fmt='csv'):
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown table format {fmt!r} (expected one of {', '.join(FORMATS)})")
+        if fmt == 'parquet' and pq is None:
+            raise RuntimeError("--format parquet needs pyarrow: pip install pyarrow")
+        self.path = Path(path)
+        self.columns = list(columns)
+        self.fmt = fmt
+        self.rows = 0
+        self._file = self._csv = self._parquet = self._schema = None
+        self._batch = []
+        if fmt == 'parquet':
+            self._schema = pa.schema([(k, PARQUET_TYPES.get(k, 'string')) for k in self.columns])
+
+    def __enter__(self):
+        if self.fmt == 'csv':
+            self._file = open(self.path, 'w', newline='')
+            self._csv = csv.DictWriter(self._file, fieldnames=self.columns)
+            self._csv.writeheader()
+        elif self.fmt == 'jsonl':
+            self._file = open(self.path, 'w')
+        return self
+
+    def write(self, row):
+        self.rows += 1
+        if self.fmt == 'csv':
+            self._csv.writerow({k: format_cell(v) for k, v in row.items()})
+        elif self.fmt == 'jsonl':
+            self._file.write(json.dumps({k: row.get(k) for k in self.columns}, ensure_ascii=False) + '\n')
+        else:
+            self._batch.append(row)
+            if len(self._batch) >= PARQUET_BATCH_ROWS:
+                self._flush()
+
+    def _flush(self):
+        table = pa.Table.from_pylist([{k: r.get(k) for k in self.columns} for r in self._batch],
+                                     schema=self._schema)
+        if self._parquet is None:
+            self._parquet = pq.ParquetWriter(self.path, self._schema)
+        self._parquet.write_table(table)
+        self._batch = []
+
+    def __exit__(self, *exc):
+        if self.fmt == 'parquet':
+            if self._batch or self._parquet is None:
+                self._flush()
+            self._parquet.close()
+        else:
+            self._file.close()
 
-        print(f"Analyzing {asset_id}...")
 
+def main(argv=None):
+    repo_root = Path(__file__).parent.parent
+    parser = argparse.ArgumentParser(description="Audit SVG assets for mobile readability at 96dp and 48dp.")
+    parser.add_argument('--packs', nargs='+', type=Path, metavar='JSON',
+                        help="question packs to audit the images of (default: data/tx/tx_v1.json; "
+                             "with --library, every copy of the packs)")
+    parser.add_argument('--library', action='store_true',
+                        help="audit every SVG, referenced or not, and cross-check all pack copies and "
+                             "manifests through the asset usage index (see asset_index.py)")
+    parser.add_argument('--index', type=Path, metavar='PATH',
+                        help="where --library saves the asset usage index "
+                             "(default: assets/asset-usage-index.json)")
+    parser.add_argument('--svg-dir', action='append', type=Path, metavar='DIR',
+                        help="directory of <assetId>.svg files; repeat to search several in order "
+                             "(default: assets/svg)")
+    parser.add_argument('--output-dir', type=Path, metavar='DIR',
+                        default=repo_root / 'dmv-android' / 'docs' / 'growth',
+                        help="where the tables and report go (default: dmv-android/docs/growth)")
+    parser.add_argument('--date', type=datetime.date.fromisoformat, default=datetime.date.today(),
+                        metavar='YYYY-MM-DD', help="report date; its month names the outputs (default: today)")
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help="analyze assets across N worker processes (0 = one per CPU)")
+    parser.add_argument('--cache', metavar='PATH',
+                        help="result cache file (default: .audit-cache.json in the repo root)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="re-analyze every asset and leave the cache untouched")
+    parser.add_argument('--history-db', metavar='PATH',
+                        help="SQLite run history to record this audit in "
+                             "(default: .audit-history.db in the repo root; see audit_history.py)")
+    parser.add_argument('--no-history', action='store_true',
+                        help="do not record this audit in the run history")
+    parser.add_argument('--label', metavar='NAME',
+                        help="label for this run in the history (e.g. a branch or PR)")
+    parser.add_argument('--raster', action='store_true',
+                        help="also check contrast and feature widths on 48dp/96dp renders "
+                             "(needs numpy and Pillow)")
+    parser.add_argument('--format', choices=FORMATS, default='csv',
+                        help="format of the asset and usage tables (default: csv; parquet needs pyarrow)")
+    args = parser.parse_args(argv)
+    if args.format == 'parquet' and pq is None:
+        parser.error("--format parquet needs pyarrow: pip install pyarrow")
+    if args.raster:
         try:
-            analyzer = SVGAnalyzer(svg_path)
-            category = categorize_asset(asset_id)
-
-            # Calculate metrics
-            min_stroke = analyzer.find_min_stroke_width()
-            min_font = analyzer.find_min_font_size()
-            min_stroke_dp = analyzer.calculate_effective_dp(min_stroke) if min_stroke else None
-            min_font_dp = analyzer.calculate_effective_dp(min_font) if min_font else None
-
-            # Score on 4 dimensions
-            scores = {
-                'readability': score_readability(analyzer),
-                'semantic_clarity': score_semantic_clarity(analyzer, asset_id, category),
-                'contrast': score_contrast(analyzer),
-                'consistency': score_consistency(analyzer, category)
-            }
-
-            # Determine severity and issue
-            severity = determine_severity(scores, min_stroke_dp, min_font_dp)
-            issue_type = determine_issue_type(analyzer, scores, min_stroke_dp, min_font_dp)
-
-            # User impact
-            usage_count = len(asset_usage[asset_id])
-            if severity == 'P0':
-                user_impact = f"High - blocks learning in {usage_count} question(s)"
-            elif severity == 'P1':
-                user_impact = f"Medium - degrades experience in {usage_count} question(s)"
-            elif severity == 'P2':
-                user_impact = f"Low - minor issue in {usage_count} question(s)"
-            else:
-                user_impact = f"None - quality asset used in {usage_count} question(s)"
-
-            # Propose fix
-            proposed_fix = propose_fix(issue_type, min_stroke_dp, min_font_dp, analyzer)
-
-            # Add result for each question using this asset
-            for usage in asset_usage[asset_id]:
-                results.append({
-                    'question_id': usage['question_id'],
-                    'topic': usage['topic'],
-                    'asset_id': asset_id,
-                    'readability_score': scores['readability'],
-                    'semantic_clarity_score': scores['semantic_clarity'],
-                    'contrast_score': scores['contrast'],
-                    'consistency_score': scores['consistency'],
-                    'severity': severity,
-                    'issue_type': issue_type,
-                    'user_impact': user_impact,
-                    'proposed_fix': proposed_fix,
-                    'min_stroke_dp': f"{min_stroke_dp:.2f}" if min_stroke_dp else "N/A",
-                    'min_font_dp': f"{min_font_dp:.2f}" if min_font_dp else "N/A",
-                    'viewbox': f"{analyzer.viewbox_width}×{analyzer.viewbox_height}",
-                    'usage_count': usage_count,
-                    'category': category
-                })
+            _components()
+        except (ImportError, RuntimeError) as e:
+            parser.error(f"--raster: {e}")
 
-        except Exception as e:
-            print(f"ERROR analyzing {asset_id}: {e}")
+    # Paths
+    svg_dirs = args.svg_dir or [repo_root / 'assets' / 'svg']
+    output_dir = args.output_dir
+    stem = f'image-quality-audit-{args.date:%Y-%m}'
+    output_assets = output_dir / f'{stem}-assets.{args.format}'
+    output_usage = output_dir / f'{stem}-usage.{args.format}'
+    output_md = output_dir / f'{stem}.md'
+    cache_path = None if args.no_cache else Path(args.cache or repo_root / '.audit-cache.json')
+    history_path = None if args.no_history else Path(args.history_db or repo_root / '.audit-history.db')
 
-    # Write CSV
-    print(f"\nWriting CSV to {output_csv}...")
-    with open(output_csv, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=[
-            'question_id', 'topic', 'asset_id', 'usage_count', 'category',
-            'readability_score', 'semantic_clarity_score', 'contrast_score', 'consistency_score',
-            'severity', 'issue_type', 'user_impact', 'proposed_fix',
-            'min_stroke_dp', 'min_font_dp', 'viewbox'
-        ])
-        writer.writeheader()
-        writer.writerows(results)
+    # Ensure output directory exists
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    import asset_index
+
+    index = None
+    packs = args.packs or (asset_index.DEFAULT_PACKS if args.library else [repo_root / 'data' / 'tx' / 'tx_v1.json'])
+    if args.library:
+        # Every copy of the packs and every manifest, into the reverse index
+        index = asset_index.build_index(packs,
+                                        asset_index.DEFAULT_MANIFESTS, svg_dirs)
+        asset_index.save_index(index, args.index or asset_index.DEFAULT_OUTPUT)
+        asset_index.print_report(index)
+        asset_usage = asset_index.asset_usage(index)
+        question_total = len(index['questions'])
+        svg_files = asset_index.list_svgs(svg_dirs)
+        missing = index['missing']
+    else:
+        # Map asset usage over the question packs
+        asset_usage, question_total = load_packs(packs)
+        svg_files, missing = find_svgs(asset_usage, svg_dirs)
+        skipped = asset_index.list_svgs(svg_dirs).keys() - svg_files.keys()
+        if skipped:
+            print(f"NOTE: {len(skipped)} SVG(s) no audited question uses are not audited (see --library)")
+    print(f"Found {len(asset_usage)} unique assets used in {sum(len(v) for v in asset_usage.values())} questions")
 
-    print(f"✓ CSV written: {len(results)} rows")
+    for asset_id in missing:
+        print(f"WARNING: Missing file for {asset_id}")
+
+    # Analyze each asset, streaming one asset row and its usage rows at a time
+    assets = []
+    question_ids = set()
+    cache = AuditCache(cache_path)
+    asset_columns = ASSET_COLUMNS + (RASTER_COLUMNS if args.raster else ())
+
+    print(f"\nWriting {output_assets.name} and {output_usage.name} to {output_dir}...")
+    with TableWriter(output_assets, asset_columns, args.format) as asset_table, \
+            TableWriter(output_usage, USAGE_COLUMNS, args.format) as usage_table:
+        rows = iter_audit(asset_usage, svg_files, args.jobs, cache, args.raster)
+        for asset_id, (row, usages, error) in zip(svg_files, rows):
+            if error is not None:
+                print(f"ERROR analyzing {asset_id}: {error}")
+                continue
+            asset_table.write(row)
+            assets.append(row)
+            for usage in usages:
+                usage_table.write(usage)
+                question_ids.add(usage['question_id'])
+    cache.save()
+    print(f"✓ Tables written: {asset_table.rows} assets, {usage_table.rows} usages")
 
     # Generate markdown report
-    generate_markdown_report(results, asset_usage, output_md)
+    confusable = confusable_pairs(assets) if args.raster else None
+    generate_markdown_report(assets, usage_table.rows, len(question_ids), output_md,
+                             question_total, args.date, index, confusable)
     print(f"✓ Markdown report written: {output_md}")
 
+    if history_path is not None:
+        pack_names = ', '.join(_relative(p, repo_root) for p in packs)
+        record_history(history_path, assets, svg_files, args.date, args.label, analysis_mode(args.raster),
+                       f"library: {pack_names}" if args.library else pack_names)
+
+
+def confusable_pairs(assets):
+    """[(distance, asset_id, asset_id, kind)] of look-alike assets by perceptual hash, closest first"""
+    _components()
+    from components import similarity
+
+    hashes = {a['asset_id']: int(a['perceptual_hash'], 16) for a in assets}
+    return similarity.lookalike_pairs(hashes, similarity.CONFUSABLE)[0]
+
+
+def _relative(path, root):
+    """path relative to root where it is under it, else as given"""
+    try:
+        return str(Path(path).resolve().relative_to(root.resolve()))
+    except ValueError:
+        return str(path)
+
+
+def analysis_mode(raster):
+    """'vector', or for --raster audits 'raster-' and a key of the renderer and
+    the perceptual hash (similarity.hash_key()), so changing either discards
+    cached results"""
+    if not raster:
+        return 'vector'
+    _components()
+    from components import similarity
+    return f"raster-{similarity.hash_key()}"
+
+
+def record_history(path, assets, svg_files, date, label=None, mode='vector', packs=None):
+    """Record the asset rows as one run in the audit_history database at path
+
+    The regression count is against the latest earlier run with the same
+    rubric and mode; runs in other modes score contrast differently.
+    """
+    import audit_history
+
+    hashes = {a['asset_id']: content_hash(svg_files[a['asset_id']].read_bytes()) for a in assets}
+    conn = audit_history.open_db(path)
+    try:
+        run_id = audit_history.record_run(conn, assets, hashes, RUBRIC_VERSION, date.isoformat(),
+                                          label, audit_history.git_commit(Path(__file__).parent),
+                                          mode, packs)
+        previous = audit_history.previous_run(conn, run_id)
+        regressed = audit_history.regressions(conn, previous, run_id) if previous else []
+    finally:
+        conn.close()
+    since = f", {len(regressed)} regressed since run {previous} ({mode})" if previous else ""
+    print(f"✓ Run {run_id} recorded in {path}{since}")
+
+
+def write_coverage_section(f, index, unique_assets):
+    """Library Coverage: orphans, missing files and drift from the asset usage index"""
+    f.write("---\n\n")
+    f.write("## Library Coverage\n\n")
+    f.write(f"**Pack copies cross-checked:** {', '.join(f'`{c}`' for c in sorted(index['copies']))}\n")
+    f.write(f"**Manifests cross-checked:** {', '.join(f'`{m}`' for m in sorted(index['manifests']))}\n\n")
+
+    f.write(f"### Orphans ({len(index['orphans'])})\n\n")
+    if index['orphans']:
+        f.write("SVGs no question in any copy uses; audited but not shown to learners:\n\n")
+        f.write("| Asset ID | Severity | Issue |\n")
+        f.write("|----------|----------|-------|\n")
+        for asset_id in index['orphans']:
+            asset = unique_assets.get(asset_id)
+            if asset is not None:
+                f.write(f"| {asset_id} | {asset['severity']} | {asset['issue_type'].replace('_', ' ')} |\n")
+        f.write("\n")
+    else:
+        f.write("Every SVG is used by at least one question. ✅\n\n")
+
+    f.write(f"### Missing Files ({len(index['missing'])})\n\n")
+    for asset_id in index['missing']:
+        entry = index['assets'][asset_id]
+        used = f"used by {len(entry['questions'])} question(s)" if entry['questions'] else "listed in a manifest"
+        f.write(f"- **{asset_id}** — {used}, no SVG file\n")
+    if not index['missing']:
+        f.write("Every referenced or listed asset has an SVG file. ✅\n")
+    f.write("\n")
+
+    f.write(f"### Drift Between Copies ({len(index['drift'])})\n\n")
+    for d in index['drift']:
+        if d['kind'] == 'assetId':
+            values = ', '.join(f"`{copy}`: {a}" for copy, a in d['copies'].items())
+            f.write(f"- **{d['id']}** has different assetIds — {values}\n")
+        else:
+            f.write(f"- {d['kind'].title()} **{d['id']}** is missing from "
+                    f"{', '.join(f'`{m}`' for m in d['missing_from'])}\n")
+    if not index['drift']:
+        f.write("All pack copies and manifests agree. ✅\n")
+    f.write("\n")
+
+
+def write_confusable_section(f, pairs, unique_assets):
+    """Confusable Assets: look-alike pairs from the perceptual hashes of the 96dp renders,
+    then every same-name pair"""
+    from components import similarity
+
+    near = [p for p in pairs if p[3] == 'near-duplicate']
+    same_name = [p for p in pairs if p[3] == 'same name']
+    f.write("\n---\n\n")
+    f.write("## Confusable Assets\n\n")
+    f.write(f"**{len(pairs) - len(same_name)} pairs** look alike at {similarity.HASH_PX}dp (perceptual "
+            f"hash distance ≤{similarity.CONFUSABLE} of {similarity.HASH_BITS} bits, color included), "
+            f"**{len(near)}** of them near-duplicates (≤{similarity.NEAR_DUPLICATE}). Learners can "
+            f"mistake these for each other unless a distinct detail tells them apart. "
+            f"**{len(same_name)}** more pairs share a name under different MUTCD codes.\n\n")
+    if not pairs:
+        return
+    similar = [p for p in pairs if p[3] != 'same name']
+    shown = similar[:max(len(near), CONFUSABLE_REPORT_ROWS)] + same_name
+    f.write("| Asset A | Asset B | Distance | Kind | Usage (A/B) |\n")
+    f.write("|---------|---------|----------|------|-------------|\n")
+    for d, a, b, kind in shown:
+        f.write(f"| {a} | {b} | {d} | {kind} | "
+                f"{unique_assets[a]['usage_count']}/{unique_assets[b]['usage_count']} |\n")
+    if len(pairs) > len(shown):
+        f.write(f"\n{len(pairs) - len(shown)} more pairs: `python3 assets/components/similarity.py`\n")
+
+
+def asset_row(asset_id, asset, usage_count):
+    """One asset-table row from an analyze_asset() result"""
+    scores = asset['scores']
+    severity = asset['severity']
+
+    # User impact
+    if usage_count == 0:
+        user_impact = "None - not used by any question (orphan)"
+    elif severity == 'P0':
+        user_impact = f"High - blocks learning in {usage_count} question(s)"
+    elif severity == 'P1':
+        user_impact = f"Medium - degrades experience in {usage_count} question(s)"
+    elif severity == 'P2':
+        user_impact = f"Low - minor issue in {usage_count} question(s)"
+    else:
+        user_impact = f"None - quality asset used in {usage_count} question(s)"
+
+    return {
+        'asset_id': asset_id,
+        'usage_count': usage_count,
+        'category': asset['category'],
+        'readability_score': scores['readability'],
+        'semantic_clarity_score': scores['semantic_clarity'],
+        'contrast_score': scores['contrast'],
+        'consistency_score': scores['consistency'],
+        'severity': severity,
+        'issue_type': asset['issue_type'],
+        'user_impact': user_impact,
+        'proposed_fix': asset['proposed_fix'],
+        'min_stroke_dp': asset['min_stroke_dp'],
+        'min_font_dp': asset['min_font_dp'],
+        'viewbox': asset['viewbox'],
+        **{k: asset[k] for k in RASTER_COLUMNS if k in asset},
+    }
 
-def generate_markdown_report(results, asset_usage, output_path):
-    """Generate comprehensive markdown report"""
 
-    # Group by asset for summary stats
-    by_asset = defaultdict(list)
-    for r in results:
-        by_asset[r['asset_id']].append(r)
+def generate_markdown_report(assets, usage_count, question_count, output_path,
+                             question_total, date, index=None, confusable=None):
+    """Generate comprehensive markdown report from the asset table rows.
 
-    # Get unique assets with their scores
-    unique_assets = {}
-    for asset_id, rows in by_asset.items():
-        unique_assets[asset_id] = rows[0]  # First row has all the scores
+    usage_count is the number of usage-table rows (question instances),
+    question_count the number of distinct questions among them and
+    question_total the number of questions in the audited packs. With the
+    asset usage index of a --library audit, a Library Coverage section lists
+    orphans, missing files and drift between pack copies. confusable holds
+    the look-alike pairs of a --raster audit (confusable_pairs()).
+    """
+    unique_assets = {a['asset_id']: a for a in assets}
 
     # Count by severity
     severity_counts = defaultdict(int)
@@ -499,15 +1573,23 @@ def generate_markdown_report(results, asset_usage, output_path):
     # Write markdown
     with open(output_path, 'w') as f:
         f.write("# Image Quality Audit Report — Texas DMV Practice App\n\n")
-        f.write(f"**Generated:** 2026-02-14\n")
-        f.write(f"**Audited:** {len(unique_assets)} unique SVG assets across {len(results)} question instances\n")
+        f.write(f"**Generated:** {date.isoformat()}\n")
+        f.write(f"**Audited:** {len(unique_assets)} unique SVG assets across {usage_count} question instances\n")
         f.write(f"**Methodology:** Technical SVG analysis + mobile rendering simulation (96dp primary, 48dp minimum)\n\n")
 
         f.write("---\n\n")
         f.write("## Executive Summary\n\n")
         f.write(f"**Total unique assets:** {len(unique_assets)}\n")
-        f.write(f"**Total question instances:** {len(results)}\n")
-        f.write(f"**Questions with images:** {len(set(r['question_id'] for r in results))} of 660 (20.6%)\n\n")
+        f.write(f"**Total question instances:** {usage_count}\n")
+        f.write(f"**Questions with images:** {question_count} of {question_total} "
+                f"({question_count / max(question_total, 1) * 100:.1f}%)\n\n")
+
+        if not unique_assets:
+            f.write("No SVG assets were audited: the packs reference no images, "
+                    "or none of the referenced files were found.\n\n")
+            if index is not None:
+                write_coverage_section(f, index, unique_assets)
+            return
 
         f.write("### Results by Priority\n\n")
         f.write("| Priority | Count | % | Description |\n")
@@ -522,6 +1604,9 @@ def generate_markdown_report(results, asset_usage, output_path):
         fail_rate = 100 - pass_rate
         f.write(f"**Overall Health:** {pass_rate:.0f}% PASS / {fail_rate:.0f}% Needs Fix\n\n")
 
+        if index is not None:
+            write_coverage_section(f, index, unique_assets)
+
         f.write("---\n\n")
         f.write("## Top 15 Assets to Redesign\n\n")
         f.write("Prioritized by severity, then usage frequency:\n\n")
@@ -539,7 +1624,7 @@ def generate_markdown_report(results, asset_usage, output_path):
         total_questions = sum(int(a['usage_count']) for a in top_15)
         f.write(f"**Scope:** Top 15 assets (all P0 and high-usage P1)\n")
         f.write(f"**Estimated effort:** {total_effort_hours} hours\n")
-        f.write(f"**User impact:** {total_questions} question instances ({total_questions/len(results)*100:.1f}% of questions with images)\n")
+        f.write(f"**User impact:** {total_questions} question instances ({total_questions/usage_count*100:.1f}% of questions with images)\n")
         f.write(f"**Recommended owner:** `svg-asset-curator`\n\n")
 
         f.write("---\n\n")
@@ -575,11 +1660,14 @@ def generate_markdown_report(results, asset_usage, output_path):
             f.write("|----------|-------|------------|----------|-------|\n")
 
             for asset in sorted(p0_assets, key=lambda x: -int(x['usage_count'])):
-                f.write(f"| {asset['asset_id']} | {asset['usage_count']} | {asset['min_stroke_dp']} | "
-                       f"{asset['min_font_dp']} | {asset['issue_type'].replace('_', ' ')} |\n")
+                f.write(f"| {asset['asset_id']} | {asset['usage_count']} | {format_cell(asset['min_stroke_dp'])} | "
+                       f"{format_cell(asset['min_font_dp'])} | {asset['issue_type'].replace('_', ' ')} |\n")
         else:
             f.write("**No P0 (blocking) issues found.** ✅\n\n")
 
+        if confusable is not None:
+            write_confusable_section(f, confusable, unique_assets)
+
         f.write("\n---\n\n")
         f.write("## Methodology\n\n")
         f.write("### Scoring Rubric\n\n")
@@ -593,8 +1681,9 @@ def generate_markdown_report(results, asset_usage, output_path):
 
         f.write("2. **Semantic Clarity (1-5):** Is traffic meaning unambiguous?\n")
         f.write("   - Geometry correctness (MUTCD compliance)\n")
+        f.write("   - Nothing clipped by the viewBox (exact shape and path bounds)\n")
         f.write("   - Presence of essential training cues\n")
-        f.write("   - Visual simplicity (not cluttered)\n\n")
+        f.write("   - Visual simplicity (not cluttered; path segments count too)\n\n")
 
         f.write("3. **Contrast (1-5):** Is foreground/background contrast sufficient?\n")
         f.write("   - High contrast = easy to distinguish elements\n")
@@ -624,7 +1713,7 @@ def generate_markdown_report(results, asset_usage, output_path):
 
         f.write("---\n\n")
         f.write("**Audit conducted by:** SVG Review Agent\n")
-        f.write("**Date:** 2026-02-14\n")
+        f.write(f"**Date:** {date.isoformat()}\n")
         f.write("**Branch:** `codex/svg-review-agent/52-image-quality-audit`\n")
 
 
@@ -633,7 +1722,7 @@ def estimate_effort(asset):
     issue_type = asset['issue_type']
     complexity = len(asset['asset_id'])  # Rough proxy
 
-    if issue_type in ['tiny_text', 'thin_strokes']:
+    if issue_type in ['tiny_text', 'thin_strokes', 'thin_features', 'viewbox_overflow']:
         return 'S'  # Simple numerical adjustment
     elif issue_type in ['inconsistent_style', 'low_contrast']:
         return 'M'  # Moderate redesign
@@ -653,13 +1742,12 @@ def summarize_success_factors(asset):
     """Summarize why this asset passes"""
     factors = []
 
-    if asset['min_stroke_dp'] != 'N/A':
-        stroke_dp = float(asset['min_stroke_dp'])
-        if stroke_dp >= 2.5:
-            factors.append(f"Bold strokes ({stroke_dp:.1f}dp)")
+    stroke_dp = asset['min_stroke_dp']
+    if stroke_dp is not None and stroke_dp >= 2.5:
+        factors.append(f"Bold strokes ({stroke_dp:.1f}dp)")
 
-    if asset['min_font_dp'] != 'N/A':
-        font_dp = float(asset['min_font_dp'])
+    font_dp = asset['min_font_dp']
+    if font_dp is not None:
         if font_dp >= 10:
             factors.append(f"Large text ({font_dp:.1f}dp)")
     else:
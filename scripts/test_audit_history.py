@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Checks which earlier run audit_history compares a new run against.
+
+Usage:
+    python3 -m pytest scripts/test_audit_history.py
+    python3 scripts/test_audit_history.py
+"""
+
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import audit_history
+
+
+def row(contrast):
+    return {'asset_id': 'stop_sign', 'severity': 'PASS', 'readability_score': 5,
+            'semantic_clarity_score': 5, 'contrast_score': contrast, 'consistency_score': 5,
+            'min_stroke_dp': 2.0, 'min_font_dp': None}
+
+
+class PreviousRunTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.conn = audit_history.open_db(Path(self.tmp.name) / 'history.db')
+
+    def tearDown(self):
+        self.conn.close()
+        self.tmp.cleanup()
+
+    def record(self, contrast, mode, rubric=5):
+        return audit_history.record_run(self.conn, [row(contrast)], {'stop_sign': 'abc'}, rubric,
+                                        '2026-10-18', mode=mode, packs='data/tx/tx_v1.json')
+
+    def test_same_mode_and_rubric_only(self):
+        vector = self.record(5, 'vector')
+        raster = self.record(3, 'raster-pillow')
+        # A raster run right after a vector run has nothing to compare with
+        self.assertIsNone(audit_history.previous_run(self.conn, raster))
+        self.assertEqual(audit_history.previous_run(self.conn, self.record(5, 'vector')), vector)
+        self.assertEqual(audit_history.previous_run(self.conn, self.record(3, 'raster-pillow')), raster)
+        self.assertIsNone(audit_history.previous_run(self.conn, self.record(5, 'vector', rubric=6)))
+
+    def test_upgrade_from_version_1(self):
+        path = Path(self.tmp.name) / 'v1.db'
+        conn = sqlite3.connect(path)
+        conn.executescript(audit_history.SCHEMA.replace('    mode TEXT,\n    packs TEXT,\n', ''))
+        conn.execute("INSERT INTO runs (recorded, date, rubric, assets, p0, p1, p2, pass) "
+                     "VALUES ('2026-10-01T00:00:00', '2026-10-01', 5, 0, 0, 0, 0, 0)")
+        conn.execute('PRAGMA user_version = 1')
+        conn.commit()
+        conn.close()
+        conn = audit_history.open_db(path)
+        try:
+            self.assertEqual(conn.execute('PRAGMA user_version').fetchone()[0], audit_history.SCHEMA_VERSION)
+            self.assertEqual(audit_history.runs(conn)[0][4], None)     # mode unknown
+        finally:
+            conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
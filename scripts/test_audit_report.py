@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Checks audit_image_quality.generate_markdown_report() on edge-case audits.
+
+Usage:
+    python3 -m pytest scripts/test_audit_report.py
+    python3 scripts/test_audit_report.py
+"""
+
+import datetime
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from audit_image_quality import generate_markdown_report
+
+
+class EmptyAuditTest(unittest.TestCase):
+
+    def test_pack_without_audited_assets(self):
+        # A pack with no image questions, or whose SVG files are all missing
+        with tempfile.TemporaryDirectory() as out:
+            path = Path(out) / 'report.md'
+            generate_markdown_report([], 0, 0, path, 1, datetime.date(2026, 10, 18))
+            report = path.read_text()
+        self.assertIn('No SVG assets were audited', report)
+        self.assertNotIn('Results by Priority', report)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Checks audit_image_quality.path_geometry() bounds against a fine flattening.
+
+path_geometry() computes exact bounds from curve and arc extrema; the
+reference here is assets/components/pathdata.flatten() at a tolerance far
+below a pixel, on hand-checked paths (relative S/T/A included) and on
+randomized paths mixing every command in absolute and relative form.
+
+Usage:
+    python3 -m pytest scripts/test_path_geometry.py
+    python3 scripts/test_path_geometry.py
+"""
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'assets'))
+
+from audit_image_quality import path_geometry
+from components import pathdata
+
+REFERENCE_TOLERANCE = 0.001     # flatten() chord deviation, px
+MAX_ERROR = 0.05                # allowed bounds difference from the reference, px per
+                                # 200px of extent (arcs with tiny radii scale up a lot)
+RANDOM_PATHS = 300
+
+
+def flattened_bounds(d):
+    """Bounds of the points of d flattened at REFERENCE_TOLERANCE, or None"""
+    points = [p for polyline, _ in pathdata.flatten(pathdata.parse(d), REFERENCE_TOLERANCE)
+              for p in polyline]
+    if not points:
+        return None
+    xs, ys = [p[0] for p in points], [p[1] for p in points]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def random_path(rng, commands=40):
+    """SVG path data with every command, absolute and relative, in random order"""
+    def n(lo=-100, hi=100):
+        return f"{rng.uniform(lo, hi):.3f}"
+
+    parts = [f"M{n()} {n()}"]
+    for _ in range(commands):
+        cmd = rng.choice('LHVCSQTAMZ')
+        if cmd == 'A':
+            args = f"{n(0, 60)} {n(0, 60)} {n(-180, 180)} {rng.randint(0, 1)} {rng.randint(0, 1)} {n()} {n()}"
+        else:
+            arity = {'L': 2, 'H': 1, 'V': 1, 'C': 6, 'S': 4, 'Q': 4, 'T': 2, 'M': 2, 'Z': 0}[cmd]
+            args = ' '.join(n() for _ in range(arity))
+        if rng.random() < 0.5:
+            cmd = cmd.lower()
+        parts.append(f"{cmd}{args}")
+    return ' '.join(parts)
+
+
+class PathGeometryTest(unittest.TestCase):
+
+    def assertBoundsClose(self, actual, expected, d):
+        delta = MAX_ERROR * max(1.0, (expected[2] - expected[0] + expected[3] - expected[1]) / 400)
+        for a, e in zip(actual, expected):
+            self.assertAlmostEqual(a, e, delta=delta, msg=f"{actual} != {expected} for {d!r}")
+
+    def test_relative_smooth_cubic(self):
+        # s reflects the previous control point (30,0) about (30,10) → (30,20)
+        d = 'M10 10 c 0 -10 20 -10 20 0 s 20 10 20 0'
+        bounds, segments, curves = path_geometry(d)
+        self.assertBoundsClose(bounds, (10, 2.5, 50, 17.5), d)
+        self.assertEqual((segments, curves), (2, 2))
+
+    def test_relative_smooth_quadratic(self):
+        # t reflects the control point (10,20) about (20,0) → (30,-20)
+        d = 'M0 0 q 10 20 20 0 t 20 0'
+        bounds, segments, curves = path_geometry(d)
+        self.assertBoundsClose(bounds, (0, -10, 40, 10), d)
+        self.assertEqual((segments, curves), (2, 2))
+
+    def test_relative_arc_sweep(self):
+        self.assertBoundsClose(path_geometry('M0 0 a 10 10 0 0 1 20 0')[0], (0, -10, 20, 0), 'sweep 1')
+        self.assertBoundsClose(path_geometry('M0 0 a 10 10 0 0 0 20 0')[0], (0, 0, 20, 10), 'sweep 0')
+
+    def test_relative_arc_large_and_rotated(self):
+        for d in ('M50 50 a 20 10 30 1 1 10 10', 'm50 50 a 20 10 -60 1 0 -15 5',
+                  'M0 0 a 1 1 0 0 1 40 0'):    # radii too small: scaled up to a semicircle
+            self.assertBoundsClose(path_geometry(d)[0], flattened_bounds(d), d)
+
+    def test_compact_arc_flags(self):
+        # Flags are one character each: "0110" is large_arc 0, sweep 1, x 10
+        for d in ('M10 10 a5 5 0 0110 0', 'M10 10 a5 5 0 0 1 10 0', 'M10,10a5,5,0,0,1,10,0'):
+            bounds, segments, curves = path_geometry(d)
+            self.assertBoundsClose(bounds, (10, 5, 20, 10), d)
+            self.assertEqual((segments, curves), (1, 1))
+
+    def test_bad_arc_flag(self):
+        with self.assertRaises(ValueError):
+            path_geometry('M0 0 a5 5 0 2 1 10 0')
+
+    def test_lines_and_close(self):
+        bounds, segments, curves = path_geometry('m5 5 h10 v10 z')
+        self.assertEqual(bounds, (5, 5, 15, 15))
+        self.assertEqual((segments, curves), (3, 0))
+
+    def test_randomized_paths_match_flattening(self):
+        rng = random.Random(20)
+        for _ in range(RANDOM_PATHS):
+            d = random_path(rng)
+            bounds, expected = path_geometry(d)[0], flattened_bounds(d)
+            if expected is None:
+                continue
+            self.assertBoundsClose(bounds, expected, d)
+
+
+if __name__ == '__main__':
+    unittest.main()